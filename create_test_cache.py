@@ -114,15 +114,18 @@ def create_cache(scenario: str):
             "last_check_time": datetime.now(timezone.utc).isoformat()
         },
         package_name: {
-            "current_version": current_lib,
             "latest_version": latest_lib,
             "last_check_time": datetime.now(timezone.utc).isoformat()
         }
     }
 
-    # Write cache file
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=2)
+    # Installed version is recorded per venv; write through the locked cache writer
+    from sp.upgrade_check import record_installed_version, save_cache
+    from sp.core.environment import get_home_paths
+
+    _, venv_dir = get_home_paths()
+    record_installed_version(cache, venv_dir, package_name, current_lib)
+    save_cache(cache)
 
     # Print success message
     print(f"\n✅ Created mock cache: {desc}")
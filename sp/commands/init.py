@@ -6,16 +6,14 @@ import urllib.request
 from pathlib import Path
 
 import typer
-from rich.tree import Tree
 
 from sp import __version__
-from sp.core.config import SP_HOME, SIGNALPILOT_CLI
+from sp.core.config import SP_HOME, SIGNALPILOT_CLI, write_default_config
 from sp.core.environment import check_uv, get_home_paths
 from sp.upgrade_check import get_pypi_version, compare_versions
 # TODO: @tarik update when we decide about demo projects
 # from sp.demos import start_demo_download
-from sp.ui.console import console, LOGO
-from sp.commands.lab import launch_jupyter_with_upgrade_check
+from sp.ui.console import console, LOGO, print_tree
 
 
 def download_file(url: str, dest_path: Path, optional: bool = False):
@@ -39,98 +37,24 @@ def download_file(url: str, dest_path: Path, optional: bool = False):
 
 
 def print_directory_tree(base_path: Path):
-    """Print a nice directory structure using rich.tree.
+    """Print a nice directory structure (rich tree, or plain text when piped).
 
     Args:
         base_path: Base directory path
     """
-    tree = Tree(
+    print_tree(
         f"[bold cyan]~/{base_path.name}/[/bold cyan]",
-        guide_style="dim"
+        [
+            "[cyan]user-skills/[/cyan]",
+            "[cyan]user-rules/[/cyan]",
+            "[cyan]team-workspace/[/cyan]",
+            # TODO: @tarik update when we decide about demo projects
+            # "[cyan]demo-project/[/cyan]",
+            "[cyan]data/[/cyan]",
+        ],
+        guide_style="dim",
     )
 
-    # Add subdirectories
-    tree.add("[cyan]user-skills/[/cyan]")
-    tree.add("[cyan]user-rules/[/cyan]")
-    tree.add("[cyan]team-workspace/[/cyan]")
-    # TODO: @tarik update when we decide about demo projects
-    # tree.add("[cyan]demo-project/[/cyan]")
-    tree.add("[cyan]data/[/cyan]")
-
-    console.print(tree)
-
-
-def optimize_jupyter_cache(home_dir: Path):
-    """Warm up Jupyter to initialize caches for faster startup.
-
-    Args:
-        home_dir: SignalPilotHome directory path
-    """
-    console.print("\n→ Optimizing Jupyter for fast startup...", style="bold cyan")
-    console.print("  (This may take 30-40 seconds)\n", style="dim")
-
-    try:
-        venv_jupyter = home_dir / ".venv" / "bin" / "jupyter"
-
-        # Disable announcements extension
-        subprocess.run(
-            [str(venv_jupyter), "labextension", "disable", "@jupyterlab/apputils-extension:announcements"],
-            cwd=home_dir,
-            capture_output=True,
-            check=False,  # Don't fail if already disabled
-        )
-
-        # Lock announcements extension
-        subprocess.run(
-            [str(venv_jupyter), "labextension", "lock", "@jupyterlab/apputils-extension:announcements"],
-            cwd=home_dir,
-            capture_output=True,
-            check=False,  # Don't fail if already locked
-        )
-
-        # Warm-up run: start Jupyter to initialize caches
-        jupyter_process = subprocess.Popen(
-            [str(venv_jupyter), "lab", "--no-browser", "--allow-root", "--port=19999"],
-            cwd=home_dir,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-
-        # Wait for Jupyter to be ready (up to 30 seconds)
-        import time
-        max_wait = 25
-        jupyter_ready = False
-
-        for i in range(max_wait):
-            # Check if process is still running
-            if jupyter_process.poll() is not None:
-                console.print("  → Jupyter process exited early", style="yellow")
-                break
-
-            try:
-                urllib.request.urlopen("http://localhost:19999/api", timeout=1)
-                jupyter_ready = True
-                console.print("  ✓ Jupyter cache initialized (100%)", style="green")
-                break
-            except Exception:
-                progress = int((i + 1) / max_wait * 100)
-                console.print(f"  → Warming up... {progress}%", style="dim", end="\r")
-                time.sleep(1)
-
-        if not jupyter_ready:
-            console.print("  → Optimized Jupyter cache", style="yellow")
-
-        # Shutdown Jupyter
-        try:
-            jupyter_process.terminate()
-            jupyter_process.wait(timeout=5)
-        except Exception:
-            jupyter_process.kill()
-
-    except Exception as e:
-        console.print(f"  → Skipping optimization: {e}", style="yellow")
-        # Don't fail the entire process if optimization fails
-
 
 def run_init(dev: bool = False):
     """Main init logic - creates SignalPilotHome and sets up environment.
@@ -183,6 +107,7 @@ def run_init(dev: bool = False):
     # TODO: @tarik update when we decide about demo projects
     # (home_dir / "demo-project").mkdir(exist_ok=True)
     (home_dir / "data").mkdir(exist_ok=True)
+    write_default_config()
 
     console.print("\n✓ Directory structure created:", style="green")
     print_directory_tree(home_dir)
@@ -206,6 +131,14 @@ def run_init(dev: bool = False):
 
     # Download start-here.ipynb (optional)
     download_file(base_url + "start-here.ipynb", home_dir / "start-here.ipynb", optional=True)
+    if (home_dir / "start-here.ipynb").exists():
+        # Keep the notebook small on disk; the server restores its plots on open
+        from sp.commands.nb import compact_file
+
+        try:
+            compact_file(home_dir / "start-here.ipynb")
+        except (OSError, ValueError):
+            pass
 
     # Download team-workspace README (optional)
     download_file(base_url + "team-workspace/README.md", home_dir / "team-workspace" / "README.md", optional=True)
@@ -252,10 +185,16 @@ def run_init(dev: bool = False):
     console.print("\n→ Installing dependencies...", style="bold cyan")
     console.print("  (This may take a minute)\n", style="dim")
 
+    from sp.core.index import uv_index_args
+
+    index_args = uv_index_args()
+    if index_args:
+        console.print(f"  (Package index: {' '.join(index_args)})\n", style="dim")
+
     try:
         # Don't capture output - show everything to the user
         subprocess.run(
-            ["uv", "pip", "install", "-r", "pyproject.toml"],
+            ["uv", "pip", "install", "-r", "pyproject.toml", *index_args],
             cwd=home_dir,
             check=True,
         )
@@ -264,11 +203,14 @@ def run_init(dev: bool = False):
         console.print(f"\n✗ uv pip install failed with exit code {e.returncode}", style="bold red")
         console.print("\nTry running manually:", style="yellow")
         console.print(f"  cd {home_dir}")
-        console.print("  uv pip install -r pyproject.toml")
+        console.print(" ".join(["  uv pip install -r pyproject.toml", *index_args]))
         sys.exit(1)
 
-    # Optimize Jupyter cache
-    optimize_jupyter_cache(home_dir)
+    # Compile bytecode and build library caches, then Jupyter's startup caches
+    from sp.commands.warm import run_optimize, run_warm
+
+    run_optimize(home_dir / ".venv")
+    run_warm(home_dir / ".venv", measure_before=False)
 
     # TODO: @tarik update when we decide about demo projects
     # # Wait for demo downloads to complete and show result
@@ -285,36 +227,13 @@ def run_init(dev: bool = False):
     #     else:
     #         console.print("→ Demo files still downloading in background", style="yellow")
 
-    # Get version information from the venv
-    python_version = "unknown"
-    try:
-        result = subprocess.run(
-            [str(home_dir / ".venv" / "bin" / "python"), "--version"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        # Output is like "Python 3.12.7"
-        python_version = result.stdout.strip().split()[1]
-    except Exception:
-        pass
+    # Get Python and SignalPilot versions from the venv inventory (no subprocesses)
+    from sp.core.environment import venv_inventory
 
-    # Get SignalPilot version from installed packages
-    sp_version = "unknown"
+    inventory = venv_inventory(home_dir / ".venv") or {}
+    python_version = inventory.get("python") or "unknown"
     package_name = "signalpilot-ai-internal" if dev else "signalpilot-ai"
-    try:
-        result = subprocess.run(
-            [str(home_dir / ".venv" / "bin" / "pip"), "show", package_name],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        for line in result.stdout.split("\n"):
-            if line.startswith("Version:"):
-                sp_version = line.split(":", 1)[1].strip()
-                break
-    except Exception:
-        pass
+    sp_version = inventory.get("distributions", {}).get(package_name) or "unknown"
 
     # Success message with logo and versions
     console.print("\n" + "="*60, style="white")
@@ -339,6 +258,8 @@ def run_init(dev: bool = False):
         console.print("[bold yellow]Start SignalPilot in Jupyter Lab NOW? y/n[/bold yellow] ", end="")
         response = typer.prompt("", default="y", show_default=True)
         if response.lower() in ["y", "yes"]:
+            from sp.commands.lab import launch_jupyter_with_upgrade_check
+
             venv_dir = home_dir / ".venv"
             launch_jupyter_with_upgrade_check(venv_dir, home_dir)
     except (KeyboardInterrupt, EOFError):
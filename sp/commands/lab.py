@@ -1,40 +1,107 @@
 """Lab and home commands for SignalPilot CLI"""
 
 import sys
+import time
 from pathlib import Path
 
 import typer
 
-from sp.core.config import is_upgrade_check_enabled
-from sp.core.environment import ensure_home_setup, check_local_venv
+from sp.core.config import (
+    SP_SERVERS_DIR,
+    get_lab_profile,
+    is_exec_mode_enabled,
+    is_staged_upgrade_enabled,
+    is_upgrade_check_enabled
+)
+from sp.core.environment import ensure_home_setup, check_local_venv, register_venv
 from sp.core.jupyter import run_jupyter_lab
 from sp.ui.console import console
 from sp.upgrade_check import (
     check_cache_for_upgrades,
+    plan_refresh,
     show_non_blocking_notification,
-    show_blocking_prompt,
+    show_staged_notification,
+    spawn_version_check,
     start_version_check
 )
-from sp.commands.upgrade import upgrade_library
+
+
+def open_on_resident_server(
+    venv_dir: Path, workspace_dir: Path, start: bool = False, extra_args: list = None, profile: str = None
+) -> bool:
+    """Open a workspace on the venv's resident Jupyter server.
+
+    Reusing a live server takes milliseconds instead of a cold start.
+
+    Args:
+        venv_dir: Path to virtual environment
+        workspace_dir: Directory to open in the browser
+        start: Start the resident server if none is running
+        extra_args: Additional jupyter lab arguments (used only when starting)
+        profile: Extension profile (used only when starting)
+
+    Returns:
+        True if the workspace was opened on a resident server
+    """
+    import webbrowser
+
+    from sp.core.daemon import default_root_dir, find_live_server, start_server, tree_url
+
+    entry = find_live_server(venv_dir)
+
+    if entry is None and start:
+        root_dir = default_root_dir(workspace_dir)
+        console.print("\n→ Starting resident Jupyter server...", style="bold green")
+        console.print(f"  Root: {root_dir}", style="dim")
+        console.print(f"  Environment: {venv_dir}", style="dim")
+        entry = start_server(venv_dir, root_dir, extra_args=extra_args, profile=profile)
+        if entry is None:
+            console.print("✗ Jupyter server failed to start", style="bold red")
+            console.print(f"  See log: {SP_SERVERS_DIR}", style="dim")
+            return False
+        if is_upgrade_check_enabled():
+            spawn_version_check(venv_dir)
+        console.print(f"✓ Server ready in {entry['ready_seconds']:.2f}s at {entry['url']} (stop with 'sp stop')", style="green")
+
+    if entry is None:
+        return False
+
+    url = tree_url(entry, workspace_dir)
+    if url is None:
+        if start:
+            console.print(f"✗ {workspace_dir} is outside the server root {entry['root_dir']}", style="bold red")
+        return False
+
+    if not start:
+        console.print(f"→ Reusing SignalPilot server at {entry['url']}", style="bold green")
+    console.print(f"  Workspace: {workspace_dir}", style="dim")
+    webbrowser.open(url)
+    return True
 
 
 def launch_jupyter_with_upgrade_check(
     venv_dir: Path,
     workspace_dir: Path,
     extra_args: list = None,
-    show_warning: bool = False
+    show_warning: bool = False,
+    exec_mode: bool = None,
+    timeline=None,
+    profile: str = None
 ):
     """Launch Jupyter with auto-upgrade check and proper interrupt handling.
 
     Flow:
-    1. Load cache (fast, no web call)
-    2. If cache shows upgrade available:
-       - MINOR: Show non-blocking notification (no delay)
-       - MAJOR/BREAKING: Show blocking prompt (5s timeout)
-    3. If user accepts upgrade: Run upgrade_library()
+    1. Swap in an upgrade staged by an earlier session (see sp.core.staging)
+    2. Load cache (fast, no web call)
+    3. If cache shows upgrade available (notifications never wait for input):
+       - MINOR: Show notification
+       - MAJOR/BREAKING: Show notification and stage the upgrade in a
+         detached, low-priority process, applied at step 1 next time
     4. Print diagnostic info (workspace, venv, versions)
-    5. Launch Jupyter
-    6. Start background PyPI check to update cache for next session
+    5. Start background PyPI check to update cache for next session
+       (daemon thread, or a detached process in exec mode), unless the
+       cache is fresh or backing off after failures (see plan_refresh)
+    6. Launch Jupyter (child process, or exec into it)
     7. Handle KeyboardInterrupt gracefully
 
     Args:
@@ -42,11 +109,48 @@ def launch_jupyter_with_upgrade_check(
         workspace_dir: Working directory for Jupyter
         extra_args: Additional arguments for jupyter lab
         show_warning: Whether to show local .venv warning
+        exec_mode: Replace the sp process with Jupyter (None: use config)
+        timeline: sp.core.timings.Timeline to record launch phases into
+            (forces a child process, since exec leaves nothing to measure)
+        profile: Extension profile ("full" or "minimal"; None: use config)
     """
+    config_start = time.perf_counter()
+    if timeline is not None:
+        exec_mode = False
+    elif exec_mode is None:
+        exec_mode = is_exec_mode_enabled()
+    check_enabled = is_upgrade_check_enabled()
+    stage_enabled = check_enabled and is_staged_upgrade_enabled()
+    if timeline is not None:
+        timeline.add("config load", config_start, time.perf_counter())
+
+    # A major upgrade built in the background last session goes live now
+    staged = None
+    if stage_enabled:
+        from sp.core.staging import apply_staged
+
+        swap_start = time.perf_counter()
+        staged = apply_staged(venv_dir)
+        if timeline is not None:
+            timeline.add("staged swap", swap_start, time.perf_counter())
+        if staged:
+            console.print(
+                f"✓ Applied staged upgrade: {staged['package']} {staged['current']} → {staged['target']}",
+                style="bold green",
+            )
+            console.print("  Undo with 'sp rollback'", style="dim")
+
     # Check if upgrade checking is enabled
-    if is_upgrade_check_enabled():
-        # Check cache for available upgrades (no network call)
-        upgrade_info = check_cache_for_upgrades(venv_dir)
+    refresh_plan = None
+    if check_enabled:
+        # Check cache for available upgrades, and whether it needs a refresh (no network call)
+        cache_start = time.perf_counter()
+        # The cache still records the pre-swap version until the next refresh
+        upgrade_info = None if staged else check_cache_for_upgrades(venv_dir)
+        refresh_plan = plan_refresh(venv_dir)
+        if timeline is not None:
+            timeline.add("cache check", cache_start, time.perf_counter())
+            timeline.note("update check", refresh_plan['reason'])
 
         if upgrade_info:
             upgrade_type = upgrade_info['type']
@@ -60,23 +164,35 @@ def launch_jupyter_with_upgrade_check(
                 show_non_blocking_notification(current, latest, package)
 
             elif upgrade_type in ["major", "breaking"]:
-                # Blocking prompt (5s timeout)
-                should_upgrade = show_blocking_prompt(current, latest, package, timeout=5)
+                if stage_enabled:
+                    # Build the upgraded venv beside this one while Jupyter runs
+                    from sp.core.staging import needs_staging, read_staging, spawn_staging
 
-                if should_upgrade:
-                    # Run upgrade now
-                    console.print("\n→ Starting upgrade process...\n", style="cyan")
-                    upgrade_library(venv_dir)
-                    console.print()  # Blank line
+                    show_staged_notification(current, latest, package, read_staging(venv_dir))
+                    if needs_staging(venv_dir, latest):
+                        spawn_staging(venv_dir)
+                else:
+                    show_non_blocking_notification(current, latest, package)
 
     # Launch Jupyter Lab
     try:
-        # Start background version check to update cache for next session
-        if is_upgrade_check_enabled():
-            start_version_check(venv_dir)
+        # Start background version check to update cache for next session (skipped while fresh)
+        if check_enabled:
+            if exec_mode:
+                spawn_version_check(venv_dir, refresh_plan)
+            else:
+                start_version_check(venv_dir, refresh_plan)
 
-        # Run Jupyter (blocks until terminated)
-        run_jupyter_lab(venv_dir, workspace_dir, extra_args=extra_args, show_warning=show_warning)
+        # Run Jupyter (blocks until terminated, or replaces this process)
+        run_jupyter_lab(
+            venv_dir,
+            workspace_dir,
+            extra_args=extra_args,
+            show_warning=show_warning,
+            exec_mode=exec_mode,
+            timeline=timeline,
+            profile=profile
+        )
 
     except KeyboardInterrupt:
         console.print("\n\n→ Jupyter Lab stopped", style="dim")
@@ -86,8 +202,24 @@ def lab_command(
     ctx: typer.Context,
     home: bool = typer.Option(False, "--home", help="Use SignalPilotHome workspace + venv"),
     project: bool = typer.Option(False, "--project", help="Use current folder + local .venv (fail if missing)"),
+    exec_mode: bool = typer.Option(None, "--exec/--no-exec", help="Replace sp with the Jupyter process"),
+    daemon: bool = typer.Option(False, "--daemon", help="Use (or start) the resident server for this venv"),
+    timings: bool = typer.Option(False, "--timings", help="Record a startup timeline (see 'sp stats')"),
+    profile: str = typer.Option(None, "--profile", help="Extension profile: full or minimal"),
+    explain: bool = typer.Option(False, "--explain", help="Show each extension's startup cost and exit"),
 ):
     """Start Jupyter Lab (default: current folder + home .venv)"""
+    from sp.core.profiles import PROFILES
+
+    if profile is not None and profile not in PROFILES:
+        console.print(f"✗ Unknown profile '{profile}' (choose from: {', '.join(PROFILES)})", style="bold red")
+        sys.exit(1)
+
+    timeline = None
+    if timings:
+        from sp.core.timings import Timeline
+
+        timeline = Timeline()
 
     # Validate mutually exclusive flags
     if home and project:
@@ -118,6 +250,7 @@ def lab_command(
 
         venv_dir = local_venv
         show_warning = False
+        register_venv(venv_dir)
 
     else:
         # Default: Use current folder + home .venv
@@ -128,20 +261,103 @@ def lab_command(
         local_venv = check_local_venv(workspace_dir)
         show_warning = local_venv is not None and workspace_dir != home_dir
 
+    if explain:
+        explain_profile(venv_dir, profile)
+        return
+
+    extra_args = list(ctx.args) if ctx.args else None
+
+    # Reuse a resident server when one is running (or requested via --daemon);
+    # --timings measures a cold start instead
+    if daemon or not (extra_args or timings or profile):
+        if open_on_resident_server(venv_dir, workspace_dir, start=daemon, extra_args=extra_args, profile=profile):
+            return
+        if daemon:
+            sys.exit(1)
+
     # Launch Jupyter Lab with auto-upgrade check
     launch_jupyter_with_upgrade_check(
         venv_dir,
         workspace_dir,
-        extra_args=list(ctx.args) if ctx.args else None,
-        show_warning=show_warning
+        extra_args=extra_args,
+        show_warning=show_warning,
+        exec_mode=exec_mode,
+        timeline=timeline,
+        profile=profile
+    )
+
+
+def explain_profile(venv_dir: Path, profile: str = None):
+    """Print what each installed extension costs at startup under a profile.
+
+    Server extensions are timed by importing each one in a fresh interpreter;
+    lab extensions are sized by the static assets the browser may load.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        profile: Extension profile (None: use config)
+    """
+    from sp.core.profiles import (
+        installed_lab_extensions,
+        installed_server_extensions,
+        lab_extension_size_mb,
+        measure_server_extension,
+        resolve_profile,
     )
 
+    config_profile, allow = get_lab_profile()
+    profile = profile or config_profile
+    resolved = resolve_profile(venv_dir, profile, allow)
+
+    console.print(f"\n→ Extension startup cost (profile: {profile})", style="bold cyan")
+    console.print(f"  Environment: {venv_dir}\n", style="dim")
+
+    console.print(f"  {'Server extension':<40} {'import ms':>10} {'MB':>8}  status", style="bold")
+    total_ms = total_mb = 0.0
+    for name, enabled in installed_server_extensions(venv_dir).items():
+        if not enabled:
+            continue
+        cost = measure_server_extension(venv_dir, name)
+        kept = name not in resolved["server_disabled"]
+        status = "loaded" if kept else "disabled"
+        if cost is None:
+            console.print(f"  {name:<40} {'-':>10} {'-':>8}  {status} (import failed)", style="yellow")
+            continue
+        if kept:
+            total_ms += cost["ms"]
+            total_mb += cost["mb"]
+        console.print(f"  {name:<40} {cost['ms']:>10.0f} {cost['mb']:>8.1f}  {status}", style=None if kept else "dim")
+    console.print(f"  {'Total loaded':<40} {total_ms:>10.0f} {total_mb:>8.1f}\n", style="bold")
+
+    console.print(f"  {'Lab extension':<40} {'assets MB':>10}  status", style="bold")
+    total_mb = 0.0
+    for name, path in installed_lab_extensions(venv_dir).items():
+        size = lab_extension_size_mb(path)
+        kept = name not in resolved["lab_disabled"]
+        if kept:
+            total_mb += size
+        status = "loaded" if kept else "disabled"
+        console.print(f"  {name:<40} {size:>10.1f}  {status}", style=None if kept else "dim")
+    console.print(f"  {'Total loaded':<40} {total_mb:>10.1f}", style="bold")
+
+    if profile == "full":
+        console.print("\n  Try 'sp lab --profile minimal' to load only what SignalPilot needs", style="dim")
 
-def home_command(ctx: typer.Context):
+
+def home_command(
+    ctx: typer.Context,
+    exec_mode: bool = typer.Option(None, "--exec/--no-exec", help="Replace sp with the Jupyter process"),
+):
     """Start Jupyter Lab in SignalPilotHome (shortcut for 'lab --home')"""
     home_dir, home_venv_dir = ensure_home_setup()
+    extra_args = list(ctx.args) if ctx.args else None
+
+    if not extra_args and open_on_resident_server(home_venv_dir, home_dir):
+        return
+
     launch_jupyter_with_upgrade_check(
         home_venv_dir,
         home_dir,
-        extra_args=list(ctx.args) if ctx.args else None
+        extra_args=extra_args,
+        exec_mode=exec_mode
     )
@@ -0,0 +1,99 @@
+"""Notebook commands for SignalPilot CLI"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from sp.jupyter_ext.sp_jupyter.sidecar import compact_notebook, find_store, restore_notebook
+from sp.ui.console import console
+
+DEFAULT_THRESHOLD_KB = 32
+
+
+def find_notebooks(paths: list[Path]) -> list[Path]:
+    """Expand files and directories into notebook paths (skipping checkpoints and hidden folders)."""
+    notebooks = []
+    for path in paths:
+        if path.is_dir():
+            for notebook in sorted(path.rglob("*.ipynb")):
+                parts = notebook.relative_to(path).parts[:-1]
+                if not any(part.startswith(".") for part in parts):
+                    notebooks.append(notebook)
+        elif path.suffix == ".ipynb":
+            notebooks.append(path)
+    return notebooks
+
+
+def write_notebook(path: Path, nb: dict):
+    """Write a notebook the way Jupyter does (indent 1, sorted keys), atomically."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(nb, sort_keys=True, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def compact_file(path: Path, threshold_kb: int = DEFAULT_THRESHOLD_KB) -> tuple[int, int]:
+    """Move a notebook's heavy outputs into sidecar files.
+
+    Args:
+        path: Notebook path
+        threshold_kb: Move output data of at least this many KB
+
+    Returns:
+        (number of data entries moved, bytes moved)
+    """
+    nb = json.loads(path.read_text(encoding="utf-8"))
+    moved, size = compact_notebook(nb, find_store(path), threshold_kb * 1024)
+    if moved:
+        write_notebook(path, nb)
+    return moved, size
+
+
+def restore_file(path: Path) -> tuple[int, int]:
+    """Put a notebook's sidecar outputs back inline.
+
+    Returns:
+        (number of data entries restored, number of sidecars missing)
+    """
+    nb = json.loads(path.read_text(encoding="utf-8"))
+    restored, missing = restore_notebook(nb, find_store(path))
+    if restored:
+        write_notebook(path, nb)
+    return restored, missing
+
+
+def compact_command(paths: list[Path], threshold: int = DEFAULT_THRESHOLD_KB, restore: bool = False):
+    """Compact (or restore) the outputs of notebooks."""
+    notebooks = find_notebooks(paths)
+    if not notebooks:
+        console.print("✗ No notebooks found", style="bold red")
+        sys.exit(1)
+
+    failed = False
+    for notebook in notebooks:
+        try:
+            if restore:
+                restored, missing = restore_file(notebook)
+                if missing:
+                    failed = True
+                    console.print(f"  ⚠ {notebook}: {missing} sidecar output(s) missing", style="yellow")
+                if restored:
+                    console.print(f"  ✓ {notebook}: restored {restored} output(s)", style="green")
+                continue
+
+            before = notebook.stat().st_size
+            moved, _ = compact_file(notebook, threshold)
+            if moved:
+                after = notebook.stat().st_size
+                console.print(
+                    f"  ✓ {notebook}: {before / 1024:.0f} KB → {after / 1024:.0f} KB ({moved} output(s) moved)",
+                    style="green",
+                )
+            else:
+                console.print(f"  → {notebook}: nothing above {threshold} KB", style="dim")
+        except (OSError, ValueError) as e:
+            failed = True
+            console.print(f"  ✗ {notebook}: {e}", style="bold red")
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,79 @@
+"""Rollback command for SignalPilot CLI"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sp.core.environment import select_venv
+from sp.core.snapshot import list_snapshots, remove_snapshot, restore_snapshot
+from sp.ui.console import console
+
+
+def _describe(snapshot: dict) -> str:
+    library = next(
+        (f"{name} {version}" for name, version in snapshot['distributions'].items() if name.startswith("signalpilot-ai")),
+        "no SignalPilot library",
+    )
+    return f"{snapshot['created'][:19].replace('T', ' ')}  {library}  ({snapshot['reason']}, {snapshot['method']})"
+
+
+def rollback_command(project: bool = False, steps: int = 1, list_only: bool = False):
+    """Restore a venv to the snapshot taken before one of its last upgrades.
+
+    Args:
+        project: Roll back the current directory's .venv instead of home
+        steps: Go back this many snapshots (1: undo the last upgrade)
+        list_only: Only list the venv's snapshots
+    """
+    venv_dir = select_venv(project)
+    snapshots = list_snapshots(venv_dir)
+
+    if list_only or not snapshots:
+        if not snapshots:
+            console.print(f"No snapshots for {venv_dir}", style="dim")
+            console.print("  Snapshots are taken before each library upgrade", style="dim")
+            if not list_only:
+                sys.exit(1)
+            return
+        console.print(f"\n→ Snapshots of {venv_dir} (newest first)", style="bold cyan")
+        for position, snapshot in enumerate(snapshots, start=1):
+            console.print(f"  {position}. {_describe(snapshot)}")
+        console.print("\nRestore one with: sp rollback --steps N", style="dim")
+        return
+
+    if steps > len(snapshots):
+        console.print(f"✗ Only {len(snapshots)} snapshot(s) of {venv_dir}", style="bold red")
+        sys.exit(1)
+
+    target = snapshots[steps - 1]
+    console.print(f"\n→ Rolling back {venv_dir}", style="bold cyan")
+    console.print(f"  To: {_describe(target)}", style="dim")
+
+    started = time.perf_counter()
+    try:
+        restore_snapshot(venv_dir, target)
+    except FileNotFoundError as e:
+        # Before OSError, its superclass; only record snapshots run uv
+        if target['method'] == 'record':
+            console.print("✗ uv not found in PATH", style="bold red")
+        else:
+            console.print(f"✗ Rollback failed: {e}", style="bold red")
+        sys.exit(1)
+    except OSError as e:
+        console.print(f"✗ Rollback failed: {e}", style="bold red")
+        sys.exit(1)
+    except subprocess.CalledProcessError as e:
+        console.print(f"✗ Reinstalling the recorded packages failed with exit code {e.returncode}", style="bold red")
+        sys.exit(1)
+
+    # The restored snapshot and everything newer now describe nothing on disk
+    for snapshot in snapshots[:steps]:
+        remove_snapshot(snapshot)
+    console.print(f"✓ Rolled back in {time.perf_counter() - started:.1f}s", style="bold green")
+
+    from sp.core.daemon import find_live_server
+
+    if find_live_server(venv_dir):
+        flag = " --project" if project else ""
+        console.print(f"  A resident server still runs the old packages; restart it with 'sp stop{flag}'", style="yellow")
@@ -0,0 +1,97 @@
+"""Resident server commands (serve, ps, stop) for SignalPilot CLI"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import typer
+
+from sp.core.config import is_upgrade_check_enabled
+from sp.core.daemon import default_root_dir, find_live_server, load_servers, start_server, stop_server
+from sp.core.environment import select_venv
+from sp.ui.console import console
+
+
+def _format_uptime(started_at: str) -> str:
+    """Format the time since an ISO timestamp as e.g. '2h 05m'."""
+    try:
+        started = datetime.fromisoformat(started_at)
+    except (TypeError, ValueError):
+        return "?"
+    minutes = int((datetime.now(timezone.utc) - started).total_seconds() // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def serve_command(
+    project: bool = typer.Option(False, "--project", help="Serve the current folder's .venv instead of home"),
+):
+    """Start the resident Jupyter server for a venv (reused by 'sp lab')"""
+    venv_dir = select_venv(project)
+
+    entry = find_live_server(venv_dir)
+    if entry:
+        console.print(f"✓ Server already running at {entry['url']} (pid {entry['pid']})", style="green")
+        return
+
+    root_dir = default_root_dir(Path.cwd())
+    console.print("→ Starting resident Jupyter server...", style="bold green")
+    console.print(f"  Root: {root_dir}", style="dim")
+    console.print(f"  Environment: {venv_dir}", style="dim")
+
+    entry = start_server(venv_dir, root_dir)
+    if entry is None:
+        console.print("✗ Jupyter server failed to start", style="bold red")
+        sys.exit(1)
+
+    if is_upgrade_check_enabled():
+        from sp.upgrade_check import spawn_version_check
+
+        spawn_version_check(venv_dir)
+
+    console.print(f"✓ Server ready in {entry['ready_seconds']:.2f}s at {entry['url']} (pid {entry['pid']})", style="bold green")
+    console.print("  'sp lab' in any folder under the root now opens instantly", style="dim")
+    console.print(f"  Log: {entry['log']}", style="dim")
+
+
+def ps_command():
+    """List resident Jupyter servers"""
+    servers = load_servers()
+    if not servers:
+        console.print("No resident servers running", style="dim")
+        console.print("  Start one with 'sp serve' or 'sp lab --daemon'", style="dim")
+        return
+
+    for entry in servers:
+        status = "[green]running[/green]" if entry["alive"] else "[red]dead[/red]"
+        console.print(f"{entry.get('pid', '?'):>7}  {status}  {entry.get('url', '?')}  up {_format_uptime(entry.get('started_at'))}")
+        console.print(f"         venv: {entry.get('venv_dir')}", style="dim")
+        console.print(f"         root: {entry.get('root_dir')}", style="dim")
+
+
+def stop_command(
+    project: bool = typer.Option(False, "--project", help="Stop the current folder's .venv server instead of home"),
+    all_servers: bool = typer.Option(False, "--all", help="Stop every resident server"),
+):
+    """Stop a resident Jupyter server"""
+    if all_servers:
+        entries = load_servers()
+    else:
+        entry = find_live_server(select_venv(project))
+        entries = [entry] if entry else []
+
+    if not entries:
+        console.print("No resident server to stop", style="dim")
+        return
+
+    failed = False
+    for entry in entries:
+        if stop_server(entry):
+            console.print(f"✓ Stopped server {entry['url']} (pid {entry['pid']})", style="green")
+        else:
+            console.print(f"✗ Could not stop pid {entry['pid']}", style="bold red")
+            failed = True
+
+    if failed:
+        sys.exit(1)
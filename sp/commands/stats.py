@@ -0,0 +1,55 @@
+"""Stats command for SignalPilot CLI"""
+
+import typer
+
+from sp.core.timings import LAB_PHASES, find_regressions, load_history, percentile
+from sp.ui.console import console
+
+
+def stats_command(
+    last: int = typer.Option(50, "--last", help="Number of recent runs to summarize"),
+):
+    """Summarize startup timings recorded by 'sp lab --timings'"""
+    history = load_history()
+    if not history:
+        console.print("No timings recorded yet", style="dim")
+        console.print("  Run 'sp lab --timings' to record one", style="dim")
+        return
+
+    runs = history[-last:]
+    latest = runs[-1]
+    console.print(f"\n→ Startup timings ({len(runs)} run(s))", style="bold cyan")
+    console.print(
+        f"  Latest: CLI {latest.get('cli_version')}, "
+        f"{latest.get('library') or 'signalpilot-ai'} {latest.get('library_version') or 'not installed'}"
+        + (f", Python {latest['python']}" if latest.get("python") else ""),
+        style="dim",
+    )
+    console.print(f"\n  {'phase':<20} {'p50 ms':>9} {'p95 ms':>9} {'runs':>5}", style="bold")
+
+    for phase in LAB_PHASES + ["total"]:
+        if phase == "total":
+            values = [run["total_ms"] for run in runs if "total_ms" in run]
+        else:
+            values = [run["phases"][phase] for run in runs if phase in run.get("phases", {})]
+        if values:
+            console.print(f"  {phase:<20} {percentile(values, 50):>9.1f} {percentile(values, 95):>9.1f} {len(values):>5}")
+
+    regressions = find_regressions(history)
+    if not regressions:
+        console.print()
+        return
+
+    (cli_before, lib_before), (cli_after, lib_after) = regressions[0]["from"], regressions[0]["to"]
+    console.print(
+        f"\n⚠️  Slower since upgrading (CLI {cli_before} → {cli_after}, library {lib_before} → {lib_after}):",
+        style="bold yellow",
+    )
+    if regressions[0]["venv"]:
+        console.print(f"  Environment: {regressions[0]['venv']}", style="dim")
+    for regression in regressions:
+        console.print(
+            f"  {regression['phase']:<20} p50 {regression['before']:.0f} ms → {regression['after']:.0f} ms",
+            style="yellow",
+        )
+    console.print()
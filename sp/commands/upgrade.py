@@ -2,12 +2,13 @@
 
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 import typer
 
 from sp.core.config import SIGNALPILOT_CLI, is_running_via_uvx
-from sp.core.environment import ensure_home_setup, check_local_venv
+from sp.core.environment import ensure_home_setup, check_local_venv, register_venv
 from sp.ui.console import console
 from sp.upgrade_check import (
     get_cli_version,
@@ -16,6 +17,9 @@ from sp.upgrade_check import (
     compare_versions
 )
 
+# Venvs upgraded at once by 'sp upgrade --all'
+DEFAULT_JOBS = 4
+
 
 def upgrade_cli() -> bool:
     """Upgrade signalpilot CLI package.
@@ -103,88 +107,115 @@ def _upgrade_cli_tool(latest_version: str) -> bool:
         return False
 
 
-def upgrade_library(venv_dir: Path) -> bool:
-    """Upgrade signalpilot-ai library in specified venv.
-
-    Strategy:
-    1. Detect installed package (ai vs ai-internal)
-    2. Check current vs latest version
-    3. Run: uv pip install --upgrade {package_name}
+def take_venv_snapshot(venv_dir: Path, quiet: bool = False) -> dict | None:
+    """Snapshot a venv before its packages change, for 'sp rollback'.
 
     Args:
         venv_dir: Path to virtual environment
+        quiet: Print nothing
 
     Returns:
-        True if successful or already up-to-date, False on error
+        Snapshot manifest (see sp.core.snapshot.take_snapshot), or None
     """
-    console.print("\n→ Checking library version...", style="dim")
+    from sp.core.snapshot import take_snapshot
 
-    lib_info = detect_signalpilot_package(venv_dir)
-    if not lib_info:
-        console.print("✗ SignalPilot library not found in environment", style="red")
-        return False
+    try:
+        snapshot = take_snapshot(venv_dir)
+    except OSError as e:
+        if not quiet:
+            console.print(f"  ⚠ Could not snapshot the environment: {e}", style="yellow")
+        return None
+    if snapshot and not quiet:
+        console.print(
+            f"  Snapshot saved ({snapshot['method']}, {snapshot['seconds']:.1f}s); undo with 'sp rollback'", style="dim"
+        )
+    return snapshot
 
-    package_name, current_version = lib_info
-    console.print(f"  Package: {package_name}", style="dim")
 
-    latest_version = get_pypi_version(package_name, timeout=5.0)
-    if not latest_version:
-        # For -internal, PyPI will return 404 (expected)
-        if "internal" in package_name:
-            console.print("  → Upgrading from internal package source...", style="dim")
-            # Try to upgrade anyway - may have access to internal PyPI
-            latest_version = current_version  # Placeholder
-        else:
-            console.print("✗ Could not fetch latest version from PyPI", style="red")
-            console.print("  Check your internet connection", style="dim")
-            return False
-
-    if latest_version != current_version:  # We have comparison
-        upgrade_type = compare_versions(current_version, latest_version)
-        if upgrade_type == "none":
-            console.print(f"✓ Library already up-to-date (v{current_version})", style="green")
-            return True
-
-        console.print(f"  Current: {current_version}", style="dim")
-        console.print(f"  Latest:  {latest_version}", style="green")
-
-    console.print(f"\n→ Upgrading {package_name}...", style="bold cyan")
+def discard_staging(venv_dir: Path):
+    """Drop an upgrade staged in the background for a venv (see sp.core.staging)."""
+    from sp.core.staging import discard_staging as discard
+
+    discard(venv_dir)
 
-    try:
-        subprocess.run(
-            ["uv", "pip", "install", "--upgrade", package_name],
-            cwd=venv_dir.parent,  # Run from SignalPilotHome directory
-            check=True,
-        )
-        # Get actual installed version after upgrade
-        new_lib_info = detect_signalpilot_package(venv_dir)
-        if new_lib_info:
-            _, new_version = new_lib_info
-            console.print(f"✓ Library upgraded to v{new_version}", style="bold green")
-        else:
-            console.print(f"✓ Library upgraded successfully", style="bold green")
-        return True
-    except subprocess.CalledProcessError as e:
-        console.print(f"✗ Library upgrade failed with exit code {e.returncode}", style="bold red")
-        return False
-    except FileNotFoundError:
-        console.print("✗ uv not found in PATH", style="bold red")
-        console.print("  Install uv first: https://docs.astral.sh/uv/", style="dim")
-        return False
+
+def apply_staged_upgrade(venv_dir: Path):
+    """Swap in the upgrade staged for a venv, reporting why when there is none.
+
+    Args:
+        venv_dir: Path to virtual environment
+    """
+    from sp.core.staging import apply_staged, read_staging
+
+    marker = read_staging(venv_dir)
+    if marker is None:
+        console.print("\n✓ No staged upgrade; run 'sp upgrade' to upgrade now", style="yellow")
+        return
+    if marker['status'] == 'building':
+        console.print(f"\n→ Upgrade to {marker['target']} is still being prepared; try again shortly", style="yellow")
+        return
+    if marker['status'] == 'failed':
+        console.print(f"\n✗ Preparing {marker['package']} {marker['target']} failed: {marker.get('error')}", style="bold red")
+        console.print("  Run 'sp upgrade' to upgrade directly", style="dim")
+        return
+
+    from sp.core.daemon import find_live_server, venv_processes
+
+    if find_live_server(venv_dir):
+        console.print("\n✗ A resident server is running from this environment", style="bold red")
+        console.print("  Stop it with 'sp stop' first", style="dim")
+        sys.exit(1)
+    pids = venv_processes(venv_dir)
+    if pids:
+        console.print("\n✗ Jupyter or kernels are running from this environment", style="bold red")
+        console.print(f"  Close them first (pids: {', '.join(map(str, pids))})", style="dim")
+        sys.exit(1)
+    if apply_staged(venv_dir) is None:
+        console.print("\n⚠ The staged upgrade was not applied: the environment changed after it was built,", style="yellow")
+        console.print("  or another sp process swapped it in first", style="yellow")
+        console.print("  Run 'sp upgrade' to upgrade now", style="dim")
+        return
+    console.print(f"\n✓ {marker['package']} upgraded {marker['current']} → {marker['target']}", style="bold green")
+    console.print("  Undo with 'sp rollback'", style="dim")
 
 
 def upgrade_command(
-    project: bool = typer.Option(False, "--project", help="Upgrade project .venv instead of home")
+    project: bool = typer.Option(False, "--project", help="Upgrade project .venv instead of home"),
+    plan_only: bool = typer.Option(False, "--plan", help="Show and save the upgrade plan without applying it"),
+    all_packages: bool = typer.Option(False, "--all-packages", help="Also upgrade the core packages and their dependencies"),
+    all_venvs: bool = typer.Option(False, "--all", help="Upgrade the home venv and every known project venv"),
+    jobs: int = typer.Option(DEFAULT_JOBS, "--jobs", "-j", min=1, help="Venvs to upgrade at once with --all"),
+    apply_staged: bool = typer.Option(False, "--apply", help="Swap in the upgrade staged in the background"),
 ):
     """Upgrade SignalPilot CLI and library.
 
     Default: Upgrades ~/SignalPilotHome/.venv
     --project: Upgrades current directory's .venv
+    --plan: Shows what would change (with download sizes) and saves the
+        plan; the next 'sp upgrade' applies exactly that plan
+    --all-packages: Upgrades CORE_PACKAGES too, not only SignalPilot
+    --all: Upgrades the home venv and every project venv that
+        'sp lab --project' or 'sp upgrade --project' has used
+    --apply: Swaps in the upgrade 'sp lab' staged in the background
+        (see sp.core.staging) instead of installing anything
     """
+    from sp.core import upgrade_plan
+
+    if all_venvs and project:
+        console.print("✗ Cannot use --all and --project together", style="bold red")
+        sys.exit(1)
+    if apply_staged and (all_venvs or plan_only):
+        console.print("✗ --apply cannot be combined with --all or --plan", style="bold red")
+        sys.exit(1)
+
     console.print("="*60, style="white")
     console.print("📦 SignalPilot Upgrade", style="bold cyan")
     console.print("="*60 + "\n", style="white")
 
+    if all_venvs:
+        upgrade_all_venvs(plan_only=plan_only, all_packages=all_packages, jobs=jobs)
+        return
+
     # Determine venv location
     if project:
         # Use current directory's .venv
@@ -199,14 +230,62 @@ def upgrade_command(
             sys.exit(1)
 
         console.print(f"→ Upgrading project environment: {workspace_dir}", style="dim")
+        register_venv(venv_dir)
     else:
         # Use home .venv
         home_dir, venv_dir = ensure_home_setup()
         console.print(f"→ Upgrading home environment: {home_dir}", style="dim")
 
-    # Upgrade both CLI and library
-    cli_success = upgrade_cli()
-    lib_success = upgrade_library(venv_dir)
+    if apply_staged:
+        apply_staged_upgrade(venv_dir)
+        return
+
+    # Reuse the plan from 'sp upgrade --plan' while it matches the venv
+    plan = None if plan_only else upgrade_plan.load_plan(venv_dir, all_packages)
+    if plan:
+        console.print("→ Applying the plan saved by 'sp upgrade --plan'", style="dim")
+    else:
+        console.print("→ Planning upgrade...", style="dim")
+        plan = upgrade_plan.build_plan(venv_dir, all_packages=all_packages)
+    upgrade_plan.print_plan(plan)
+
+    if plan_only:
+        upgrade_plan.save_plan(plan)
+        console.print("\nRun 'sp upgrade" + (" --project" if project else "")
+                      + (" --all-packages" if all_packages else "") + "' to apply this plan", style="dim")
+        return
+
+    upgrade_plan.discard_plan(venv_dir)
+    cli_success = bool(plan['cli']['latest'])
+    lib_success = plan['library'] is not None and (plan['library']['latest'] is not None or "internal" in plan['library']['package'])
+    lib_changed = False
+    if upgrade_plan.plan_has_changes(plan):
+        # CLI and library steps touch different environments, so run them together
+        console.print("\n→ Applying upgrade (CLI and library in parallel)...", style="bold cyan")
+        if upgrade_plan.plan_has_changes(plan, steps=('library',)):
+            # A build staged in the background is superseded by this upgrade
+            discard_staging(venv_dir)
+            take_venv_snapshot(venv_dir)
+        results = upgrade_plan.apply_plan(plan)
+        if results['cli']:
+            cli_success = results['cli']['ok']
+            _print_step("CLI", results['cli'], f"CLI upgraded to v{plan['cli']['latest']}")
+            if cli_success and plan['cli']['strategy'] == "uvx":
+                console.print(f"  Next run will use v{plan['cli']['latest']}", style="dim")
+        if results['library']:
+            lib_success = lib_changed = results['library']['ok']
+            new_lib_info = detect_signalpilot_package(venv_dir)
+            _print_step("Library", results['library'],
+                        f"Library upgraded to v{new_lib_info[1]}" if new_lib_info else "Library upgraded successfully")
+    else:
+        console.print("\n✓ Nothing to upgrade", style="green")
+
+    # New packages mean stale bytecode and cold Jupyter caches; rebuild them now
+    if lib_changed:
+        from sp.commands.warm import run_optimize, run_warm
+
+        run_optimize(venv_dir)
+        run_warm(venv_dir)
 
     # Print summary
     console.print("\n" + "="*60, style="white")
@@ -223,3 +302,141 @@ def upgrade_command(
         console.print("  Check error messages above", style="dim")
 
     console.print("="*60 + "\n", style="white")
+
+
+def _print_step(label: str, result: dict, success_message: str):
+    """Report one applied plan step with its duration."""
+    if result['ok']:
+        console.print(f"✓ {success_message} ({result['seconds']:.1f}s)", style="bold green")
+    else:
+        console.print(f"✗ {label} upgrade failed: {result['detail']}", style="bold red")
+
+
+def _upgrade_venv(venv_dir: Path, plan: dict) -> dict:
+    """Apply one venv's library plan and rebuild its caches, quietly.
+
+    Returns:
+        Summary row: venv, package, before, after, status, seconds; an
+        error while upgrading is reported as a "failed: ..." status
+    """
+    from sp.core import upgrade_plan
+    from sp.core.optimize import optimize_venv
+    from sp.core.warm import warm_venv
+
+    started = time.perf_counter()
+    library = plan['library']
+    row = {'venv': venv_dir, 'package': library and library['package'],
+           'before': library and library['current'], 'after': library and library['current']}
+    if library is None:
+        return {**row, 'status': "no SignalPilot library", 'seconds': 0.0}
+    if not upgrade_plan.plan_has_changes(plan, steps=('library',)):
+        return {**row, 'status': "up-to-date", 'seconds': 0.0}
+
+    # One venv's error (a full disk, an unwritable cache) must not abort the others
+    try:
+        discard_staging(venv_dir)
+        take_venv_snapshot(venv_dir, quiet=True)
+        result = upgrade_plan.apply_plan(plan, steps=('library',))['library']
+        if not result['ok']:
+            return {**row, 'status': f"failed: {result['detail']}", 'seconds': time.perf_counter() - started}
+        optimize_venv(venv_dir)
+        warm_venv(venv_dir)
+        lib_info = detect_signalpilot_package(venv_dir)
+    except Exception as e:
+        return {**row, 'status': f"failed: {e}", 'seconds': time.perf_counter() - started}
+    return {**row, 'after': lib_info[1] if lib_info else None, 'status': "upgraded",
+            'seconds': time.perf_counter() - started}
+
+
+def upgrade_all_venvs(plan_only: bool = False, all_packages: bool = False, jobs: int = DEFAULT_JOBS):
+    """Upgrade the home venv and every registered project venv.
+
+    Versions are looked up once for all venvs; plans are built and applied
+    `jobs` venvs at a time. Every install goes through the same uv cache:
+    the venv with the most changes is applied first so the wheels the
+    others need are already downloaded and unpacked, and the rest then
+    link from the cache. The CLI is upgraded once, alongside.
+
+    Args:
+        plan_only: Show each venv's plan without applying it
+        all_packages: Also upgrade CORE_PACKAGES in every venv
+        jobs: Maximum venvs to plan or upgrade at once
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sp.core import upgrade_plan
+    from sp.core.environment import check_venv_has_jupyter, get_home_paths, known_venvs
+    from sp.upgrade_check import latest_versions
+
+    _, home_venv_dir = get_home_paths()
+    venvs = ([home_venv_dir] if check_venv_has_jupyter(home_venv_dir) else []) + known_venvs()
+    venvs = list({venv.resolve(): venv for venv in venvs}.values())
+    if not venvs:
+        console.print("✗ No SignalPilot environments found", style="bold red")
+        console.print("\nRun 'uvx signalpilot init', or 'sp lab --project' in a project folder", style="yellow")
+        sys.exit(1)
+
+    console.print(f"→ Planning upgrades for {len(venvs)} environment(s)...", style="dim")
+    packages = {SIGNALPILOT_CLI} | {info[0] for info in map(detect_signalpilot_package, venvs) if info}
+    latest = latest_versions(sorted(packages))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        plans = list(pool.map(lambda venv: upgrade_plan.build_plan(venv, all_packages=all_packages, latest=latest), venvs))
+
+    if plan_only:
+        for venv_dir, plan in zip(venvs, plans):
+            console.print(f"\n[bold]{venv_dir}[/bold]")
+            upgrade_plan.print_plan(plan)
+            upgrade_plan.save_plan(plan)
+        console.print("\nRun 'sp upgrade --all" + (" --all-packages" if all_packages else "") + "' to apply these plans",
+                      style="dim")
+        return
+
+    for venv_dir in venvs:
+        upgrade_plan.discard_plan(venv_dir)
+
+    console.print(f"\n→ Upgrading ({min(jobs, len(venvs))} at a time)...", style="bold cyan")
+    started = time.perf_counter()
+    cli = upgrade_plan.cli_plan(latest.get(SIGNALPILOT_CLI))
+    order = sorted(range(len(venvs)), key=lambda i: -len((plans[i]['library'] or {}).get('changes', [])))
+    rows = [None] * len(venvs)
+    with ThreadPoolExecutor(max_workers=jobs + 1) as pool:
+        cli_future = pool.submit(upgrade_plan.apply_plan, {'cli': cli, 'library': None}, ('cli',))
+        first = order[0]
+        rows[first] = _upgrade_venv(venvs[first], plans[first])
+        futures = {i: pool.submit(_upgrade_venv, venvs[i], plans[i]) for i in order[1:]}
+        for i, future in futures.items():
+            rows[i] = future.result()
+        cli_result = cli_future.result()['cli']
+
+    _print_venv_table(rows)
+    console.print("\n" + "="*60, style="white")
+    if cli_result:
+        _print_step("CLI", cli_result, f"CLI upgraded to v{cli['latest']}")
+    elif cli['latest']:
+        console.print(f"✓ CLI already up-to-date (v{cli['current']})", style="green")
+    else:
+        console.print("⚠ Could not fetch the latest CLI version", style="yellow")
+    failed = [row for row in rows if row['status'].startswith("failed")]
+    if failed:
+        console.print(f"⚠ {len(failed)} of {len(rows)} environment(s) failed to upgrade", style="yellow")
+    else:
+        console.print(f"✓ {len(rows)} environment(s) checked in {time.perf_counter() - started:.1f}s",
+                      style="bold green")
+    console.print("="*60 + "\n", style="white")
+
+
+def _print_venv_table(rows: list[dict]):
+    """Summary of 'sp upgrade --all': one line per venv with its timing."""
+    home = str(Path.home())
+    names = [str(row['venv']).replace(home, "~", 1) for row in rows]
+    width = max(len("environment"), *map(len, names))
+    console.print(f"\n  {'environment':<{width}}  {'package':<24} {'before':>10} {'after':>10} {'time':>7}  status",
+                  style="bold")
+    for name, row in zip(names, rows):
+        style = "red" if row['status'].startswith("failed") else ("green" if row['status'] == "upgraded" else "dim")
+        console.print(
+            f"  {name:<{width}}  {row['package'] or '-':<24} {row['before'] or '-':>10} {row['after'] or '-':>10} "
+            f"{row['seconds']:>6.1f}s  {row['status']}",
+            style=style,
+            markup=False,
+        )
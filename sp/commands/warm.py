@@ -0,0 +1,85 @@
+"""Warm command for SignalPilot CLI"""
+
+from pathlib import Path
+
+import typer
+
+from sp.core.environment import select_venv
+from sp.core.warm import measure_cold_start, warm_venv
+from sp.ui.console import console
+
+
+def run_warm(venv_dir: Path, measure_before: bool = True):
+    """Warm a venv and print a report with the before/after cold-start time.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        measure_before: Also time a cold start before warming
+    """
+    console.print("\n→ Warming Jupyter caches...", style="bold cyan")
+    console.print(f"  Environment: {venv_dir}", style="dim")
+
+    before = None
+    if measure_before:
+        console.print("  → Measuring cold start...", style="dim")
+        before = measure_cold_start(venv_dir)
+
+    result = warm_venv(venv_dir)
+    if result["page_config_changed"]:
+        console.print("  ✓ Disabled announcements extension (page_config.json)", style="green")
+    console.print(f"  ✓ {result['extensions']} lab extension(s) checked", style="green")
+    for name in result["broken_extensions"]:
+        console.print(f"  ⚠ Broken metadata in lab extension {name}", style="yellow")
+    if result["kernelspec"]:
+        console.print("  ✓ Native python3 kernelspec ready", style="green")
+    else:
+        console.print("  ⚠ ipykernel not installed; no native kernelspec", style="yellow")
+    if result["compiled"] is None:
+        console.print("  ✓ Bytecode already compiled for this install", style="green")
+    else:
+        console.print(f"  ✓ Byte-compiled {result['compiled']} startup package(s)", style="green")
+
+    # Starting the server once more also fills Jupyter's own on-disk caches
+    console.print("  → Measuring warm start...", style="dim")
+    after = measure_cold_start(venv_dir)
+
+    if after is None:
+        console.print("  ⚠ Jupyter server did not start; caches written anyway", style="yellow")
+    elif before is None:
+        console.print(f"  ✓ Jupyter starts in {after:.1f}s", style="bold green")
+    else:
+        console.print(f"  ✓ Jupyter start: {before:.1f}s → {after:.1f}s", style="bold green")
+
+
+def run_optimize(venv_dir: Path):
+    """Compile bytecode and build library caches if the venv's packages changed.
+
+    Args:
+        venv_dir: Path to virtual environment
+    """
+    from sp.core.optimize import needs_optimize, optimize_venv
+
+    if not needs_optimize(venv_dir):
+        console.print("✓ Environment already optimized for this install", style="green")
+        return
+
+    console.print("\n→ Optimizing environment (bytecode, library caches)...", style="bold cyan")
+    console.print("  (Runs once per set of installed packages)", style="dim")
+    record = optimize_venv(venv_dir, force=True)
+
+    if record["compiled"]:
+        console.print("  ✓ Compiled site-packages bytecode", style="green")
+    for cache in record["caches"]:
+        console.print(f"  ✓ Built {cache}", style="green")
+
+    before, after = record["first_plot_before"], record["first_plot_after"]
+    if before is not None and after is not None:
+        console.print(f"  ✓ Time to first plot: {before:.1f}s → {after:.1f}s", style="bold green")
+    console.print(f"  Done in {record['seconds']:.0f}s", style="dim")
+
+
+def warm_command(
+    project: bool = typer.Option(False, "--project", help="Warm the current folder's .venv instead of home"),
+):
+    """Rebuild Jupyter startup caches for a venv"""
+    run_warm(select_venv(project))
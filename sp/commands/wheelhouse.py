@@ -0,0 +1,69 @@
+"""Wheelhouse commands for SignalPilot CLI"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from sp.core.config import CORE_PACKAGES, SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL, SP_HOME, get_index_config
+from sp.core.environment import get_home_paths, site_packages_dir
+from sp.ui.console import console
+
+DEFAULT_WHEELHOUSE = SP_HOME / "wheelhouse"
+
+
+def wheelhouse_packages(venv_dir: Path, dev: bool = False) -> list[str]:
+    """Requirements a wheelhouse needs: CORE_PACKAGES plus the SignalPilot library.
+
+    Args:
+        venv_dir: Home venv, used to tell which library is installed
+        dev: Use signalpilot-ai-internal regardless of what is installed
+    """
+    from sp.upgrade_check import detect_signalpilot_package
+
+    if dev:
+        library = SIGNALPILOT_AI_INTERNAL
+    else:
+        lib_info = detect_signalpilot_package(venv_dir)
+        library = lib_info[0] if lib_info else SIGNALPILOT_AI
+    return [*CORE_PACKAGES, library]
+
+
+def build_command(directory: Path = None, dev: bool = False):
+    """Download wheels for the workspace packages and their dependencies."""
+    settings = get_index_config()
+    target = (directory or settings['wheelhouse'] or DEFAULT_WHEELHOUSE).expanduser().resolve()
+
+    # Wheels must match the interpreter and platform of the venvs they serve
+    _, venv_dir = get_home_paths()
+    python = venv_dir / "bin" / "python"
+    site_packages = site_packages_dir(venv_dir)
+    if not python.exists() or site_packages is None:
+        console.print("✗ SignalPilotHome/.venv not found", style="bold red")
+        console.print("\nRun 'uvx signalpilot init' first to set up your environment", style="yellow")
+        sys.exit(1)
+    if not (site_packages / "pip").is_dir():
+        console.print("✗ pip is not installed in SignalPilotHome/.venv", style="bold red")
+        console.print(f"\n  Install it with: uv pip install --python {python} pip", style="yellow")
+        sys.exit(1)
+
+    packages = wheelhouse_packages(venv_dir, dev=dev)
+    console.print(f"\n→ Building wheelhouse at [bold]{target}[/bold]", style="dim")
+    console.print(f"  Packages: {', '.join(packages)}", style="dim")
+
+    cmd = [str(python), "-m", "pip", "wheel", "--wheel-dir", str(target)]
+    if settings['url']:
+        cmd += ["--index-url", settings['url']]
+    target.mkdir(parents=True, exist_ok=True)
+    try:
+        subprocess.run([*cmd, *packages], check=True)
+    except subprocess.CalledProcessError as e:
+        console.print(f"\n✗ pip wheel failed with exit code {e.returncode}", style="bold red")
+        sys.exit(1)
+
+    wheels = sorted(target.glob("*.whl"))
+    size_mb = sum(wheel.stat().st_size for wheel in wheels) / 1024 / 1024
+    console.print(f"\n✓ {len(wheels)} wheel(s) in {target} ({size_mb:.0f} MB)", style="bold green")
+
+    if settings['wheelhouse'] is None or settings['wheelhouse'].expanduser().resolve() != target:
+        console.print("\nTo install and upgrade from it, add to ~/SignalPilotHome/.signalpilot/config.toml:", style="yellow")
+        console.print(f'  [index]\n  wheelhouse = "{target}"', style="dim", markup=False)
@@ -1,5 +1,7 @@
 """Configuration and paths for SignalPilot CLI"""
 
+import copy
+import os
 import sys
 from pathlib import Path
 
@@ -9,6 +11,11 @@ SP_VENV = SP_HOME / ".venv"
 SP_CONFIG_DIR = SP_HOME / ".signalpilot"
 SP_CACHE_FILE = SP_CONFIG_DIR / "upgrade-cache.json"
 SP_CONFIG_FILE = SP_CONFIG_DIR / "config.toml"
+SP_SERVERS_DIR = SP_CONFIG_DIR / "servers"
+SP_INVENTORY_DIR = SP_CONFIG_DIR / "inventory"
+SP_PLANS_DIR = SP_CONFIG_DIR / "plans"
+SP_VENVS_DIR = SP_CONFIG_DIR / "venvs"
+SP_SNAPSHOTS_DIR = SP_CONFIG_DIR / "snapshots"
 
 # Workspace paths
 SP_USER_SKILLS = SP_HOME / "user-skills"
@@ -69,47 +76,244 @@ def is_running_via_uvx() -> bool:
     return ".local/share/uv" in sys.prefix or "uvx" in sys.prefix
 
 
-def load_config() -> dict:
-    """Load user configuration from config.toml.
+# Project-level overrides, looked up from the current folder upwards
+PROJECT_CONFIG_FILE = ".signalpilot.toml"
 
-    Automatically creates default config file if it doesn't exist.
+# Environment overrides: SP_<SECTION>__<KEY>=<TOML value>, e.g. SP_LAB__EXEC=true
+ENV_PREFIX = "SP_"
 
-    Returns:
-        Dict with config values, or defaults if file doesn't exist.
-        Default: {'upgrade': {'check_enabled': True}}
-    """
-    default_config = {
-        'upgrade': {
-            'check_enabled': True
-        }
+# Sections a project file may not set. A cloned repository's .signalpilot.toml
+# must not point installs at another package index, import modules of its
+# choosing into pooled kernels ([kernels] preload) or turn off update checks.
+# [lab] stays per-project: it only picks the extension profile and launch mode.
+USER_ONLY_SECTIONS = ('index', 'kernels', 'upgrade')
+
+DEFAULT_CONFIG = {
+    'upgrade': {
+        'check_enabled': True
     }
+}
 
-    # Ensure config directory exists
-    SP_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Create default config file if it doesn't exist
-    if not SP_CONFIG_FILE.exists():
+def _merge(base: dict, override: dict) -> dict:
+    """Recursively merge override into a copy of base."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _parse_env_value(raw: str):
+    """Parse an override as a TOML value (true, 2, ["pandas"]), else keep the string."""
+    try:
+        return _toml_loads(f"value = {raw}")["value"]
+    except Exception:
+        return raw
+
+
+def _toml_loads(text: str) -> dict:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+    return tomllib.loads(text)
+
+
+def find_project_config(start: Path = None) -> Path | None:
+    """Nearest .signalpilot.toml at or above a folder (default: the current one)."""
+    try:
+        folder = (start or Path.cwd()).resolve()
+    except OSError:
+        return None
+    for candidate in (folder, *folder.parents):
+        path = candidate / PROJECT_CONFIG_FILE
+        if path.is_file():
+            return path
+    return None
+
+
+class LayeredConfig:
+    """Process-wide configuration, resolved in one pass from these layers (later wins):
+
+    1. DEFAULT_CONFIG
+    2. ~/SignalPilotHome/.signalpilot/config.toml
+    3. the nearest .signalpilot.toml from the current folder up, minus
+       USER_ONLY_SECTIONS (ignored with a warning)
+    4. SP_<SECTION>__<KEY> environment variables
+
+    Each file is parsed at most once per (mtime, size), and the merged
+    result is reused until a file or override changes. Reading never
+    creates or writes files.
+    """
+
+    def __init__(self):
+        self._files = {}  # path -> ((mtime_ns, size), parsed dict)
+        self._merged_key = None
+        self._merged = None
+        self._warned = set()  # (path, stamp) of project files already warned about
+
+    def _read(self, path: Path) -> tuple[tuple | None, dict]:
+        try:
+            info = path.stat()
+        except OSError:
+            return None, {}
+        stamp = (info.st_mtime_ns, info.st_size)
+        cached = self._files.get(path)
+        if cached and cached[0] == stamp:
+            return cached
         try:
-            with open(SP_CONFIG_FILE, 'w') as f:
-                f.write("[upgrade]\n")
-                f.write("check_enabled = true\n")
+            data = _toml_loads(path.read_text(encoding='utf-8'))
         except Exception:
-            # If we can't write config, just return defaults
-            pass
-        return default_config
+            # Unreadable or invalid file: ignore this layer
+            data = {}
+        self._files[path] = (stamp, data)
+        return stamp, data
+
+    @staticmethod
+    def _env_overrides() -> tuple:
+        overrides = []
+        for name, raw in os.environ.items():
+            if name.startswith(ENV_PREFIX) and '__' in name:
+                section, _, key = name[len(ENV_PREFIX):].lower().partition('__')
+                if section and key:
+                    overrides.append((section, key, raw))
+        return tuple(sorted(overrides))
+
+    def load(self) -> dict:
+        """Resolve the merged configuration.
+
+        Returns:
+            Dict of section -> settings (a copy; safe to modify)
+        """
+        user_stamp, user = self._read(SP_CONFIG_FILE)
+        project_path = find_project_config()
+        project_stamp, project = self._read(project_path) if project_path else (None, {})
+        env = self._env_overrides()
+
+        key = (str(SP_CONFIG_FILE), user_stamp, project_path, project_stamp, env)
+        if key != self._merged_key:
+            ignored = [section for section in USER_ONLY_SECTIONS if section in project]
+            if ignored:
+                project = {section: value for section, value in project.items() if section not in ignored}
+                if (project_path, project_stamp) not in self._warned:
+                    self._warned.add((project_path, project_stamp))
+                    from sp.ui.console import console
+
+                    sections = ", ".join(f"[{section}]" for section in ignored)
+                    console.print(
+                        f"⚠ Ignoring {sections} in {project_path}: set it in {SP_CONFIG_FILE} instead",
+                        style="yellow", markup=False,
+                    )
+            merged = _merge(_merge(DEFAULT_CONFIG, user), project)
+            for section, name, raw in env:
+                merged = _merge(merged, {section: {name: _parse_env_value(raw)}})
+            self._merged_key, self._merged = key, merged
+        return copy.deepcopy(self._merged)
+
+
+_config = LayeredConfig()
+
+
+def load_config() -> dict:
+    """Load user configuration (see LayeredConfig for the layers).
+
+    Returns:
+        Dict with config values; defaults where nothing is set.
+        Default: {'upgrade': {'check_enabled': True}}
+    """
+    return _config.load()
+
+
+def write_default_config() -> bool:
+    """Create config.toml with the default settings if it doesn't exist.
 
-    # Load existing config file
+    Returns:
+        True if the file was created
+    """
+    if SP_CONFIG_FILE.exists():
+        return False
     try:
-        import tomli
-        with open(SP_CONFIG_FILE, 'rb') as f:
-            config = tomli.load(f)
-        return config
-    except Exception:
-        # If any error loading config, return defaults
-        return default_config
+        SP_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        SP_CONFIG_FILE.write_text("[upgrade]\ncheck_enabled = true\n")
+    except OSError:
+        return False
+    return True
 
 
 def is_upgrade_check_enabled() -> bool:
     """Check if auto-upgrade checking is enabled in config."""
     config = load_config()
     return config.get('upgrade', {}).get('check_enabled', True)
+
+
+def is_staged_upgrade_enabled() -> bool:
+    """Check if major library upgrades are staged in the background (config: [upgrade] stage)."""
+    config = load_config()
+    return config.get('upgrade', {}).get('stage', True)
+
+
+def is_exec_mode_enabled() -> bool:
+    """Check if sp lab should exec into Jupyter (config: [lab] exec)."""
+    config = load_config()
+    return config.get('lab', {}).get('exec', False)
+
+
+def get_kernel_pool_config() -> dict:
+    """Read the warm kernel pool settings (config: [kernels]).
+
+    Returns:
+        Dict with pool_size, preload, max_memory_mb and idle_timeout_minutes.
+        pool_size 0 (the default) disables the pool.
+    """
+    kernels = load_config().get('kernels', {})
+    return {
+        'pool_size': int(kernels.get('pool_size', 0)),
+        'preload': list(kernels.get('preload', [])),
+        'max_memory_mb': int(kernels.get('max_memory_mb', 0)),
+        'idle_timeout_minutes': int(kernels.get('idle_timeout_minutes', 30)),
+    }
+
+
+def get_lab_profile() -> tuple[str, list[str]]:
+    """Read the extension profile for sp lab (config: [lab] profile, allow_extensions).
+
+    Returns:
+        Tuple of (profile name, extra extension name patterns to keep)
+    """
+    lab = load_config().get('lab', {})
+    return lab.get('profile', 'full'), list(lab.get('allow_extensions', []))
+
+
+def get_index_config() -> dict:
+    """Read the package index for the workspace (config: [index] url, wheelhouse).
+
+    Only from config.toml and SP_INDEX__* variables, never a project's
+    .signalpilot.toml (see USER_ONLY_SECTIONS).
+
+    Returns:
+        Dict with 'url' (PEP 503/691 simple index or file:// mirror, None
+        for PyPI) and 'wheelhouse' (Path of a local wheel directory, or None)
+    """
+    index = load_config().get('index', {})
+    wheelhouse = index.get('wheelhouse')
+    return {
+        'url': index.get('url') or None,
+        'wheelhouse': Path(wheelhouse).expanduser() if wheelhouse else None,
+    }
+
+
+def get_snapshot_config() -> dict:
+    """Read venv snapshot retention (config: [snapshots] keep, max_mb).
+
+    Returns:
+        Dict with 'keep' (snapshots per venv; 0 disables snapshots) and
+        'max_mb' (disk used by all snapshots together)
+    """
+    snapshots = load_config().get('snapshots', {})
+    return {
+        'keep': int(snapshots.get('keep', 3)),
+        'max_mb': int(snapshots.get('max_mb', 2048)),
+    }
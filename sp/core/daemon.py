@@ -0,0 +1,282 @@
+"""Resident Jupyter server daemon for SignalPilot CLI.
+
+One long-lived server per venv, rooted high enough (the user's home by
+default) to serve any workspace. Running servers are recorded in
+SignalPilotHome/.signalpilot/servers/<venv-key>.json so later `sp lab`
+calls in any directory can reuse them by opening the browser at that
+directory's tree URL instead of cold-starting a new server.
+
+Unlike a foreground `sp lab`, a resident server outlives the session,
+so it requires a random token. The token is only stored in the
+registry entry, which is readable by the owner alone.
+"""
+
+import json
+import os
+import secrets
+import signal
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+from sp.core.config import SP_SERVERS_DIR, get_kernel_pool_config, get_lab_profile
+from sp.core.environment import venv_key
+from sp.core.fileutil import atomic_write_json
+from sp.core.jupyter import build_jupyter_command, build_jupyter_env
+from sp.core.readiness import find_free_port, server_responds, wait_for_server
+
+
+def registry_path(venv_dir: Path) -> Path:
+    """Path of the registry entry for the server owned by a venv."""
+    return SP_SERVERS_DIR / f"{venv_key(venv_dir)}.json"
+
+
+def default_root_dir(workspace_dir: Path) -> Path:
+    """Pick a server root that can serve the workspace.
+
+    The user's home covers almost every workspace; a workspace outside it
+    (e.g. /data/q3) is served from the workspace itself, never from a
+    shared directory above it.
+    """
+    home = Path.home().resolve()
+    workspace = workspace_dir.resolve()
+    if workspace == home or home in workspace.parents:
+        return home
+    return workspace
+
+
+def is_process_alive(pid: int) -> bool:
+    """Check whether a process exists without signalling it."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _process_commands() -> dict[int, list[str]]:
+    """Command lines of all visible processes, from /proc or `ps`."""
+    commands = {}
+    proc = Path("/proc")
+    if proc.is_dir():
+        for entry in proc.iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                argv = (entry / "cmdline").read_bytes().split(b"\0")
+            except OSError:
+                continue
+            commands[int(entry.name)] = [os.fsdecode(arg) for arg in argv if arg]
+        return commands
+
+    try:
+        output = subprocess.run(
+            ["ps", "-axww", "-o", "pid=,args="], capture_output=True, text=True, timeout=5
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return commands
+    for line in output.splitlines():
+        pid, _, args = line.strip().partition(" ")
+        if pid.isdigit():
+            commands[int(pid)] = args.split()
+    return commands
+
+
+def venv_processes(venv_dir: Path) -> list[int]:
+    """Processes running the venv's interpreter or one of its scripts.
+
+    Covers foreground `sp lab` servers, resident servers and the kernels
+    they start: Jupyter launches kernels with the venv's bin/python.
+
+    Args:
+        venv_dir: Path to virtual environment
+
+    Returns:
+        Sorted pids, not including this process
+    """
+    prefixes = {f"{venv_dir}{os.sep}", f"{venv_dir.resolve()}{os.sep}"}
+    return sorted(
+        pid for pid, argv in _process_commands().items()
+        if pid != os.getpid() and any(arg.startswith(tuple(prefixes)) for arg in argv[:2])
+    )
+
+
+def load_servers() -> list[dict]:
+    """Load all registry entries.
+
+    Returns:
+        List of entry dicts, each with an extra 'alive' key
+    """
+    if not SP_SERVERS_DIR.exists():
+        return []
+
+    servers = []
+    for path in sorted(SP_SERVERS_DIR.glob("*.json")):
+        try:
+            entry = json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError):
+            continue
+        entry["alive"] = is_process_alive(entry.get("pid", -1))
+        servers.append(entry)
+    return servers
+
+
+def find_live_server(venv_dir: Path) -> dict | None:
+    """Find the running daemon for a venv, dropping stale registry entries.
+
+    Args:
+        venv_dir: Path to virtual environment
+
+    Returns:
+        Registry entry dict, or None if no live server exists
+    """
+    path = registry_path(venv_dir)
+    try:
+        entry = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return None
+
+    if is_process_alive(entry.get("pid", -1)) and server_responds(entry.get("port", 0)):
+        return entry
+
+    path.unlink(missing_ok=True)
+    return None
+
+
+def start_server(
+    venv_dir: Path, root_dir: Path, extra_args: list = None, timeout: float = 60.0, profile: str = None
+) -> dict | None:
+    """Start a detached Jupyter server for a venv and register it.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        root_dir: Server root directory
+        extra_args: Additional command-line arguments for jupyter lab
+        timeout: Seconds to wait for the server to answer
+        profile: Extension profile ("full" or "minimal"); read from config.toml if None
+
+    Returns:
+        Registry entry dict, or None if the server failed to start
+    """
+    from sp.core.profiles import build_profile
+
+    SP_SERVERS_DIR.mkdir(parents=True, exist_ok=True)
+    key = venv_key(venv_dir)
+    port = find_free_port()
+    log_path = SP_SERVERS_DIR / f"{key}.log"
+
+    config_profile, allow = get_lab_profile()
+    profile = profile or config_profile
+    profile_args, profile_env = build_profile(venv_dir, profile, allow)
+    env = build_jupyter_env(venv_dir)
+    env.update(profile_env)
+    token = secrets.token_urlsafe(32)
+    env["JUPYTER_TOKEN"] = token
+
+    cmd = build_jupyter_command(venv_dir, [
+        *profile_args,
+        "--no-browser",
+        f"--port={port}",
+        "--ServerApp.port_retries=0",
+        f"--ServerApp.root_dir={root_dir}",
+        *(extra_args or []),
+    ], kernel_pool=get_kernel_pool_config(), token_from_env=True)
+    # Jupyter logs its URL, token included: owner-only like the registry entry
+    log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    os.chmod(log_path, 0o600)
+    with open(log_fd, "ab") as log:
+        log_offset = log.seek(0, os.SEEK_END)
+        process = subprocess.Popen(
+            cmd,
+            cwd=root_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+    ready = wait_for_server(process, port=port, log_path=log_path, log_offset=log_offset, timeout=timeout)
+    if ready is None:
+        if process.poll() is None:
+            process.terminate()
+        return None
+
+    entry = {
+        "pid": process.pid,
+        "port": port,
+        "url": f"http://localhost:{port}/",
+        "token": token,
+        "root_dir": str(root_dir),
+        "venv_dir": str(venv_dir),
+        "log": str(log_path),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "ready_seconds": round(ready["seconds"], 3),
+        "profile": profile,
+    }
+    atomic_write_json(registry_path(venv_dir), entry)
+    return entry
+
+
+def stop_server(entry: dict, timeout: float = 10.0) -> bool:
+    """Stop a registered server and remove its registry entry.
+
+    Sends SIGTERM to the server's process group (Jupyter shuts its kernels
+    down cleanly), escalating to SIGKILL after the timeout.
+
+    Args:
+        entry: Registry entry dict
+        timeout: Seconds to wait for a clean shutdown
+
+    Returns:
+        True if the server is no longer running
+    """
+    pid = entry.get("pid", -1)
+    stopped = True
+
+    if is_process_alive(pid):
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+        deadline = time.monotonic() + timeout
+        while is_process_alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+        if is_process_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                stopped = False
+
+    if stopped:
+        registry_path(Path(entry["venv_dir"])).unlink(missing_ok=True)
+    return stopped
+
+
+def tree_url(entry: dict, workspace_dir: Path) -> str | None:
+    """Build the JupyterLab URL that opens a workspace on a running server.
+
+    Args:
+        entry: Registry entry dict
+        workspace_dir: Directory to open
+
+    Returns:
+        URL string (with the server's token), or None if the workspace is
+        outside the server root
+    """
+    root = Path(entry["root_dir"]).resolve()
+    workspace = workspace_dir.resolve()
+    if workspace != root and root not in workspace.parents:
+        return None
+
+    relative = workspace.relative_to(root).as_posix()
+    url = f"{entry['url']}lab/tree" if relative == "." else f"{entry['url']}lab/tree/{quote(relative)}"
+    if entry.get("token"):
+        url += f"?token={quote(entry['token'])}"
+    return url
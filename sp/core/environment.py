@@ -1,5 +1,9 @@
 """Virtual environment management for SignalPilot CLI"""
 
+import hashlib
+import json
+import os
+import re
 import sys
 from pathlib import Path
 
@@ -28,6 +32,143 @@ def check_venv_has_jupyter(venv_dir: Path) -> bool:
     return (venv_dir / "bin" / "jupyter").exists()
 
 
+def site_packages_dir(venv_dir: Path) -> Path | None:
+    """Return the venv's site-packages directory, if it has one."""
+    candidates = sorted(venv_dir.glob("lib/python*/site-packages"))
+    return candidates[-1] if candidates else None
+
+
+def venv_key(venv_dir: Path) -> str:
+    """Stable short identifier for a venv, used to name its state files."""
+    return hashlib.sha1(str(venv_dir.resolve()).encode()).hexdigest()[:12]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name (PEP 503): "SignalPilot_AI" -> "signalpilot-ai"."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _read_metadata_version(dist_info: Path) -> str | None:
+    """Version header of a dist-info METADATA file, reading only the headers."""
+    try:
+        with open(dist_info / "METADATA", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    break
+                if line.startswith("Version:"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return None
+
+
+def read_python_version(venv_dir: Path) -> str | None:
+    """Interpreter version of a venv from its pyvenv.cfg (no interpreter started)."""
+    try:
+        lines = (venv_dir / "pyvenv.cfg").read_text().splitlines()
+    except OSError:
+        return None
+    values = {}
+    for line in lines:
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip()] = value.strip()
+    # uv writes version_info, the venv module writes version
+    return values.get("version_info") or values.get("version")
+
+
+def _build_inventory(venv_dir: Path, site_packages: Path, mtime_ns: int) -> dict:
+    distributions = {}
+    with os.scandir(site_packages) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".dist-info"):
+                continue
+            name, _, version = entry.name[:-len(".dist-info")].rpartition("-")
+            distributions[normalize_name(name)] = _read_metadata_version(Path(entry.path)) or version
+    return {
+        "venv": str(venv_dir),
+        "python": read_python_version(venv_dir),
+        "site_packages": str(site_packages),
+        "mtime_ns": mtime_ns,
+        "distributions": dict(sorted(distributions.items())),
+    }
+
+
+# venv key -> inventory dict, for repeated lookups within one process
+_inventories = {}
+
+
+def venv_inventory(venv_dir: Path) -> dict | None:
+    """Installed distributions and interpreter version of a venv.
+
+    Built from the dist-info METADATA headers in site-packages and from
+    pyvenv.cfg, without starting any process, and persisted in
+    SignalPilotHome/.signalpilot/inventory/<venv-key>.json. It is rebuilt
+    when site-packages' mtime changes (installs and upgrades add or
+    rename dist-info directories). Nothing is imported and sys.path is
+    untouched, so this is safe to call from background threads.
+
+    Args:
+        venv_dir: Path to virtual environment
+
+    Returns:
+        {'venv', 'python', 'site_packages', 'mtime_ns',
+        'distributions': {normalized name: version}}, or None if the venv
+        has no site-packages
+    """
+    from sp.core.config import SP_INVENTORY_DIR
+
+    site_packages = site_packages_dir(venv_dir)
+    if site_packages is None:
+        return None
+    try:
+        mtime_ns = site_packages.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = venv_key(venv_dir)
+    inventory = _inventories.get(key)
+    if inventory is None:
+        try:
+            inventory = json.loads((SP_INVENTORY_DIR / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            inventory = None
+    if inventory and inventory.get("mtime_ns") == mtime_ns and inventory.get("site_packages") == str(site_packages):
+        _inventories[key] = inventory
+        return inventory
+
+    try:
+        inventory = _build_inventory(venv_dir, site_packages, mtime_ns)
+    except OSError:
+        return None
+    _inventories[key] = inventory
+
+    from sp.core.fileutil import atomic_write_json
+
+    try:
+        atomic_write_json(SP_INVENTORY_DIR / f"{key}.json", inventory)
+    except OSError:
+        # Read-only home: keep the in-memory inventory
+        pass
+    return inventory
+
+
+def installed_version(venv_dir: Path, package_name: str) -> str | None:
+    """Version of a distribution installed in a venv (see venv_inventory).
+
+    Args:
+        venv_dir: Path to virtual environment
+        package_name: Distribution name, e.g. "signalpilot-ai"
+
+    Returns:
+        Version string, or None if not installed
+    """
+    inventory = venv_inventory(venv_dir)
+    if inventory is None:
+        return None
+    return inventory["distributions"].get(normalize_name(package_name))
+
+
 def check_local_venv(directory: Path = None) -> Path | None:
     """Check if directory has a .venv with jupyter installed.
 
@@ -91,3 +232,61 @@ def check_uv() -> bool:
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
+
+
+def select_venv(project: bool) -> Path:
+    """Pick the home venv, or the current directory's .venv with --project.
+
+    Exits:
+        If --project is given and no .venv with jupyter exists
+    """
+    if not project:
+        _, home_venv_dir = ensure_home_setup()
+        return home_venv_dir
+
+    venv_dir = check_local_venv(Path.cwd())
+    if venv_dir is None:
+        console.print("✗ No .venv with jupyter found in current directory", style="bold red")
+        sys.exit(1)
+    return venv_dir
+
+
+def register_venv(venv_dir: Path):
+    """Remember a project venv for 'sp upgrade --all'.
+
+    One file per venv in SignalPilotHome/.signalpilot/venvs/, written
+    only the first time, so repeat launches cost a single stat.
+    """
+    from sp.core.config import SP_VENVS_DIR
+    from sp.core.fileutil import atomic_write_json
+
+    entry_path = SP_VENVS_DIR / f"{venv_key(venv_dir)}.json"
+    if entry_path.exists():
+        return
+    from datetime import datetime, timezone
+
+    try:
+        atomic_write_json(entry_path, {
+            "venv": str(venv_dir.resolve()),
+            "registered": datetime.now(timezone.utc).isoformat(),
+        })
+    except OSError:
+        # Read-only home: the venv just isn't remembered
+        pass
+
+
+def known_venvs() -> list[Path]:
+    """Registered project venvs that still exist, dropping entries for deleted ones."""
+    from sp.core.config import SP_VENVS_DIR
+
+    venvs = []
+    for entry_path in sorted(SP_VENVS_DIR.glob("*.json")):
+        try:
+            venv_dir = Path(json.loads(entry_path.read_text())["venv"])
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        if check_venv_has_jupyter(venv_dir):
+            venvs.append(venv_dir)
+        else:
+            entry_path.unlink(missing_ok=True)
+    return venvs
@@ -0,0 +1,118 @@
+"""Safe state-file writes for SignalPilot CLI.
+
+Several sp processes (concurrent lab sessions, the background version
+check) read and write the same files under SignalPilotHome/.signalpilot.
+Writes go to a temporary file in the same directory and are renamed over
+the target, so readers never see a torn file and need no lock; writers
+that read-modify-write take an advisory lock on a sibling .lock file.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def atomic_write_text(path: Path, text: str):
+    """Replace a file's contents in one rename.
+
+    Args:
+        path: Target file (its directory is created if missing)
+        text: New contents
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_json(path: Path, data, indent: int = 2):
+    """Write JSON to a file in one rename (see atomic_write_text)."""
+    atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock for a file while the block runs.
+
+    The lock is taken on `<path>.lock`, not the file itself, because the
+    file is replaced by rename while locked.
+
+    Args:
+        path: File being protected
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as lock:
+        if os.name == "posix":
+            import fcntl
+
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        else:
+            import msvcrt
+
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# renameat2(2) flag and "relative to cwd" descriptor, from linux/fs.h and fcntl.h
+RENAME_EXCHANGE = 2
+AT_FDCWD = -100
+
+
+def _renameat2_exchange(first: Path, second: Path) -> bool:
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError):
+        # glibc < 2.28, musl
+        return False
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    return renameat2(AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), RENAME_EXCHANGE) == 0
+
+
+def exchange_dirs(new: Path, live: Path) -> Path:
+    """Put directory `new` in place of `live`, atomically where the OS allows.
+
+    On Linux both names are swapped in one renameat2(RENAME_EXCHANGE)
+    call, so `live` always exists; elsewhere (or if the filesystem
+    refuses) `live` is renamed aside and `new` renamed into its place.
+
+    Returns:
+        Path now holding the old contents of `live`
+
+    Raises:
+        OSError: If the directories cannot be renamed
+    """
+    import sys
+
+    if sys.platform == "linux" and _renameat2_exchange(new, live):
+        return new
+    aside = live.with_name(live.name + ".replaced")
+    os.rename(live, aside)
+    try:
+        os.rename(new, live)
+    except OSError:
+        os.rename(aside, live)
+        raise
+    return aside
@@ -0,0 +1,211 @@
+"""Pooled keep-alive HTTPS requests for SignalPilot CLI.
+
+Version lookups go through here instead of urllib: urllib opens (and
+TLS-handshakes) a new connection for every request, which costs several
+round-trips per lookup on a high-latency proxy. fetch() keeps idle
+connections per host and reuses them; fetch_many() runs a batch of
+requests in parallel under one overall deadline, so a command's lookups
+cost about one round-trip together.
+
+Proxies come from the usual environment variables (HTTPS_PROXY,
+NO_PROXY), as with urllib.
+"""
+
+import base64
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Idle connections kept per host; the pool never holds more than this
+MAX_IDLE_PER_HOST = 4
+
+USER_AGENT = "signalpilot-cli"
+
+_idle = {}
+_lock = threading.Lock()
+_ssl_context = None
+
+
+def _context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _route(scheme: str, host: str, port: int) -> tuple:
+    """Pool key for a host: (scheme, host, port, proxy URL or None)."""
+    proxy = None
+    if not urllib.request.proxy_bypass(host):
+        proxy = urllib.request.getproxies().get(scheme)
+    return scheme, host, port, proxy
+
+
+def _parse_proxy(proxy: str) -> urllib.parse.SplitResult:
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _proxy_headers(proxy: str) -> dict:
+    """Proxy-Authorization header for Basic credentials in the proxy URL, if any."""
+    parsed = _parse_proxy(proxy)
+    if not parsed.username:
+        return {}
+    credentials = f"{urllib.parse.unquote(parsed.username)}:{urllib.parse.unquote(parsed.password or '')}"
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode()).decode()}
+
+
+def _connect(route: tuple, timeout: float) -> http.client.HTTPConnection:
+    scheme, host, port, proxy = route
+    if not proxy:
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=_context())
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    # HTTPS through a proxy: CONNECT tunnel, which carries the proxy credentials;
+    # plain http is sent to the proxy as is and fetch() adds them per request
+    parsed = _parse_proxy(proxy)
+    if scheme == "https":
+        conn = http.client.HTTPSConnection(parsed.hostname, parsed.port or 8080, timeout=timeout, context=_context())
+        conn.set_tunnel(host, port, headers=_proxy_headers(proxy))
+    else:
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 8080, timeout=timeout)
+    return conn
+
+
+def _acquire(route: tuple, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+    """An idle connection for a route (reused=True), or a new one."""
+    with _lock:
+        idle = _idle.get(route)
+        if idle:
+            conn = idle.pop()
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+    return _connect(route, timeout), False
+
+
+def _release(route: tuple, conn: http.client.HTTPConnection):
+    with _lock:
+        idle = _idle.setdefault(route, [])
+        if len(idle) < MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def close_all():
+    """Close every idle connection."""
+    with _lock:
+        connections = [conn for idle in _idle.values() for conn in idle]
+        _idle.clear()
+    for conn in connections:
+        conn.close()
+
+
+def fetch(url: str, headers: dict = None, timeout: float = 5.0) -> dict:
+    """GET a URL over a pooled keep-alive connection.
+
+    gzip bodies are decompressed (a corrupt one raises OSError). A request
+    on a reused connection that the server has meanwhile closed is retried
+    once on a new one.
+
+    Args:
+        url: http(s) URL
+        headers: Request headers
+        timeout: Socket timeout in seconds
+
+    Returns:
+        {'status': int, 'headers': {lowercased name: value}, 'body': bytes}
+        for any HTTP status (including 304 and 404)
+
+    Raises:
+        OSError or http.client.HTTPException on connection errors
+    """
+    parts = urllib.parse.urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    route = _route(parts.scheme, parts.hostname, port)
+    proxied_http = route[3] and parts.scheme == "http"
+    target = url if proxied_http else (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = {"User-Agent": USER_AGENT, **(_proxy_headers(route[3]) if proxied_http else {}), **(headers or {})}
+
+    while True:
+        conn, reused = _acquire(route, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+            conn.close()
+            if reused:
+                continue
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        break
+
+    if response.will_close:
+        conn.close()
+    else:
+        _release(route, conn)
+
+    response_headers = {name.lower(): value for name, value in response.getheaders()}
+    if response_headers.get("content-encoding") == "gzip":
+        import gzip
+        import zlib
+
+        try:
+            body = gzip.decompress(body)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            # Truncated or corrupt body: a connection error to callers
+            raise OSError(f"invalid gzip body from {url}: {e}") from e
+    return {"status": response.status, "headers": response_headers, "body": body}
+
+
+def fetch_many(requests: list[tuple[str, dict]], timeout: float = 5.0) -> list[dict | None]:
+    """GET several URLs in parallel under one overall deadline.
+
+    Args:
+        requests: (url, headers) pairs
+        timeout: Deadline in seconds for the whole batch
+
+    Returns:
+        fetch() results in request order; None for requests that failed or
+        did not finish before the deadline
+    """
+    if not requests:
+        return []
+    deadline = time.monotonic() + timeout
+
+    def run(url, headers):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("deadline passed")
+        return fetch(url, headers, timeout=remaining)
+
+    if len(requests) == 1:
+        try:
+            return [run(*requests[0])]
+        except (OSError, http.client.HTTPException, ValueError):
+            return [None]
+
+    executor = ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix="sp-http")
+    try:
+        futures = [executor.submit(run, url, headers) for url, headers in requests]
+        wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    finally:
+        # Don't wait for stragglers; their socket timeouts end them shortly
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for future in futures:
+        if future.done() and not future.cancelled() and future.exception() is None:
+            results.append(future.result())
+        else:
+            results.append(None)
+    return results
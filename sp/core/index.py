@@ -0,0 +1,114 @@
+"""Package index selection for SignalPilot CLI.
+
+Workspace packages (the SignalPilot library and CORE_PACKAGES) come from
+the index configured in config.toml, PyPI by default:
+
+    [index]
+    url = "https://pypi.internal.example/simple/"   # or "file:///srv/mirror/simple/"
+    wheelhouse = "~/wheelhouse"                     # local directory of wheels
+
+With only a wheelhouse, installs run offline from it (--no-index); with
+both, the wheelhouse is searched alongside the index. Version checks read
+the same sources, so checks for packages that are not on PyPI (such as
+signalpilot-ai-internal) see real versions. The CLI itself is fetched by
+uvx and always checked against PyPI.
+"""
+
+import os
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from sp.core.config import SIGNALPILOT_CLI, get_index_config
+from sp.core.environment import normalize_name
+
+PYPI_SIMPLE_URL = "https://pypi.org/simple/"
+
+# Distribution files recognised in a wheelhouse or file:// mirror
+DIST_SUFFIXES = (".whl", ".tar.gz", ".zip")
+
+
+def package_sources(package_name: str, settings: dict = None) -> dict:
+    """Where to look up a package's versions.
+
+    Args:
+        package_name: Package name
+        settings: Index settings (default: get_index_config())
+
+    Returns:
+        Dict with 'url' (simple index root, or None) and 'wheelhouse'
+        (Path, or None)
+    """
+    if package_name == SIGNALPILOT_CLI:
+        return {'url': PYPI_SIMPLE_URL, 'wheelhouse': None}
+    settings = settings if settings is not None else get_index_config()
+    if not settings['url'] and not settings['wheelhouse']:
+        return {'url': PYPI_SIMPLE_URL, 'wheelhouse': None}
+    return {'url': settings['url'], 'wheelhouse': settings['wheelhouse']}
+
+
+def project_url(index_url: str, package_name: str) -> str:
+    """URL of a package's project page on a simple index."""
+    return f"{index_url.rstrip('/')}/{normalize_name(package_name)}/"
+
+
+def _dist_name(filename: str) -> str | None:
+    if filename.endswith('.whl'):
+        return filename.split('-')[0]
+    for suffix in DIST_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)].rpartition('-')[0]
+    return None
+
+
+def wheelhouse_index(wheelhouse: Path, package_name: str) -> dict:
+    """A package's files in a wheelhouse, in the PEP 691 project page shape."""
+    name = normalize_name(package_name)
+    try:
+        entries = sorted((entry.name, entry) for entry in os.scandir(wheelhouse))
+    except OSError:
+        return {'files': []}
+    files = []
+    for filename, entry in entries:
+        if (dist := _dist_name(filename)) and normalize_name(dist) == name:
+            try:
+                files.append({'filename': filename, 'yanked': False, 'size': entry.stat().st_size})
+            except OSError:
+                continue
+    return {'files': files}
+
+
+def read_file_index(index_url: str, package_name: str) -> dict | None:
+    """A package's project page from a file:// mirror.
+
+    Reads <root>/<project>/index.json or index.html (PEP 691/503 layout);
+    a root without project folders is treated as a flat directory of files.
+
+    Returns:
+        PEP 691 shaped dict, or None if the mirror has no such project
+    """
+    import json
+
+    from sp.upgrade_check import parse_simple_html
+
+    root = Path(unquote(urlsplit(index_url).path))
+    project_dir = root / normalize_name(package_name)
+    for page, parse in (('index.json', json.loads), ('index.html', parse_simple_html)):
+        try:
+            return parse((project_dir / page).read_text(encoding='utf-8', errors='replace'))
+        except (OSError, ValueError):
+            continue
+    index = wheelhouse_index(root, package_name)
+    return index if index['files'] else None
+
+
+def uv_index_args(settings: dict = None) -> list[str]:
+    """Index options for `uv pip install` from the configured index."""
+    settings = settings if settings is not None else get_index_config()
+    args = []
+    if settings['url']:
+        args += ['--index-url', settings['url']]
+    if settings['wheelhouse']:
+        args += ['--find-links', str(settings['wheelhouse'])]
+        if not settings['url']:
+            args.append('--no-index')
+    return args
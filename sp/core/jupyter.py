@@ -2,16 +2,105 @@
 
 import os
 import subprocess
+import sys
+import time
 from pathlib import Path
 
+from sp.core.config import get_kernel_pool_config, get_lab_profile
+from sp.core.readiness import jupyter_runtime_dir, wait_for_server
 from sp.ui.console import console, LOGO
 
+# Server-side extensions (sp_jupyter) loaded into the venv's Jupyter server
+JUPYTER_EXT_DIR = Path(__file__).resolve().parent.parent / "jupyter_ext"
+
+
+def build_jupyter_env(venv_dir: Path) -> dict:
+    """Build the environment for running Jupyter from a venv.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+
+    Returns:
+        Copy of os.environ pointing PATH/VIRTUAL_ENV at the venv, with the
+        sp_jupyter extensions importable by the server
+    """
+    env = os.environ.copy()
+    env["VIRTUAL_ENV"] = str(venv_dir)
+    env["PATH"] = f"{venv_dir / 'bin'}:{env.get('PATH', '')}"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(JUPYTER_EXT_DIR), env.get("PYTHONPATH")]))
+    # Remove PYTHONHOME if set, as it can interfere with venv
+    env.pop("PYTHONHOME", None)
+    return env
+
+
+def kernel_pool_args(kernel_pool: dict) -> list[str]:
+    """Build the jupyter lab arguments that enable the warm kernel pool.
+
+    Args:
+        kernel_pool: Settings from get_kernel_pool_config()
+
+    Returns:
+        List of arguments, empty if the pool is disabled
+    """
+    if kernel_pool.get("pool_size", 0) <= 0:
+        return []
+
+    preload = ", ".join(repr(module) for module in kernel_pool.get("preload", []))
+    return [
+        "--ServerApp.kernel_manager_class=sp_jupyter.kernel_pool.PooledKernelManager",
+        f"--PooledKernelManager.pool_size={kernel_pool['pool_size']}",
+        f"--PooledKernelManager.preload_modules=[{preload}]",
+        f"--PooledKernelManager.max_memory_mb={kernel_pool.get('max_memory_mb', 0)}",
+        f"--PooledKernelManager.idle_timeout={kernel_pool.get('idle_timeout_minutes', 30) * 60}",
+    ]
+
+
+def build_jupyter_command(
+    venv_dir: Path, extra_args: list = None, kernel_pool: dict = None, token_from_env: bool = False
+) -> list[str]:
+    """Build the jupyter lab command line used by sp lab/home.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        extra_args: Additional command-line arguments for jupyter lab
+        kernel_pool: Warm kernel pool settings (see get_kernel_pool_config)
+        token_from_env: Require the token the caller sets in JUPYTER_TOKEN
+            instead of a null token (kept off the command line, which any
+            local user can read)
+
+    Returns:
+        Command as a list, starting with the venv's jupyter binary
+    """
+    # Null token (unless set via JUPYTER_TOKEN), native kernels only, and any extra args
+    cmd = [
+        str(venv_dir / "bin" / "jupyter"),
+        "lab",
+        *([] if token_from_env else ["--IdentityProvider.token=''"]),
+        "--KernelSpecManager.ensure_native_kernel=True",
+        "--KernelSpecManager.allowed_kernelspecs=[]",
+        "--ContentsManager.hide_globs=['*.venv', '.venv', '__pycache__', '*.egg-info', '.git']",
+        # Startup speed optimizations
+        "--LabApp.news_url=''",  # Skip news fetch (~100-500ms)
+        "--LabApp.collaborative=False",  # Skip collaboration init (~50-200ms)
+        # Performance optimizations
+        "--ServerApp.contents_manager_class=sp_jupyter.contents.CachingContentsManager",  # Cached, pruned directory listings
+    ]
+    if kernel_pool:
+        cmd.extend(kernel_pool_args(kernel_pool))
+    if extra_args:
+        cmd.extend(extra_args)
+    return cmd
+
 
 def run_jupyter_lab(
     venv_dir: Path,
     workspace_dir: Path,
     extra_args: list = None,
-    show_warning: bool = False
+    show_warning: bool = False,
+    exec_mode: bool = False,
+    kernel_pool: dict = None,
+    timeline=None,
+    profile: str = None
 ):
     """Launch Jupyter Lab with proper environment configuration.
 
@@ -20,12 +109,16 @@ def run_jupyter_lab(
         workspace_dir: Working directory for Jupyter Lab
         extra_args: Additional command-line arguments for jupyter lab
         show_warning: Whether to show local .venv warning
+        exec_mode: Replace this process with Jupyter (os.execve) instead of
+            running it as a child. POSIX only; falls back to a child process.
+        kernel_pool: Warm kernel pool settings; read from config.toml if None
+        timeline: sp.core.timings.Timeline to record launch phases into
+            (also measures extension loading and first kernel start-up)
+        profile: Extension profile ("full" or "minimal"); read from config.toml if None
 
     Returns:
-        None (blocks until Jupyter is terminated)
+        None (blocks until Jupyter is terminated, or never returns in exec mode)
     """
-    venv_jupyter = venv_dir / "bin" / "jupyter"
-
     # Print diagnostic information
     console.print("\n" + "="*60, style="white")
     console.print(LOGO, style="cyan")
@@ -42,30 +135,74 @@ def run_jupyter_lab(
     console.print(f"  Environment: {venv_dir}", style="dim")
     if extra_args:
         console.print(f"  Extra args: {' '.join(extra_args)}", style="dim")
+
+    if kernel_pool is None:
+        kernel_pool = get_kernel_pool_config()
+    if kernel_pool.get("pool_size", 0) > 0:
+        console.print(f"  Kernel pool: {kernel_pool['pool_size']} warm kernel(s)", style="dim")
+
+    from sp.core.profiles import build_profile
+
+    config_profile, allow = get_lab_profile()
+    profile = profile or config_profile
+    profile_args, profile_env = build_profile(venv_dir, profile, allow)
+    if profile != "full":
+        console.print(f"  Profile: {profile}", style="dim")
     console.print("="*60 + "\n", style="white")
 
-    # Set up environment to point Jupyter to the correct venv
-    env = os.environ.copy()
-    env["VIRTUAL_ENV"] = str(venv_dir)
-    env["PATH"] = f"{venv_dir / 'bin'}:{env.get('PATH', '')}"
-    # Remove PYTHONHOME if set, as it can interfere with venv
-    env.pop("PYTHONHOME", None)
+    env = build_jupyter_env(venv_dir)
+    env.update(profile_env)
+    # Profile args go first so explicit extra args can override them
+    cmd = build_jupyter_command(venv_dir, profile_args + (extra_args or []), kernel_pool)
 
-    # Build command with null token, native kernels only, and any extra args
-    cmd = [
-        str(venv_jupyter),
-        "lab",
-        "--IdentityProvider.token=''",
-        "--KernelSpecManager.ensure_native_kernel=True",
-        "--KernelSpecManager.allowed_kernelspecs=[]",
-        "--ContentsManager.hide_globs=['*.venv', '.venv', '__pycache__', '*.egg-info', '.git']",
-        # Startup speed optimizations
-        "--LabApp.news_url=''",  # Skip news fetch (~100-500ms)
-        "--LabApp.collaborative=False",  # Skip collaboration init (~50-200ms)
-        # Performance optimizations
-        "--ServerApp.contents_manager_class=jupyter_server.services.contents.largefilemanager.AsyncLargeFileManager",  # Better async file handling
-    ]
-    if extra_args:
-        cmd.extend(extra_args)
+    if exec_mode and os.name == "posix":
+        # Hand the process over to Jupyter: no resident sp interpreter, and
+        # signals (Ctrl+C, SIGTERM) go straight to the server
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(workspace_dir)
+        os.execve(cmd[0], cmd, env)
+
+    spawn_start = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=workspace_dir, env=env)
+    spawn_end = time.perf_counter()
+    try:
+        ready = wait_for_server(process, runtime_dir=jupyter_runtime_dir(env), timeout=120)
+        if ready:
+            console.print(f"\n✓ Jupyter ready in {ready['seconds']:.2f}s at {ready['url']}\n", style="bold green")
+        if ready and timeline is not None:
+            timeline.add("process spawn", spawn_start, spawn_end)
+            timeline.add("server listening", spawn_end, time.perf_counter())
+            record_lab_timings(timeline, ready["url"], venv_dir)
+    except KeyboardInterrupt:
+        pass
+
+    # Jupyter handles Ctrl+C itself (confirm, then shut kernels down); wait it out
+    while True:
+        try:
+            process.wait()
+            return
+        except KeyboardInterrupt:
+            continue
+
+
+def record_lab_timings(timeline, url: str, venv_dir: Path):
+    """Time extension loading and the first kernel, then save and print the timeline.
+
+    Args:
+        timeline: sp.core.timings.Timeline with the launch phases so far
+        url: URL of the ready server
+        venv_dir: Venv the server runs from
+    """
+    from sp.core.readiness import wait_for_first_kernel, wait_for_lab_page
+    from sp.core.timings import print_timeline, save_run
+
+    start = time.perf_counter()
+    if wait_for_lab_page(url):
+        timeline.add("extensions loaded", start, time.perf_counter())
+
+    start = time.perf_counter()
+    if wait_for_first_kernel(url):
+        timeline.add("first kernel ready", start, time.perf_counter())
 
-    subprocess.run(cmd, cwd=workspace_dir, env=env)
+    print_timeline(timeline, save_run(timeline, venv_dir))
@@ -0,0 +1,190 @@
+"""Post-install venv optimization for SignalPilot CLI.
+
+uv installs packages without compiling bytecode, and libraries such as
+matplotlib build their caches on first use, so an analyst's first import
+and first plot pay for both. optimize_venv() does that work up front:
+
+- compiles all of site-packages to .pyc using every core
+- builds the matplotlib font cache and IPython's default profile
+
+It records a fingerprint of the installed distributions in the venv, so
+it only runs again when the install set changes.
+"""
+
+import hashlib
+import json
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sp.core.environment import site_packages_dir
+
+FINGERPRINT_FILE = ".signalpilot-optimized.json"
+
+# Skip test suites and vendored examples; nothing imports them at runtime
+COMPILE_EXCLUDE = r"[/\\](tests?|testing|examples)[/\\]"
+
+# Run by the venv's interpreter; each cache is optional
+BUILD_CACHES_SCRIPT = """
+import json
+built = []
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+    font_manager.fontManager
+    built.append("matplotlib font cache")
+except Exception:
+    pass
+try:
+    from IPython.core.profiledir import ProfileDir
+    from IPython.paths import get_ipython_dir
+    ProfileDir.create_profile_dir_by_name(get_ipython_dir(), "default")
+    built.append("IPython profile")
+except Exception:
+    pass
+print(json.dumps(built))
+"""
+
+# Imports the usual analysis stack and renders one figure
+FIRST_PLOT_SCRIPT = """
+import io
+import pandas
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+fig, ax = plt.subplots()
+ax.plot(pandas.Series([1, 3, 2]))
+fig.savefig(io.BytesIO(), format="png")
+"""
+
+
+def install_fingerprint(venv_dir: Path) -> str | None:
+    """Hash of the venv's installed distributions (names and versions).
+
+    Returns:
+        Hex digest, or None if the venv has no site-packages
+    """
+    site_packages = site_packages_dir(venv_dir)
+    if site_packages is None:
+        return None
+    dists = sorted(entry.name for entry in site_packages.iterdir() if entry.name.endswith(".dist-info"))
+    return hashlib.sha256("\n".join([site_packages.parent.name, *dists]).encode()).hexdigest()
+
+
+def load_optimize_record(venv_dir: Path) -> dict:
+    """Read the record written by the last optimization of a venv."""
+    try:
+        return json.loads((venv_dir / FINGERPRINT_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def needs_optimize(venv_dir: Path) -> bool:
+    """Check whether the venv's install set changed since it was last optimized."""
+    fingerprint = install_fingerprint(venv_dir)
+    return fingerprint is not None and load_optimize_record(venv_dir).get("fingerprint") != fingerprint
+
+
+def compile_site_packages(venv_dir: Path, packages: list[str] = None) -> bool:
+    """Compile site-packages to bytecode with the venv's interpreter on all cores.
+
+    Args:
+        venv_dir: Path to virtual environment
+        packages: Only these top-level packages (those installed); default all
+    """
+    site_packages = site_packages_dir(venv_dir)
+    if site_packages is None:
+        return False
+    if packages is None:
+        targets = [str(site_packages)]
+    else:
+        targets = [str(site_packages / name) for name in packages if (site_packages / name).is_dir()]
+        if not targets:
+            return False
+    try:
+        result = subprocess.run(
+            [str(venv_dir / "bin" / "python"), "-m", "compileall", "-q", "-j", "0", "-x", COMPILE_EXCLUDE, *targets],
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return False
+    # compileall exits 1 if any file failed (e.g. py2-only data files); the rest are compiled
+    return result.returncode in (0, 1)
+
+
+def build_library_caches(venv_dir: Path) -> list[str]:
+    """Build first-use library caches in the venv.
+
+    Returns:
+        Names of the caches that were built
+    """
+    try:
+        result = subprocess.run(
+            [str(venv_dir / "bin" / "python"), "-c", BUILD_CACHES_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    except (OSError, IndexError, json.JSONDecodeError):
+        return []
+
+
+def time_to_first_plot(venv_dir: Path, timeout: float = 180.0) -> float | None:
+    """Seconds for a fresh interpreter to import pandas/matplotlib and render a plot.
+
+    Returns:
+        Seconds, or None if the libraries are missing or the run failed
+    """
+    started = time.monotonic()
+    try:
+        result = subprocess.run(
+            [str(venv_dir / "bin" / "python"), "-c", FIRST_PLOT_SCRIPT],
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return time.monotonic() - started
+
+
+def optimize_venv(venv_dir: Path, force: bool = False) -> dict | None:
+    """Compile bytecode and build library caches, once per install set.
+
+    Args:
+        venv_dir: Path to virtual environment
+        force: Optimize even if the fingerprint is unchanged
+
+    Returns:
+        Record dict (fingerprint, compiled, caches, first_plot_before,
+        first_plot_after, seconds), or None if nothing needed doing
+    """
+    if not force and not needs_optimize(venv_dir):
+        return None
+
+    started = time.monotonic()
+    first_plot_before = time_to_first_plot(venv_dir)
+    compiled = compile_site_packages(venv_dir)
+    caches = build_library_caches(venv_dir)
+    first_plot_after = time_to_first_plot(venv_dir)
+
+    record = {
+        "fingerprint": install_fingerprint(venv_dir),
+        "optimized_at": datetime.now(timezone.utc).isoformat(),
+        "compiled": compiled,
+        "caches": caches,
+        "first_plot_before": first_plot_before,
+        "first_plot_after": first_plot_after,
+        "seconds": time.monotonic() - started,
+    }
+    try:
+        (venv_dir / FINGERPRINT_FILE).write_text(json.dumps(record, indent=2))
+    except OSError:
+        pass
+    return record
@@ -0,0 +1,204 @@
+"""Extension profiles for `sp lab`.
+
+The "full" profile loads every installed extension, as plain `jupyter lab`
+does. The "minimal" profile keeps only what SignalPilot needs. Every other
+server extension is switched off on the command line
+(--ServerApp.jpserver_extensions; per-key values there win over the
+config.d files). Every other lab extension is disabled through a
+page_config.json in a profile directory put first on JUPYTER_CONFIG_PATH.
+The venv's own configuration is never modified.
+"""
+
+import fnmatch
+import json
+import os
+from pathlib import Path
+
+from sp.core.config import SP_CONFIG_DIR
+
+PROFILES = ("full", "minimal")
+
+# Server extensions (module names) kept by the minimal profile
+MINIMAL_SERVER_EXTENSIONS = [
+    "jupyterlab",
+    "signalpilot*",
+]
+
+# Lab extensions (package names) kept by the minimal profile
+MINIMAL_LAB_EXTENSIONS = [
+    "signalpilot*",
+    "@jupyter-widgets/jupyterlab-manager",
+    "jupyterlab-plotly",
+]
+
+# Built-in lab plugins the minimal profile turns off
+MINIMAL_DISABLED_CORE_PLUGINS = [
+    "@jupyterlab/extensionmanager-extension",  # PyPI queries
+    "@jupyterlab/terminal-extension",
+]
+
+
+def installed_server_extensions(venv_dir: Path) -> dict[str, bool]:
+    """Server extensions enabled through the venv's jupyter_server_config.d files.
+
+    Returns:
+        Dict of module name -> enabled
+    """
+    extensions = {}
+    config_d = venv_dir / "etc" / "jupyter" / "jupyter_server_config.d"
+    for path in sorted(config_d.glob("*.json")):
+        try:
+            config = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        extensions.update(config.get("ServerApp", {}).get("jpserver_extensions", {}))
+    return extensions
+
+
+def installed_lab_extensions(venv_dir: Path) -> dict[str, Path]:
+    """Prebuilt lab extensions installed in the venv.
+
+    Returns:
+        Dict of package name -> extension directory
+    """
+    labextensions = venv_dir / "share" / "jupyter" / "labextensions"
+    package_jsons = [*labextensions.glob("[!@]*/package.json"), *labextensions.glob("@*/*/package.json")]
+
+    extensions = {}
+    for package_json in sorted(package_jsons):
+        try:
+            name = json.loads(package_json.read_text()).get("name")
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if name:
+            extensions[name] = package_json.parent
+    return extensions
+
+
+def _allowed(name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def resolve_profile(venv_dir: Path, profile: str, allow: list[str] = None) -> dict:
+    """Work out which extensions a profile switches off.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        profile: "full" or "minimal"
+        allow: Extra name patterns to keep (config: [lab] allow_extensions)
+
+    Returns:
+        Dict with 'server_disabled' (module names) and 'lab_disabled'
+        (package/plugin ids), both empty for the full profile
+    """
+    if profile != "minimal":
+        return {"server_disabled": [], "lab_disabled": []}
+
+    allow = list(allow or [])
+    server_disabled = [
+        name for name, enabled in installed_server_extensions(venv_dir).items()
+        if enabled and not _allowed(name, MINIMAL_SERVER_EXTENSIONS + allow)
+    ]
+    lab_disabled = [
+        name for name in installed_lab_extensions(venv_dir)
+        if not _allowed(name, MINIMAL_LAB_EXTENSIONS + allow)
+    ]
+    lab_disabled += [plugin for plugin in MINIMAL_DISABLED_CORE_PLUGINS if not _allowed(plugin, allow)]
+    return {"server_disabled": server_disabled, "lab_disabled": lab_disabled}
+
+
+def profile_config_dir(venv_dir: Path, profile: str) -> Path:
+    """Jupyter config directory holding a profile's page_config.json for a venv."""
+    from sp.core.environment import venv_key
+
+    return SP_CONFIG_DIR / "profiles" / f"{profile}-{venv_key(venv_dir)}"
+
+
+def build_profile(venv_dir: Path, profile: str, allow: list[str] = None) -> tuple[list[str], dict]:
+    """Build the jupyter lab arguments and environment for a profile.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        profile: "full" or "minimal"
+        allow: Extra name patterns to keep
+
+    Returns:
+        (extra command-line arguments, environment variables to set)
+    """
+    resolved = resolve_profile(venv_dir, profile, allow)
+    args = []
+    env = {}
+
+    if resolved["server_disabled"]:
+        disabled = ", ".join(f"{name!r}: False" for name in resolved["server_disabled"])
+        args.append(f"--ServerApp.jpserver_extensions={{{disabled}}}")
+
+    if resolved["lab_disabled"]:
+        config_dir = profile_config_dir(venv_dir, profile)
+        page_config = config_dir / "labconfig" / "page_config.json"
+        content = json.dumps({"disabledExtensions": {name: True for name in resolved["lab_disabled"]}}, indent=2)
+        try:
+            if not page_config.exists() or page_config.read_text() != content:
+                page_config.parent.mkdir(parents=True, exist_ok=True)
+                page_config.write_text(content)
+            env["JUPYTER_CONFIG_PATH"] = os.pathsep.join(
+                filter(None, [str(config_dir), os.environ.get("JUPYTER_CONFIG_PATH")])
+            )
+        except OSError:
+            pass
+
+    return args, env
+
+
+# Run by the venv's interpreter: import cost of one module on top of jupyter_server
+_IMPORT_COST_SCRIPT = """
+import importlib, json, resource, sys, time
+import jupyter_server.serverapp
+scale = 1 if sys.platform == "darwin" else 1024
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+start = time.perf_counter()
+try:
+    importlib.import_module(sys.argv[1])
+except Exception:
+    print(json.dumps(None))
+    sys.exit()
+ms = (time.perf_counter() - start) * 1000
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+print(json.dumps({"ms": ms, "mb": (rss_after - rss_before) / (1024 * 1024)}))
+"""
+
+
+def measure_server_extension(venv_dir: Path, module: str) -> dict | None:
+    """Measure the import time (ms) and memory (MB) a server extension adds.
+
+    The module is imported in a fresh venv interpreter after jupyter_server
+    itself, so only the extension's own cost is counted.
+
+    Returns:
+        Dict with 'ms' and 'mb', or None if the module failed to import
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            [str(venv_dir / "bin" / "python"), "-c", _IMPORT_COST_SCRIPT, module],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=False,
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    except (OSError, subprocess.TimeoutExpired, IndexError, json.JSONDecodeError):
+        return None
+
+
+def lab_extension_size_mb(extension_dir: Path) -> float:
+    """Size of a lab extension's static assets (what the browser may load), in MB."""
+    total = 0
+    for path in (extension_dir / "static").rglob("*"):
+        try:
+            if path.is_file():
+                total += path.stat().st_size
+        except OSError:
+            continue
+    return total / (1024 * 1024)
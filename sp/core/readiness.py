@@ -0,0 +1,266 @@
+"""Jupyter server readiness detection for SignalPilot CLI.
+
+wait_for_server() watches the signals a starting server gives off instead
+of sleeping a fixed interval between checks:
+
+- the server's log, which prints the bound URL once it is listening
+- the runtime file jpserver-<pid>.json, written once the server has started
+- an HTTP probe of /api, retried with a short backoff (10ms doubling to 80ms)
+
+and reports how long the server took to become ready.
+"""
+
+import http.client
+import json
+import os
+import re
+import socket
+import sys
+import time
+from pathlib import Path
+
+# e.g. "http://localhost:8888/lab" or "http://127.0.0.1:41234/?token=..."
+_SERVER_URL = re.compile(r"https?://([\w.\-]+|\[[0-9a-fA-F:]+\]):(\d+)(/[^\s?]*)?")
+
+# Wildcard and named addresses mapped to the loopback address to probe
+_LOOPBACK = {"localhost": "127.0.0.1", "0.0.0.0": "127.0.0.1", "::": "::1"}
+
+PROBE_BACKOFF_START = 0.01
+PROBE_BACKOFF_MAX = 0.08
+
+
+def find_free_port() -> int:
+    """Ask the OS for a free TCP port on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_responds(port: int, timeout: float = 0.5, host: str = "127.0.0.1", base_url: str = "/") -> bool:
+    """Check that a Jupyter server answers on host:port."""
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", base_url.rstrip("/") + "/api")
+        return connection.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+def jupyter_runtime_dir(env: dict = None) -> Path:
+    """Locate Jupyter's runtime directory the way jupyter_core does.
+
+    Args:
+        env: Environment the server runs with (defaults to os.environ)
+
+    Returns:
+        Path of the directory holding jpserver-<pid>.json files
+    """
+    env = os.environ if env is None else env
+    if env.get("JUPYTER_RUNTIME_DIR"):
+        return Path(env["JUPYTER_RUNTIME_DIR"])
+
+    if env.get("JUPYTER_DATA_DIR"):
+        data_dir = Path(env["JUPYTER_DATA_DIR"])
+    elif sys.platform == "darwin":
+        data_dir = Path.home() / "Library" / "Jupyter"
+    elif os.name == "nt":
+        data_dir = Path(env.get("APPDATA", Path.home())) / "jupyter"
+    else:
+        data_dir = Path(env.get("XDG_DATA_HOME") or Path.home() / ".local" / "share") / "jupyter"
+    return data_dir / "runtime"
+
+
+def _url_from_log(log_path: Path, offset: int) -> tuple[str, int, str] | None:
+    """Find the first server URL logged after offset, as (host, port, base_url)."""
+    try:
+        with open(log_path, "rb") as log:
+            log.seek(offset)
+            text = log.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
+
+    match = _SERVER_URL.search(text)
+    if match is None:
+        return None
+    host, port, path = match.groups()
+    # The logged path may point at the lab UI; /api lives at the server root
+    base_url = re.sub(r"/(lab|tree)(/.*)?$", "", path or "").rstrip("/") + "/"
+    return host.strip("[]"), int(port), base_url
+
+
+def _url_from_runtime_file(runtime_dir: Path, pid: int) -> tuple[str, int, str] | None:
+    """Read the server's runtime file, as (host, port, base_url)."""
+    try:
+        info = json.loads((runtime_dir / f"jpserver-{pid}.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    return info.get("hostname") or "127.0.0.1", int(info["port"]), info.get("base_url", "/")
+
+
+def wait_for_server(
+    process,
+    port: int = None,
+    log_path: Path = None,
+    log_offset: int = 0,
+    runtime_dir: Path = None,
+    timeout: float = 60.0,
+    started: float = None,
+) -> dict | None:
+    """Wait until a just-started Jupyter server answers HTTP requests.
+
+    Args:
+        process: Popen handle of the server
+        port: Port the server was told to use, if known
+        log_path: File the server's stdout/stderr go to
+        log_offset: Byte offset in log_path where this run's output starts
+        runtime_dir: Jupyter runtime directory to look for jpserver-<pid>.json
+        timeout: Seconds to wait before giving up
+        started: time.monotonic() when the server was launched (default: now)
+
+    Returns:
+        Dict with url, port, pid, seconds (time to ready) and source
+        ('log', 'runtime' or 'probe'), or None if the server exited or
+        did not answer in time
+    """
+    started = time.monotonic() if started is None else started
+    deadline = started + timeout
+    host, base_url = "127.0.0.1", "/"
+    source = "probe"
+    backoff = PROBE_BACKOFF_START
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return None
+
+        if source == "probe":
+            found = None
+            if log_path is not None:
+                found = _url_from_log(log_path, log_offset)
+                source = "log" if found else source
+            if found is None and runtime_dir is not None:
+                found = _url_from_runtime_file(runtime_dir, process.pid)
+                source = "runtime" if found else source
+            if found:
+                host, port, base_url = found
+                # The server has bound its socket; probe right away
+                backoff = PROBE_BACKOFF_START
+
+        probe_host = _LOOPBACK.get(host, host)
+        if port is not None and server_responds(port, timeout=0.5, host=probe_host, base_url=base_url):
+            display_host = "localhost" if host in _LOOPBACK or host == "127.0.0.1" else host
+            return {
+                "url": f"http://{display_host}:{port}{base_url}",
+                "port": port,
+                "pid": process.pid,
+                "seconds": time.monotonic() - started,
+                "source": source,
+            }
+
+        time.sleep(backoff)
+        backoff = min(backoff * 2, PROBE_BACKOFF_MAX)
+
+    return None
+
+
+def _split_url(url: str) -> tuple[str, int, str]:
+    """Split a server URL from wait_for_server() into (probe host, port, base_url)."""
+    match = _SERVER_URL.match(url)
+    host, port, path = match.groups()
+    host = host.strip("[]")
+    return _LOOPBACK.get(host, host), int(port), (path or "/").rstrip("/") + "/"
+
+
+def wait_for_lab_page(url: str, timeout: float = 60.0) -> bool:
+    """Wait until JupyterLab serves its page, i.e. its extensions are loaded.
+
+    Args:
+        url: Server URL as returned by wait_for_server()
+        timeout: Seconds to wait
+
+    Returns:
+        True once GET <url>lab answers 200
+    """
+    host, port, base_url = _split_url(url)
+    deadline = time.monotonic() + timeout
+    backoff = PROBE_BACKOFF_START
+    while time.monotonic() < deadline:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            connection.request("GET", base_url + "lab")
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            connection.close()
+        time.sleep(backoff)
+        backoff = min(backoff * 2, PROBE_BACKOFF_MAX)
+    return False
+
+
+def wait_for_first_kernel(url: str, timeout: float = 60.0) -> bool:
+    """Start a kernel on the server, wait until it is idle, then shut it down.
+
+    A kernel only reports 'idle' once a client is connected, so this opens
+    (and immediately abandons) a websocket on its channels endpoint.
+
+    Args:
+        url: Server URL as returned by wait_for_server()
+        timeout: Seconds to wait
+
+    Returns:
+        True if the kernel reached the idle state
+    """
+    import base64
+
+    host, port, base_url = _split_url(url)
+    # Any matching cookie/header pair satisfies the server's XSRF check
+    headers = {"Cookie": "_xsrf=sp", "X-XSRFToken": "sp", "Content-Type": "application/json"}
+    deadline = time.monotonic() + timeout
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    channels = None
+    kernel_id = None
+    try:
+        connection.request("POST", base_url + "api/kernels", body="{}", headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 201:
+            return False
+        kernel_id = json.loads(body)["id"]
+
+        channels = socket.create_connection((host, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        channels.sendall(
+            f"GET {base_url}api/kernels/{kernel_id}/channels HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        if not channels.recv(4096).startswith(b"HTTP/1.1 101"):
+            return False
+
+        backoff = PROBE_BACKOFF_START
+        while time.monotonic() < deadline:
+            connection.request("GET", f"{base_url}api/kernels/{kernel_id}")
+            response = connection.getresponse()
+            model = json.loads(response.read() or b"{}")
+            if model.get("execution_state") == "idle":
+                return True
+            time.sleep(backoff)
+            backoff = min(backoff * 2, PROBE_BACKOFF_MAX)
+        return False
+    except (OSError, http.client.HTTPException, ValueError, KeyError):
+        return False
+    finally:
+        if channels is not None:
+            channels.close()
+        if kernel_id is not None:
+            try:
+                connection.request("DELETE", f"{base_url}api/kernels/{kernel_id}", headers=headers)
+                connection.getresponse().read()
+            except (OSError, http.client.HTTPException):
+                pass
+        connection.close()
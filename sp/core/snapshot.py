@@ -0,0 +1,314 @@
+"""Venv snapshots taken before upgrades, restored by `sp rollback`.
+
+A snapshot mirrors the whole venv under
+SignalPilotHome/.signalpilot/snapshots/<venv-key>/<timestamp>/ using, in
+order of preference:
+
+- reflinks (FICLONE on Btrfs, XFS, bcachefs...): copy-on-write copies
+  that share disk blocks with the venv until either side changes;
+- a hardlink farm: installers replace files rather than rewriting them
+  in place, so the old inodes survive an upgrade untouched;
+- a record of the installed distributions, when the venv lives on
+  another filesystem; restoring it reinstalls those exact versions.
+
+A venv replaced by a staged upgrade (see sp.core.staging) is moved in
+whole as its snapshot.
+
+Restoring a mirrored snapshot is two renames on the same filesystem.
+Retention is bounded per venv by count and across all venvs by the disk
+space that only snapshots hold (config: [snapshots] keep, max_mb).
+"""
+
+import errno
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sp.core.environment import venv_inventory, venv_key
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+
+MANIFEST = "manifest.json"
+TREE = "venv"
+
+# Unfinished snapshots (no manifest) older than this are removed on prune
+STALE_PARTIAL_SECONDS = 3600
+
+
+def snapshots_dir(venv_dir: Path) -> Path:
+    """Directory holding a venv's snapshots."""
+    from sp.core.config import SP_SNAPSHOTS_DIR
+
+    return SP_SNAPSHOTS_DIR / venv_key(venv_dir)
+
+
+def _reflink(src: str, dst: Path):
+    import fcntl
+
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    # Same mtime as the original, so disk accounting can tell shared files
+    shutil.copystat(src, dst)
+
+
+def _place(src: str, dst: Path, method: str) -> str:
+    if method == 'reflink':
+        try:
+            _reflink(src, dst)
+            return 'reflink'
+        except (OSError, ImportError):
+            # No copy-on-write here; hardlink this and every later file
+            dst.unlink(missing_ok=True)
+    os.link(src, dst)
+    return 'hardlink'
+
+
+def _mirror(src: Path, dst: Path, method: str) -> str:
+    """Recreate src at dst with reflinks or hardlinks; returns the method that worked.
+
+    Raises:
+        OSError: If files can be neither reflinked nor hardlinked
+    """
+    dst.mkdir()
+    with os.scandir(src) as entries:
+        for entry in entries:
+            target = dst / entry.name
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir():
+                method = _mirror(Path(entry.path), target, method)
+            else:
+                method = _place(entry.path, target, method)
+    shutil.copystat(src, dst)
+    return method
+
+
+def take_snapshot(venv_dir: Path, reason: str = "upgrade") -> dict | None:
+    """Snapshot a venv (see module docstring) and prune old snapshots.
+
+    Args:
+        venv_dir: Path to virtual environment
+        reason: Why the snapshot was taken, shown by `sp rollback --list`
+
+    Returns:
+        Manifest dict ('venv', 'created', 'reason', 'method', 'python',
+        'distributions', 'seconds', 'path'), or None if snapshots are
+        disabled or the venv has no site-packages
+    """
+    from sp.core.config import get_snapshot_config
+    from sp.core.fileutil import atomic_write_json
+
+    settings = get_snapshot_config()
+    inventory = venv_inventory(venv_dir)
+    if settings['keep'] <= 0 or inventory is None:
+        return None
+
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    root = snapshots_dir(venv_dir) / now.strftime("%Y%m%dT%H%M%S%f")
+    root.mkdir(parents=True)
+    try:
+        if os.stat(venv_dir).st_dev != os.stat(root).st_dev:
+            raise OSError(errno.EXDEV, "venv is on another filesystem")
+        method = _mirror(venv_dir, root / TREE, 'reflink' if sys.platform == 'linux' else 'hardlink')
+    except OSError:
+        shutil.rmtree(root / TREE, ignore_errors=True)
+        method = 'record'
+
+    manifest = {
+        'venv': str(venv_dir),
+        'created': now.isoformat(),
+        'reason': reason,
+        'method': method,
+        'python': inventory['python'],
+        'distributions': inventory['distributions'],
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    # Written last: a directory without a manifest is an unfinished snapshot
+    atomic_write_json(root / MANIFEST, manifest)
+    prune_snapshots(settings)
+    return {**manifest, 'path': str(root)}
+
+
+def keep_as_snapshot(venv_dir: Path, tree: Path, inventory: dict, reason: str) -> dict | None:
+    """Turn a replaced copy of a venv into a snapshot by moving it into place.
+
+    Used after a staged upgrade is swapped in: the old venv is already a
+    complete tree, so no mirroring is needed. If it cannot be moved (other
+    filesystem), only its distributions are recorded and the tree deleted.
+
+    Args:
+        venv_dir: Path the tree was the venv of
+        tree: The replaced venv tree (consumed)
+        inventory: venv_inventory() of the tree taken before it was replaced
+        reason: Why the snapshot was taken
+
+    Returns:
+        Manifest dict with 'path', or None if snapshots are disabled
+    """
+    from sp.core.config import get_snapshot_config
+    from sp.core.fileutil import atomic_write_json
+
+    settings = get_snapshot_config()
+    if settings['keep'] <= 0:
+        shutil.rmtree(tree, ignore_errors=True)
+        return None
+
+    now = datetime.now(timezone.utc)
+    root = snapshots_dir(venv_dir) / now.strftime("%Y%m%dT%H%M%S%f")
+    root.mkdir(parents=True)
+    try:
+        os.rename(tree, root / TREE)
+        method = 'moved'
+    except OSError:
+        shutil.rmtree(tree, ignore_errors=True)
+        method = 'record'
+
+    manifest = {
+        'venv': str(venv_dir),
+        'created': now.isoformat(),
+        'reason': reason,
+        'method': method,
+        'python': inventory['python'],
+        'distributions': inventory['distributions'],
+        'seconds': 0.0,
+    }
+    atomic_write_json(root / MANIFEST, manifest)
+    prune_snapshots(settings)
+    return {**manifest, 'path': str(root)}
+
+
+def list_snapshots(venv_dir: Path) -> list[dict]:
+    """A venv's complete snapshots, newest first (manifests with 'path')."""
+    return _read_snapshots(snapshots_dir(venv_dir))
+
+
+def _read_snapshots(directory: Path) -> list[dict]:
+    snapshots = []
+    for root in sorted(directory.glob("*/"), reverse=True):
+        try:
+            manifest = json.loads((root / MANIFEST).read_text())
+        except (OSError, ValueError):
+            continue
+        snapshots.append({**manifest, 'path': str(root)})
+    return snapshots
+
+
+def exclusive_bytes(snapshot: dict) -> int:
+    """Disk space only this snapshot holds: files the venv no longer shares with it.
+
+    A file counts unless the venv has the same inode (hardlink) or a file
+    with the same size and mtime (reflink) at the same path.
+    """
+    tree = Path(snapshot['path']) / TREE
+    venv_dir = Path(snapshot['venv'])
+    total = 0
+    for dirpath, _, filenames in os.walk(tree):
+        relative = os.path.relpath(dirpath, tree)
+        for name in filenames:
+            try:
+                held = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            try:
+                live = os.lstat(venv_dir / relative / name)
+                shared = live.st_ino == held.st_ino or (
+                    live.st_size == held.st_size and live.st_mtime_ns == held.st_mtime_ns
+                )
+            except OSError:
+                shared = False
+            if not shared:
+                total += held.st_blocks * 512 if hasattr(held, 'st_blocks') else held.st_size
+    return total
+
+
+def remove_snapshot(snapshot: dict):
+    """Delete a snapshot from disk."""
+    shutil.rmtree(snapshot['path'], ignore_errors=True)
+
+
+def prune_snapshots(settings: dict = None):
+    """Enforce retention: `keep` snapshots per venv, then `max_mb` overall.
+
+    The disk limit drops the oldest snapshots first but never a venv's
+    newest one.
+    """
+    from sp.core.config import SP_SNAPSHOTS_DIR, get_snapshot_config
+
+    settings = settings or get_snapshot_config()
+    candidates = []
+    for directory in SP_SNAPSHOTS_DIR.glob("*/"):
+        for root in directory.glob("*/"):
+            try:
+                partial = not (root / MANIFEST).exists() and time.time() - root.stat().st_mtime > STALE_PARTIAL_SECONDS
+            except OSError:
+                continue
+            if partial:
+                shutil.rmtree(root, ignore_errors=True)
+
+        snapshots = _read_snapshots(directory)
+        for snapshot in snapshots[max(settings['keep'], 1):]:
+            remove_snapshot(snapshot)
+        candidates += snapshots[1:max(settings['keep'], 1)]
+
+    limit = settings['max_mb'] * 1024 * 1024
+    sizes = {snapshot['path']: exclusive_bytes(snapshot) for snapshot in candidates}
+    newest = [snapshot for directory in SP_SNAPSHOTS_DIR.glob("*/") for snapshot in _read_snapshots(directory)[:1]]
+    total = sum(sizes.values()) + sum(exclusive_bytes(snapshot) for snapshot in newest)
+    for snapshot in sorted(candidates, key=lambda snapshot: snapshot['created']):
+        if total <= limit:
+            break
+        remove_snapshot(snapshot)
+        total -= sizes[snapshot['path']]
+
+
+def restore_snapshot(venv_dir: Path, snapshot: dict) -> str:
+    """Put a venv back to a snapshot's state.
+
+    Mirrored snapshots are moved into place: the snapshot tree is renamed
+    next to the venv, then exchanged with it (see fileutil.exchange_dirs),
+    so the venv path is never missing or half restored.
+    Recorded snapshots reinstall their exact distributions with
+    `uv pip sync` (needs the packages in the uv cache or index).
+
+    Returns:
+        The snapshot's method
+
+    Raises:
+        OSError: If the swap fails
+        subprocess.CalledProcessError: If `uv pip sync` fails
+    """
+    if snapshot['method'] == 'record':
+        _sync_distributions(venv_dir, snapshot['distributions'])
+        return 'record'
+
+    from sp.core.fileutil import exchange_dirs
+
+    incoming = venv_dir.with_name(venv_dir.name + ".rollback")
+    for leftover in (incoming, venv_dir.with_name(venv_dir.name + ".replaced")):
+        shutil.rmtree(leftover, ignore_errors=True)
+    os.rename(Path(snapshot['path']) / TREE, incoming)
+    shutil.rmtree(exchange_dirs(incoming, venv_dir), ignore_errors=True)
+    return snapshot['method']
+
+
+def _sync_distributions(venv_dir: Path, distributions: dict):
+    import subprocess
+    import tempfile
+
+    from sp.core.index import uv_index_args
+
+    with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as requirements:
+        requirements.write("".join(f"{name}=={version}\n" for name, version in sorted(distributions.items())))
+    try:
+        subprocess.run(
+            ["uv", "pip", "sync", "--python", str(venv_dir / "bin" / "python"), requirements.name, *uv_index_args()],
+            check=True,
+        )
+    finally:
+        os.unlink(requirements.name)
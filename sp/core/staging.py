@@ -0,0 +1,230 @@
+"""Staged library upgrades for SignalPilot CLI.
+
+Instead of stopping a launch to ask about a major upgrade and then
+installing it before Jupyter starts, sp builds the upgraded environment
+beside the live one while the session runs:
+
+1. `python -m sp.core.staging <venv>` runs detached and reniced (see
+   upgrade_check.spawn_detached). It mirrors `.venv` into `.venv.staging`
+   with reflinks or hardlinks (see sp.core.snapshot) and installs the
+   upgrade plan's pinned versions there (see sp.core.upgrade_plan)
+   through the shared uv cache. The live venv is never written to, so a
+   failed build costs nothing but the staging directory.
+2. The next `sp lab` (or `sp upgrade --apply`) swaps the staging venv in
+   with one atomic rename (see fileutil.exchange_dirs), under a lock on
+   the marker, once no server or kernel runs from the venv. The replaced
+   venv becomes the newest rollback snapshot.
+
+Progress is tracked in `.venv.staging.json` next to the venv:
+{'status': 'building'|'ready'|'failed', 'pid', 'package', 'current',
+'target', 'base_mtime_ns', 'created', 'seconds', 'error'}. A ready build
+is only swapped in while the live venv's site-packages is unchanged
+since the build started (base_mtime_ns).
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def staging_dir(venv_dir: Path) -> Path:
+    """Directory the upgraded copy of a venv is built in."""
+    return venv_dir.with_name(venv_dir.name + ".staging")
+
+
+def _marker_path(venv_dir: Path) -> Path:
+    return venv_dir.with_name(venv_dir.name + ".staging.json")
+
+
+def read_staging(venv_dir: Path) -> dict | None:
+    """The staging marker of a venv, or None if nothing was staged."""
+    try:
+        return json.loads(_marker_path(venv_dir).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_marker(venv_dir: Path, marker: dict):
+    from sp.core.fileutil import atomic_write_json
+
+    atomic_write_json(_marker_path(venv_dir), marker)
+
+
+def _discard(venv_dir: Path):
+    shutil.rmtree(staging_dir(venv_dir), ignore_errors=True)
+    _marker_path(venv_dir).unlink(missing_ok=True)
+
+
+def discard_staging(venv_dir: Path):
+    """Remove a venv's staging directory and marker."""
+    from sp.core.fileutil import file_lock
+
+    with file_lock(_marker_path(venv_dir)):
+        _discard(venv_dir)
+
+
+def needs_staging(venv_dir: Path, target_version: str) -> bool:
+    """Whether a staging build of target_version should be started.
+
+    Not when one is ready or running for that version, nor when building
+    it already failed (it is retried once a newer version is published).
+    """
+    from sp.core.daemon import is_process_alive
+
+    marker = read_staging(venv_dir)
+    if marker is None or marker.get('target') != target_version:
+        return True
+    if marker['status'] == 'building':
+        return not is_process_alive(marker.get('pid', 0))
+    return False
+
+
+def spawn_staging(venv_dir: Path):
+    """Build the staging venv in a detached, low-priority process."""
+    from sp.upgrade_check import spawn_detached
+
+    spawn_detached([sys.executable, "-m", "sp.core.staging", str(venv_dir)])
+
+
+def _relocate_scripts(staging: Path, venv_dir: Path):
+    """Point scripts installed into the staging venv at the live venv's path.
+
+    Installers write the interpreter path into entry-point scripts
+    (`#!/.../.venv.staging/bin/python`); after the swap they must name
+    `.venv`. Scripts are replaced, never edited in place, since unchanged
+    files may be hardlinks into the live venv.
+    """
+    old, new = str(staging).encode(), str(venv_dir).encode()
+    bin_dir = staging / "bin"
+    for script in bin_dir.iterdir() if bin_dir.is_dir() else []:
+        if script.is_symlink() or not script.is_file():
+            continue
+        try:
+            content = script.read_bytes()
+        except OSError:
+            continue
+        if not content.startswith(b"#!") or old not in content[:1024]:
+            continue
+        relocated = script.with_name(f".{script.name}.relocated")
+        relocated.write_bytes(content[:1024].replace(old, new) + content[1024:])
+        shutil.copymode(script, relocated)
+        os.replace(relocated, script)
+
+
+def build_staging(venv_dir: Path) -> dict | None:
+    """Build the upgraded venv next to the live one (see module docstring).
+
+    Args:
+        venv_dir: Live virtual environment
+
+    Returns:
+        Final marker dict, or None if there was nothing to upgrade or a
+        build is already running
+    """
+    from sp.core import upgrade_plan
+    from sp.core.snapshot import _mirror
+
+    marker = read_staging(venv_dir)
+    if marker and marker['status'] == 'building':
+        from sp.core.daemon import is_process_alive
+
+        if is_process_alive(marker.get('pid', 0)):
+            return None
+
+    plan = upgrade_plan.build_plan(venv_dir)
+    library = plan['library']
+    if library is None or not upgrade_plan.plan_has_changes(plan, steps=('library',)):
+        return None
+
+    started = time.perf_counter()
+    marker = {
+        'status': 'building',
+        'pid': os.getpid(),
+        'package': library['package'],
+        'current': library['current'],
+        'target': next(
+            (change['target'] for change in library['changes'] if change['name'] == library['package']),
+            library['latest'],
+        ),
+        'base_mtime_ns': plan['mtime_ns'],
+        'created': datetime.now(timezone.utc).isoformat(),
+    }
+    import subprocess
+
+    from sp.core.fileutil import file_lock
+
+    staging = staging_dir(venv_dir)
+    # Not while a launch is swapping in an earlier build
+    with file_lock(_marker_path(venv_dir)):
+        _write_marker(venv_dir, marker)
+        shutil.rmtree(staging, ignore_errors=True)
+    try:
+        _mirror(venv_dir, staging, 'reflink' if sys.platform == 'linux' else 'hardlink')
+        subprocess.run(upgrade_plan.library_command({**plan, 'venv': str(staging)}),
+                       check=True, capture_output=True, text=True)
+        _relocate_scripts(staging, venv_dir)
+    except (OSError, subprocess.CalledProcessError) as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        stderr = getattr(e, 'stderr', None)
+        lines = [line for line in (stderr or str(e)).splitlines() if line.strip()]
+        marker.update(status='failed', error=lines[-1].strip() if lines else repr(e))
+    else:
+        marker['status'] = 'ready'
+    marker['seconds'] = round(time.perf_counter() - started, 3)
+    _write_marker(venv_dir, marker)
+    return marker
+
+
+def venv_in_use(venv_dir: Path) -> bool:
+    """Whether a server or kernel runs from the venv, so it must not be swapped."""
+    from sp.core.daemon import find_live_server, venv_processes
+
+    return bool(find_live_server(venv_dir) or venv_processes(venv_dir))
+
+
+def apply_staged(venv_dir: Path) -> dict | None:
+    """Swap a ready staging venv in, keeping the replaced venv as a snapshot.
+
+    A build made before the live venv last changed is discarded instead.
+    Nothing happens while any server or kernel runs from the venv (see
+    venv_in_use). The whole check, swap and snapshot sequence holds the
+    venv's staging lock, so concurrent launches swap at most once.
+
+    Returns:
+        The applied marker, or None if nothing was swapped in
+    """
+    marker = read_staging(venv_dir)
+    if marker is None or marker['status'] != 'ready':
+        return None
+
+    from sp.core.environment import venv_inventory
+    from sp.core.fileutil import exchange_dirs, file_lock
+    from sp.core.snapshot import keep_as_snapshot
+
+    with file_lock(_marker_path(venv_dir)):
+        # Another launch may have swapped or discarded it meanwhile
+        marker = read_staging(venv_dir)
+        if marker is None or marker['status'] != 'ready' or venv_in_use(venv_dir):
+            return None
+        inventory = venv_inventory(venv_dir)
+        if (inventory is None or inventory['mtime_ns'] != marker['base_mtime_ns']
+                or not staging_dir(venv_dir).is_dir()):
+            _discard(venv_dir)
+            return None
+
+        replaced = exchange_dirs(staging_dir(venv_dir), venv_dir)
+        _marker_path(venv_dir).unlink(missing_ok=True)
+        try:
+            keep_as_snapshot(venv_dir, replaced, inventory, reason=f"staged upgrade to {marker['target']}")
+        except OSError:
+            shutil.rmtree(replaced, ignore_errors=True)
+    return marker
+
+
+if __name__ == "__main__":
+    # Entry point for spawn_staging()
+    build_staging(Path(sys.argv[1]))
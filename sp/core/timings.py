@@ -0,0 +1,240 @@
+"""Startup timelines and timing history for SignalPilot CLI.
+
+`sp lab --timings` records a Timeline of launch phases, writes it as a
+Chrome trace (open in chrome://tracing or https://ui.perfetto.dev) and
+appends the phase durations to SignalPilotHome/.signalpilot/timings.jsonl,
+which `sp stats` summarizes.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sp.core.config import SP_CONFIG_DIR, SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL
+
+SP_TIMINGS_HISTORY = SP_CONFIG_DIR / "timings.jsonl"
+SP_TRACES_DIR = SP_CONFIG_DIR / "traces"
+
+# Launch phases in the order they happen
+LAB_PHASES = [
+    "config load",
+    "staged swap",
+    "cache check",
+    "process spawn",
+    "server listening",
+    "extensions loaded",
+    "first kernel ready",
+]
+
+MAX_HISTORY = 1000
+MAX_TRACES = 20
+
+
+class Timeline:
+    """Named phases of a single run, timed with time.perf_counter()."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []  # (name, start, end) in perf_counter seconds
+        self.notes = {}  # decisions taken during the run, e.g. {"update check": "cache fresh"}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the body of a with-block as a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def add(self, name: str, start: float, end: float):
+        """Record a phase that ran from start to end (perf_counter seconds)."""
+        self.spans.append((name, start, end))
+
+    def note(self, name: str, text: str):
+        """Record a decision taken during the run (shown with the timeline)."""
+        self.notes[name] = text
+
+    def durations(self) -> dict[str, float]:
+        """Phase durations in milliseconds, in recording order."""
+        return {name: round((end - start) * 1000, 1) for name, start, end in self.spans}
+
+    def total_ms(self) -> float:
+        """Milliseconds from the timeline's creation to the end of the last phase."""
+        if not self.spans:
+            return 0.0
+        return round((max(end for _, _, end in self.spans) - self.origin) * 1000, 1)
+
+    def chrome_trace(self) -> dict:
+        """Timeline in Chrome's Trace Event format (complete events, microseconds)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": "sp",
+                "ph": "X",
+                "ts": round((start - self.origin) * 1_000_000),
+                "dur": round((end - start) * 1_000_000),
+                "pid": pid,
+                "tid": 0,
+            }
+            for name, start, end in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def installed_library(venv_dir: Path) -> tuple[str, str] | None:
+    """Find the SignalPilot library in a venv from its dist-info.
+
+    Returns:
+        (package name, version), or None if neither package is installed
+    """
+    from sp.core.environment import installed_version
+
+    for package in (SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL):
+        version = installed_version(venv_dir, package)
+        if version:
+            return package, version
+    return None
+
+
+def save_run(timeline: Timeline, venv_dir: Path, command: str = "lab") -> Path:
+    """Write a run's Chrome trace and append its durations to the history.
+
+    Args:
+        timeline: Completed timeline
+        venv_dir: Venv the run used (its SignalPilot library version is recorded)
+        command: Name of the timed command
+
+    Returns:
+        Path of the written trace file
+    """
+    from sp import __version__
+
+    now = datetime.now(timezone.utc)
+    SP_TRACES_DIR.mkdir(parents=True, exist_ok=True)
+    trace_path = SP_TRACES_DIR / f"{command}-{now.strftime('%Y%m%d-%H%M%S')}.json"
+    trace_path.write_text(json.dumps(timeline.chrome_trace(), indent=2))
+
+    # Keep only the newest traces
+    for old in sorted(SP_TRACES_DIR.glob(f"{command}-*.json"))[:-MAX_TRACES]:
+        old.unlink(missing_ok=True)
+
+    from sp.core.environment import read_python_version
+
+    library = installed_library(venv_dir)
+    record = {
+        "at": now.isoformat(),
+        "command": command,
+        "cli_version": __version__,
+        "library": library[0] if library else None,
+        "library_version": library[1] if library else None,
+        "python": read_python_version(venv_dir),
+        "venv": str(venv_dir),
+        "phases": timeline.durations(),
+        "total_ms": timeline.total_ms(),
+        "notes": timeline.notes,
+    }
+    with open(SP_TIMINGS_HISTORY, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    history = load_history()
+    if len(history) > MAX_HISTORY:
+        SP_TIMINGS_HISTORY.write_text("".join(json.dumps(entry) + "\n" for entry in history[-MAX_HISTORY:]))
+    return trace_path
+
+
+def load_history() -> list[dict]:
+    """Load recorded runs, oldest first, skipping unreadable lines."""
+    try:
+        lines = SP_TIMINGS_HISTORY.read_text().splitlines()
+    except OSError:
+        return []
+
+    history = []
+    for line in lines:
+        try:
+            history.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return history
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentile with linear interpolation (pct in 0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def find_regressions(history: list[dict], threshold: float = 0.2, min_ms: float = 100.0) -> list[dict]:
+    """Compare median phase times of the newest version against the previous one.
+
+    Only runs from the newest run's venv count, so switching between venvs
+    with different library versions is not mistaken for an upgrade. They
+    are grouped by (cli_version, library_version). A phase regressed when
+    its median got slower by more than threshold (fraction) and min_ms.
+
+    Returns:
+        List of dicts with phase, before, after (median ms), from and to
+        versions, and venv
+    """
+    if not history:
+        return []
+    venv = history[-1].get("venv")
+    groups = {}
+    last_seen = {}
+    for index, record in enumerate(history):
+        if record.get("venv") != venv:
+            continue
+        key = (record.get("cli_version"), record.get("library_version"))
+        groups.setdefault(key, []).append(record)
+        last_seen[key] = index
+    if len(groups) < 2:
+        return []
+
+    previous, latest = sorted(groups, key=last_seen.get)[-2:]
+    regressions = []
+    for phase in LAB_PHASES + ["total"]:
+        before = [r.get("total_ms") if phase == "total" else r.get("phases", {}).get(phase) for r in groups[previous]]
+        after = [r.get("total_ms") if phase == "total" else r.get("phases", {}).get(phase) for r in groups[latest]]
+        before = [v for v in before if v is not None]
+        after = [v for v in after if v is not None]
+        if not before or not after:
+            continue
+        p50_before, p50_after = percentile(before, 50), percentile(after, 50)
+        if p50_after - p50_before > max(min_ms, p50_before * threshold):
+            regressions.append({
+                "phase": phase,
+                "before": p50_before,
+                "after": p50_after,
+                "from": previous,
+                "to": latest,
+                "venv": venv,
+            })
+    return regressions
+
+
+def print_timeline(timeline: Timeline, trace_path: Path = None):
+    """Print a run's phase durations as a bar chart."""
+    from sp.ui.console import console
+
+    durations = timeline.durations()
+    longest = max(durations.values(), default=0) or 1
+    console.print("\n→ Startup timeline", style="bold cyan")
+    for name, ms in durations.items():
+        bar = "█" * max(1, round(ms / longest * 30))
+        console.print(f"  {name:<20} {ms:>9.1f} ms  [cyan]{bar}[/cyan]")
+    console.print(f"  {'total':<20} {timeline.total_ms():>9.1f} ms", style="bold")
+    for name, text in timeline.notes.items():
+        console.print(f"  {name}: {text}", style="dim")
+    if trace_path:
+        console.print(f"  Trace: {trace_path}", style="dim")
+    console.print()
@@ -0,0 +1,460 @@
+"""Plan-then-apply upgrades for SignalPilot CLI.
+
+`sp upgrade --plan` works out exactly which distributions an upgrade
+changes, shows them with their download sizes and saves the plan;
+`sp upgrade` applies the saved plan while it still matches the venv
+(otherwise it plans afresh). Latest versions come from the upgrade cache
+when it is fresh, so planning usually needs no index lookups at all.
+
+By default only the SignalPilot library moves: it is pinned to its latest
+version and uv keeps every installed dependency that still satisfies it,
+so an upgrade doesn't churn pandas, numpy and friends. --all-packages
+also upgrades CORE_PACKAGES and their dependencies. `uv pip install
+--dry-run` resolves the plan; applying it installs exactly the resolved
+versions.
+"""
+
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sp.core.config import CORE_PACKAGES, SIGNALPILOT_CLI, is_running_via_uvx
+from sp.core.environment import normalize_name, venv_inventory, venv_key
+
+# A saved plan is applied only while the venv is unchanged and the plan is this fresh
+PLAN_MAX_AGE = timedelta(hours=1)
+
+# `uv pip install --dry-run` lists changes as " - name==old" / " + name==new"
+_CHANGE_RE = re.compile(r'^\s*([+-])\s+([A-Za-z0-9._-]+)==(\S+)\s*$')
+
+
+def parse_dry_run(output: str) -> list[dict]:
+    """Distribution changes from `uv pip install --dry-run` output.
+
+    Returns:
+        List of {'name', 'current', 'target'} sorted by name; 'current'
+        is None for new distributions
+    """
+    removed, added = {}, {}
+    for line in output.splitlines():
+        match = _CHANGE_RE.match(line)
+        if match:
+            sign, name, version = match.groups()
+            (added if sign == '+' else removed)[normalize_name(name)] = version
+    return [
+        {'name': name, 'current': removed.get(name), 'target': added.get(name)}
+        for name in sorted(set(removed) | set(added))
+    ]
+
+
+def _venv_python(venv_dir: Path) -> Path:
+    return venv_dir / "bin" / "python"
+
+
+def resolve_changes(venv_dir: Path, requirements: list[str], upgrade: bool = False) -> tuple[list[dict] | None, str | None]:
+    """Resolve an install without performing it (`uv pip install --dry-run`).
+
+    Args:
+        venv_dir: Path to virtual environment
+        requirements: Requirements and options for `uv pip install`
+        upgrade: Allow every resolved package to upgrade (--upgrade)
+
+    Returns:
+        Tuple of (changes from parse_dry_run, None), or (None, error message)
+    """
+    from sp.core.index import uv_index_args
+
+    cmd = ["uv", "pip", "install", "--dry-run", "--python", str(_venv_python(venv_dir)),
+           *requirements, *uv_index_args()]
+    if upgrade:
+        cmd.append("--upgrade")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None, "uv not found in PATH"
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if line.strip()]
+        return None, lines[-1].strip() if lines else f"uv exited with code {result.returncode}"
+    # uv reports on stderr; older releases used stdout
+    return parse_dry_run(result.stdout + result.stderr), None
+
+
+# ============================================================================
+# Download sizes
+# ============================================================================
+
+_PLATFORM_TAGS = {'linux': 'linux', 'darwin': 'macosx', 'win32': 'win'}
+
+
+def _wheel_fits(filename: str, python_version: str | None) -> bool:
+    """Rough wheel tag check against a venv's interpreter and this machine."""
+    parts = filename[:-len('.whl')].split('-')
+    if len(parts) < 5:
+        return False
+    python_tags, abi_tags, platform_tags = (tag.split('.') for tag in parts[-3:])
+    interpreter = f"cp{''.join((python_version or '').split('.')[:2])}"
+    python_ok = 'abi3' in abi_tags or any(tag == interpreter or tag.startswith('py3') for tag in python_tags)
+    system = _PLATFORM_TAGS.get(sys.platform, sys.platform)
+    machine = platform.machine().lower()
+    platform_ok = 'any' in platform_tags or any(
+        system in tag and (machine in tag.lower() or 'universal2' in tag) for tag in platform_tags
+    )
+    return python_ok and platform_ok
+
+
+def download_size(index: dict, package_name: str, version: str, python_version: str | None = None) -> int | None:
+    """Size in bytes of the file uv would download for a release, if the index says.
+
+    Prefers a wheel that fits the interpreter and platform, else the sdist.
+    Sizes come from the PEP 691 'size' field (or the file in a wheelhouse);
+    HTML-only indexes don't publish them.
+    """
+    from sp.core.index import _dist_name
+    from sp.upgrade_check import _file_version
+
+    name = normalize_name(package_name)
+    wheels, sdists = [], []
+    for file in index.get('files', []):
+        filename = file.get('filename', '')
+        dist = _dist_name(filename)
+        if not dist or normalize_name(dist) != name or _file_version(filename) != version or file.get('yanked'):
+            continue
+        (wheels if filename.endswith('.whl') else sdists).append(file)
+    for file in [f for f in wheels if _wheel_fits(f['filename'], python_version)] + sdists:
+        if isinstance(file.get('size'), int):
+            return file['size']
+    return None
+
+
+def project_pages(package_names: list[str], timeout: float = 5.0) -> dict:
+    """Project pages of several packages from the configured index (see sp.core.index).
+
+    Wheelhouse and file:// mirror pages are read from disk; remote pages
+    are fetched in parallel under one deadline.
+
+    Returns:
+        Dict of package name to PEP 691 shaped page ({'files': [...]})
+    """
+    from sp.core import http
+    from sp.core.config import get_index_config
+    from sp.core.index import package_sources, project_url, read_file_index, wheelhouse_index
+    from sp.upgrade_check import SIMPLE_JSON_TYPE, parse_index_response
+
+    settings = get_index_config()
+    pages, remote = {}, []
+    for package_name in dict.fromkeys(package_names):
+        sources = package_sources(package_name, settings)
+        files = []
+        if sources['wheelhouse']:
+            files += wheelhouse_index(sources['wheelhouse'], package_name)['files']
+        index_url = sources['url']
+        if index_url and index_url.startswith('file:'):
+            files += (read_file_index(index_url, package_name) or {}).get('files', [])
+        elif index_url:
+            remote.append((package_name, index_url))
+        pages[package_name] = {'files': files}
+
+    headers = {'Accept': SIMPLE_JSON_TYPE, 'Accept-Encoding': 'gzip'}
+    responses = http.fetch_many(
+        [(project_url(index_url, package_name), headers) for package_name, index_url in remote],
+        timeout=timeout,
+    )
+    for (package_name, _), response in zip(remote, responses):
+        pages[package_name]['files'] += (parse_index_response(response) or {}).get('files', [])
+    return pages
+
+
+def format_size(size: int | None) -> str:
+    """Human readable byte count, '?' when unknown."""
+    if size is None:
+        return "?"
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MB"
+    return f"{max(1, round(size / 1024))} KB"
+
+
+# ============================================================================
+# Planning
+# ============================================================================
+
+def cli_plan(latest_version: str | None) -> dict:
+    """The CLI part of a plan: {'current', 'latest', 'upgrade', 'strategy'}."""
+    from sp.upgrade_check import compare_versions, get_cli_version
+
+    current_version = get_cli_version()
+    return {
+        'current': current_version,
+        'latest': latest_version,
+        'upgrade': bool(current_version and latest_version and compare_versions(current_version, latest_version) != "none"),
+        'strategy': "uvx" if is_running_via_uvx() else "tool",
+    }
+
+
+def build_plan(venv_dir: Path, all_packages: bool = False, cache: dict = None,
+               now: datetime = None, timeout: float = 5.0, latest: dict = None) -> dict:
+    """Work out what `sp upgrade` would change, without changing anything.
+
+    Args:
+        venv_dir: Path to virtual environment
+        all_packages: Also upgrade CORE_PACKAGES and their dependencies
+        cache: Upgrade cache dict (default: load and save upgrade-cache.json)
+        now: Current time (default: now, UTC)
+        timeout: Deadline in seconds for each batch of index lookups
+        latest: Latest versions already looked up (see latest_versions);
+            packages missing from it are looked up
+
+    Returns:
+        Plan dict:
+        {'venv', 'created', 'mtime_ns', 'all_packages',
+         'cli': {'current', 'latest', 'upgrade', 'strategy'},
+         'library': {'package', 'current', 'latest', 'requirements',
+                     'changes': [{'name', 'current', 'target', 'size'}],
+                     'resolved', 'error'} or None if not installed}
+    """
+    from sp.upgrade_check import compare_versions, detect_signalpilot_package, latest_versions
+
+    now = now or datetime.now(timezone.utc)
+    inventory = venv_inventory(venv_dir) or {}
+    lib_info = detect_signalpilot_package(venv_dir)
+    wanted = [SIGNALPILOT_CLI] + ([lib_info[0]] if lib_info else [])
+    latest = dict(latest or {})
+    missing = [package_name for package_name in wanted if package_name not in latest]
+    if missing:
+        latest.update(latest_versions(missing, cache=cache, now=now, timeout=timeout))
+
+    plan = {
+        'venv': str(venv_dir),
+        'created': now.isoformat(),
+        'mtime_ns': inventory.get('mtime_ns'),
+        'all_packages': all_packages,
+        'cli': cli_plan(latest.get(SIGNALPILOT_CLI)),
+        'library': None,
+    }
+    if not lib_info:
+        return plan
+
+    package_name, current_version = lib_info
+    target = latest.get(package_name)
+    if all_packages:
+        requirements = [*CORE_PACKAGES, f"{package_name}=={target}" if target else package_name]
+    elif target is None:
+        # Not on the index we can read (signalpilot-ai-internal on PyPI):
+        # let uv pick the newest it can reach, moving nothing else
+        requirements = ["--upgrade-package", package_name, package_name]
+    elif compare_versions(current_version, target) != "none":
+        requirements = [f"{package_name}=={target}"]
+    else:
+        requirements = []
+
+    changes, error = resolve_changes(venv_dir, requirements, upgrade=all_packages) if requirements else ([], None)
+    resolved = changes is not None
+    if not resolved:
+        # No dry run (uv missing or failing): the library change is all we know
+        changes = [{'name': package_name, 'current': current_version, 'target': target}] if target else []
+
+    python_version = inventory.get('python')
+    pages = project_pages([change['name'] for change in changes if change['target']], timeout=timeout) if changes else {}
+    for change in changes:
+        page = pages.get(change['name'])
+        change['size'] = download_size(page, change['name'], change['target'], python_version) if page else None
+
+    plan['library'] = {
+        'package': package_name,
+        'current': current_version,
+        'latest': target,
+        'requirements': requirements,
+        'changes': changes,
+        'resolved': resolved,
+        'error': error,
+    }
+    return plan
+
+
+def plan_has_changes(plan: dict, steps: tuple[str, ...] = ('cli', 'library')) -> bool:
+    """Whether applying a plan's steps (see apply_plan) would change anything."""
+    library = plan['library']
+    if 'library' in steps and library and (library['changes'] or (not library['resolved'] and library['requirements'])):
+        return True
+    return 'cli' in steps and plan['cli']['upgrade']
+
+
+def _plan_file(venv_dir: Path) -> Path:
+    from sp.core.config import SP_PLANS_DIR
+
+    return SP_PLANS_DIR / f"{venv_key(venv_dir)}.json"
+
+
+def save_plan(plan: dict):
+    """Save a plan for the next `sp upgrade` in the same venv."""
+    from sp.core.fileutil import atomic_write_json
+
+    atomic_write_json(_plan_file(Path(plan['venv'])), plan)
+
+
+def load_plan(venv_dir: Path, all_packages: bool = False, now: datetime = None) -> dict | None:
+    """The saved plan for a venv, if it still describes the venv.
+
+    A plan is stale once it is older than PLAN_MAX_AGE, once anything was
+    installed into the venv since (site-packages mtime, see venv_inventory),
+    or when it was made for a different --all-packages setting.
+    """
+    from sp.upgrade_check import _parse_time, get_cli_version
+
+    try:
+        plan = json.loads(_plan_file(venv_dir).read_text())
+    except (OSError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    created = _parse_time(plan.get('created'))
+    inventory = venv_inventory(venv_dir) or {}
+    if (created is None or now - created > PLAN_MAX_AGE
+            or plan.get('venv') != str(venv_dir)
+            or plan.get('mtime_ns') != inventory.get('mtime_ns')
+            or plan.get('all_packages') != all_packages
+            or plan.get('cli', {}).get('current') != get_cli_version()):
+        return None
+    return plan
+
+
+def discard_plan(venv_dir: Path):
+    """Remove a venv's saved plan (after it was applied)."""
+    _plan_file(venv_dir).unlink(missing_ok=True)
+
+
+def print_plan(plan: dict):
+    """Show a plan: CLI change, then each distribution change with its download size."""
+    from sp.ui.console import console
+
+    cli = plan['cli']
+    console.print("\n→ Upgrade plan", style="bold cyan")
+    if cli['upgrade']:
+        console.print(f"  CLI: {SIGNALPILOT_CLI} {cli['current']} → {cli['latest']}")
+    elif cli['latest']:
+        console.print(f"  CLI: {SIGNALPILOT_CLI} {cli['current']} (up-to-date)", style="dim")
+    else:
+        console.print(f"  CLI: {SIGNALPILOT_CLI} {cli['current'] or '?'} (latest version unknown)", style="yellow")
+
+    library = plan['library']
+    if library is None:
+        console.print("  Library: SignalPilot library not found in environment", style="yellow")
+        return
+    if not library['changes']:
+        if library['resolved']:
+            console.print(f"  Library: {library['package']} {library['current']} (up-to-date)", style="dim")
+        else:
+            console.print(f"  Library: {library['package']} {library['current']} (latest version unknown)", style="yellow")
+        if library['error']:
+            console.print(f"    {library['error']}", style="dim")
+        return
+
+    scope = "all packages" if plan['all_packages'] else "SignalPilot packages only"
+    console.print(f"  Library environment ({scope}):")
+    width = max(len(change['name']) for change in library['changes'])
+    console.print(f"    {'package':<{width}}  {'installed':>12}  {'planned':>12}  {'download':>9}", style="bold")
+    for change in library['changes']:
+        console.print(
+            f"    {change['name']:<{width}}  {change['current'] or '-':>12}  "
+            f"{change['target'] or 'removed':>12}  {format_size(change['size']) if change['target'] else '':>9}"
+        )
+
+    sizes = [change['size'] for change in library['changes'] if change['target']]
+    unknown = sum(size is None for size in sizes)
+    total = f"  Download: {format_size(sum(size for size in sizes if size is not None))}"
+    if unknown:
+        total += f" ({unknown} size(s) unknown)"
+    console.print(total, style="dim")
+    if not library['resolved']:
+        console.print(f"  Dependencies not resolved: {library['error']}", style="yellow")
+
+
+# ============================================================================
+# Applying
+# ============================================================================
+
+def _run_step(commands: list[list[str]], required: int = None) -> dict:
+    """Run commands in order, capturing output; only the first `required` must succeed."""
+    started = time.perf_counter()
+    required = len(commands) if required is None else required
+    for position, cmd in enumerate(commands):
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except FileNotFoundError:
+            return {'ok': False, 'seconds': time.perf_counter() - started, 'detail': "uv not found in PATH"}
+        if result.returncode != 0 and position < required:
+            lines = [line for line in result.stderr.splitlines() if line.strip()]
+            detail = lines[-1].strip() if lines else f"exit code {result.returncode}"
+            return {'ok': False, 'seconds': time.perf_counter() - started, 'detail': detail}
+    return {'ok': True, 'seconds': time.perf_counter() - started, 'detail': None}
+
+
+def cli_commands(plan: dict) -> list[list[str]]:
+    """Commands for the CLI step of a plan (empty when there is nothing to do).
+
+    uvx users get a cache clean (the next run fetches the new version);
+    tool users get a reinstall pinned to the planned version, then the
+    cache clean for consistency.
+    """
+    cli = plan['cli']
+    if not cli['upgrade']:
+        return []
+    clean = ["uv", "cache", "clean", SIGNALPILOT_CLI]
+    if cli['strategy'] == "uvx":
+        return [clean]
+    return [["uv", "tool", "install", "--force", f"{SIGNALPILOT_CLI}=={cli['latest']}"], clean]
+
+
+def library_command(plan: dict) -> list[str] | None:
+    """`uv pip install` command for the library step of a plan, or None.
+
+    A resolved plan installs exactly the versions it lists; an unresolved
+    one falls back to its requirements.
+    """
+    from sp.core.index import uv_index_args
+
+    library = plan['library']
+    if library is None:
+        return None
+    if library['resolved']:
+        args = [f"{change['name']}=={change['target']}" for change in library['changes'] if change['target']]
+    else:
+        args = list(library['requirements']) + (["--upgrade"] if plan['all_packages'] else [])
+    if not args:
+        return None
+    return ["uv", "pip", "install", "--python", str(_venv_python(Path(plan['venv']))), *args, *uv_index_args()]
+
+
+def apply_plan(plan: dict, steps: tuple[str, ...] = ('cli', 'library')) -> dict:
+    """Apply a plan: the CLI and library steps run concurrently.
+
+    Args:
+        plan: Plan from build_plan or load_plan
+        steps: Steps to run ('cli', 'library')
+
+    Returns:
+        {'cli': step result, 'library': step result}; a step result is
+        {'ok', 'seconds', 'detail'}, or None when the step had nothing to do
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    work = {}
+    commands = cli_commands(plan) if 'cli' in steps else []
+    if commands:
+        # The cache clean after a tool install is best-effort
+        work['cli'] = (commands, 1)
+    command = library_command(plan) if 'library' in steps else None
+    if command:
+        work['library'] = ([command], None)
+
+    results = {'cli': None, 'library': None}
+    if not work:
+        return results
+    with ThreadPoolExecutor(max_workers=len(work)) as pool:
+        futures = {name: pool.submit(_run_step, cmds, required) for name, (cmds, required) in work.items()}
+        for name, future in futures.items():
+            results[name] = future.result()
+    return results
@@ -0,0 +1,224 @@
+"""Jupyter cache warming for SignalPilot CLI.
+
+Rebuilds what a venv's Jupyter server reads at startup, without starting
+extra `jupyter` processes:
+
+- page_config.json: disabled/locked lab extensions, written directly
+- lab extension metadata: every installed extension's package.json checked
+- the native kernelspec, written if ipykernel didn't install one
+- bytecode for the packages the server imports at startup (uv skips it)
+
+and measures a cold server start before and after.
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from sp.core.environment import site_packages_dir
+from sp.core.jupyter import build_jupyter_command, build_jupyter_env
+from sp.core.readiness import find_free_port, wait_for_server
+
+# Lab extensions SignalPilot turns off: (extension, locked)
+DISABLED_LAB_EXTENSIONS = [
+    ("@jupyterlab/apputils-extension:announcements", True),
+]
+
+# Top-level packages imported while the Jupyter server starts
+STARTUP_PACKAGES = [
+    "jupyterlab",
+    "jupyterlab_server",
+    "jupyter_server",
+    "jupyter_server_terminals",
+    "jupyter_lsp",
+    "notebook_shim",
+    "jupyter_client",
+    "jupyter_core",
+    "jupyter_events",
+    "nbformat",
+    "nbconvert",
+    "traitlets",
+    "tornado",
+    "zmq",
+    "jinja2",
+    "jsonschema",
+    "jsonschema_specifications",
+    "referencing",
+    "anyio",
+    "babel",
+    "signalpilot_ai",
+    "signalpilot_ai_internal",
+]
+
+
+def page_config_path(venv_dir: Path) -> Path:
+    """page_config.json at the venv's sys-prefix level (where `jupyter labextension disable` writes)."""
+    return venv_dir / "etc" / "jupyter" / "labconfig" / "page_config.json"
+
+
+def write_page_config(venv_dir: Path, extensions: list[tuple[str, bool]] = None) -> bool:
+    """Disable (and optionally lock) lab extensions in the venv's page_config.json.
+
+    Args:
+        venv_dir: Path to virtual environment
+        extensions: (extension id, locked) pairs, default DISABLED_LAB_EXTENSIONS
+
+    Returns:
+        True if the file was changed
+    """
+    path = page_config_path(venv_dir)
+    try:
+        config = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        config = {}
+
+    before = json.dumps(config, sort_keys=True)
+    for extension, locked in extensions if extensions is not None else DISABLED_LAB_EXTENSIONS:
+        config.setdefault("disabledExtensions", {})[extension] = True
+        if locked:
+            config.setdefault("lockedExtensions", {})[extension] = True
+
+    if json.dumps(config, sort_keys=True) == before:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(config, indent=2))
+    return True
+
+
+def check_lab_extensions(venv_dir: Path) -> tuple[int, list[str]]:
+    """Read every installed lab extension's package.json.
+
+    JupyterLab parses these on each page load; reading them here also pulls
+    them into the OS file cache.
+
+    Returns:
+        (number of valid extensions, names of extensions with broken metadata)
+    """
+    valid = 0
+    broken = []
+    labextensions = venv_dir / "share" / "jupyter" / "labextensions"
+    # Extensions live at <name>/package.json or @<scope>/<name>/package.json
+    package_jsons = [*labextensions.glob("[!@]*/package.json"), *labextensions.glob("@*/*/package.json")]
+    for package_json in sorted(package_jsons):
+        try:
+            json.loads(package_json.read_text())
+            valid += 1
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            broken.append(str(package_json.parent.relative_to(labextensions)))
+    return valid, broken
+
+
+def ensure_native_kernelspec(venv_dir: Path) -> bool:
+    """Write the venv's python3 kernelspec if ipykernel didn't install one.
+
+    Without it the server imports ipykernel at startup to synthesize the spec.
+
+    Returns:
+        True if a usable kernelspec exists afterwards
+    """
+    kernel_json = venv_dir / "share" / "jupyter" / "kernels" / "python3" / "kernel.json"
+    try:
+        spec = json.loads(kernel_json.read_text())
+        if spec.get("argv"):
+            return True
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    site_packages = site_packages_dir(venv_dir)
+    if site_packages is None or not (site_packages / "ipykernel").exists():
+        return False
+
+    kernel_json.parent.mkdir(parents=True, exist_ok=True)
+    kernel_json.write_text(json.dumps({
+        "argv": ["python", "-m", "ipykernel_launcher", "-f", "{connection_file}"],
+        "display_name": "Python 3 (ipykernel)",
+        "language": "python",
+        "metadata": {"debugger": True},
+    }, indent=1))
+    return True
+
+
+def compile_startup_packages(venv_dir: Path) -> int | None:
+    """Byte-compile the packages the Jupyter server imports at startup.
+
+    Skipped when optimize_venv() already compiled all of site-packages for
+    the current install set (see sp.core.optimize).
+
+    Returns:
+        Number of packages compiled, or None if they were already compiled
+    """
+    from sp.core.optimize import compile_site_packages, needs_optimize
+
+    site_packages = site_packages_dir(venv_dir)
+    if site_packages is None:
+        return 0
+    if not needs_optimize(venv_dir):
+        return None
+
+    packages = [name for name in STARTUP_PACKAGES if (site_packages / name).is_dir()]
+    compile_site_packages(venv_dir, packages)
+    return len(packages)
+
+
+def measure_cold_start(venv_dir: Path, timeout: float = 120.0) -> float | None:
+    """Start a throwaway Jupyter server for the venv and time it until ready.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+        timeout: Seconds to wait for the server
+
+    Returns:
+        Seconds until the server answered, or None if it failed to start
+    """
+    port = find_free_port()
+    cmd = build_jupyter_command(
+        venv_dir,
+        ["--no-browser", "--allow-root", f"--port={port}", "--ServerApp.port_retries=0"],
+        kernel_pool={},
+    )
+    started = time.monotonic()
+    process = subprocess.Popen(
+        cmd,
+        cwd=venv_dir.parent,
+        env=build_jupyter_env(venv_dir),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready = wait_for_server(process, port=port, timeout=timeout, started=started)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return ready["seconds"] if ready else None
+
+
+def warm_venv(venv_dir: Path) -> dict:
+    """Rebuild the Jupyter startup caches of a venv.
+
+    Args:
+        venv_dir: Path to virtual environment with jupyter
+
+    Returns:
+        Dict describing what was done: page_config_changed, extensions,
+        broken_extensions, kernelspec, compiled (see compile_startup_packages),
+        seconds
+    """
+    started = time.monotonic()
+    page_config_changed = write_page_config(venv_dir)
+    extensions, broken = check_lab_extensions(venv_dir)
+    kernelspec = ensure_native_kernelspec(venv_dir)
+    compiled = compile_startup_packages(venv_dir)
+    return {
+        "page_config_changed": page_config_changed,
+        "extensions": extensions,
+        "broken_extensions": broken,
+        "kernelspec": kernelspec,
+        "compiled": compiled,
+        "seconds": time.monotonic() - started,
+    }
+
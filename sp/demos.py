@@ -6,9 +6,7 @@ import urllib.parse
 import urllib.request
 from pathlib import Path
 
-from rich.console import Console
-
-console = Console()
+from sp.ui.console import console
 
 
 def download_demo_files_background(demo_dir: Path, result_container: list):
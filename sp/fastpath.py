@@ -0,0 +1,178 @@
+"""Console-script entry point with a zero-dependency fast path.
+
+`sp version`, `sp --version`, top-level `sp --help` and first-word shell
+completion are answered from the static data below using only the standard
+library. Everything else is handed to the Typer app in sp.main.
+
+Keep COMMANDS and OPTIONS in sync with sp.main (tests/test_fastpath.py
+checks this).
+"""
+
+import os
+import sys
+
+from sp import __version__
+from sp.ui.logo import LOGO
+
+# (name, help) for every top-level command, in registration order
+COMMANDS = [
+    ("init", "Initialize SignalPilot workspace at ~/SignalPilotHome"),
+    ("lab", "Start Jupyter Lab (default: current folder + home .venv)"),
+    ("home", "Start Jupyter Lab in SignalPilotHome (shortcut for 'lab --home')"),
+    ("upgrade", "Upgrade SignalPilot CLI and library"),
+    ("rollback", "Restore a venv from the snapshot taken before an upgrade"),
+    ("serve", "Start the resident Jupyter server for a venv (reused by 'sp lab')"),
+    ("ps", "List resident Jupyter servers"),
+    ("stop", "Stop a resident Jupyter server"),
+    ("warm", "Rebuild Jupyter startup caches for a venv"),
+    ("stats", "Summarize startup timings recorded by 'sp lab --timings'"),
+    ("version", "Show SignalPilot CLI version"),
+    ("nb", "Manage notebook outputs"),
+    ("wheelhouse", "Manage a local wheelhouse of workspace packages"),
+]
+
+# (flags, help) for top-level options
+OPTIONS = [
+    (("--dev",), "Use dev configuration (signalpilot-ai-internal)"),
+    (("--version",), "Show SignalPilot CLI version and exit."),
+    (("--install-completion",), "Install completion for the current shell."),
+    (("--show-completion",), "Show completion for the current shell, to copy it or customize the installation."),
+    (("--help", "-h"), "Show this message and exit."),
+]
+
+DESCRIPTION = "SignalPilot CLI - Bootstrap your data analysis workspace"
+
+VERSION_ARGS = (["version"], ["--version"])
+HELP_ARGS = (["--help"], ["-h"])
+
+
+def _use_color() -> bool:
+    """Match Rich's behaviour: color only on a terminal, honouring NO_COLOR."""
+    return sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+
+def render_version() -> str:
+    """Render the `sp version` output."""
+    version_line = f"\n          SignalPilot Installer CLI v{__version__}\n"
+    if _use_color():
+        return f"\033[36m{LOGO}\033[0m\n\033[1;37m{version_line}\033[0m\n"
+    return f"{LOGO}\n{version_line}\n"
+
+
+def render_help(prog_name: str) -> str:
+    """Render top-level help from the static command and option tables."""
+    option_names = [", ".join(flags) for flags, _ in OPTIONS]
+    option_width = max(len(name) for name in option_names)
+    command_width = max(len(name) for name, _ in COMMANDS)
+
+    lines = [f"Usage: {prog_name} [OPTIONS] COMMAND [ARGS]...", "", f"  {DESCRIPTION}", "", "Options:"]
+    for name, (_, help_text) in zip(option_names, OPTIONS):
+        lines.append(f"  {name:<{option_width}}  {help_text}")
+    lines += ["", "Commands:"]
+    for name, help_text in COMMANDS:
+        lines.append(f"  {name:<{command_width}}  {help_text}")
+    return "\n".join(lines) + "\n"
+
+
+def _completion_args(shell: str) -> tuple[list[str], str] | None:
+    """Read (args, incomplete) the same way Typer's completion classes do."""
+    import shlex
+
+    try:
+        if shell == "bash":
+            words = shlex.split(os.environ["COMP_WORDS"])
+            cword = int(os.environ["COMP_CWORD"])
+            args = words[1:cword]
+            incomplete = words[cword] if cword < len(words) else ""
+            return args, incomplete
+
+        line = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+        words = shlex.split(line)
+        args = words[1:]
+        if args and not line.endswith(" "):
+            return args[:-1], args[-1]
+        return args, ""
+    except (KeyError, ValueError):
+        return None
+
+
+def _zsh_escape(text: str) -> str:
+    """Escape a completion item the way Typer's zsh completion does."""
+    return (
+        text.replace('"', '""')
+        .replace("'", "''")
+        .replace("$", "\\$")
+        .replace("`", "\\`")
+        .replace(":", r"\\:")
+    )
+
+
+def complete(shell: str) -> str | None:
+    """Complete the first word after `sp`, or return None to defer to Typer."""
+    parsed = _completion_args(shell)
+    if parsed is None:
+        return None
+
+    args, incomplete = parsed
+    if args:
+        # Completing a subcommand's options needs the full Click command tree
+        return None
+
+    if incomplete.startswith("-"):
+        candidates = [(flag, help_text) for flags, help_text in OPTIONS for flag in flags]
+    else:
+        candidates = COMMANDS
+    matches = [(name, help_text) for name, help_text in candidates if name.startswith(incomplete)]
+
+    if shell == "bash":
+        return "\n".join(name for name, _ in matches)
+    if shell == "fish":
+        if os.environ.get("_TYPER_COMPLETE_FISH_ACTION") == "is-args":
+            sys.exit(0 if matches else 1)
+        return "\n".join(f"{name}\t{help_text}" for name, help_text in matches)
+    if shell == "zsh":
+        if not matches:
+            return "_files"
+        items = "\n".join(f'"{_zsh_escape(name)}":"{_zsh_escape(help_text)}"' for name, help_text in matches)
+        return f"_arguments '*: :(({items}))'"
+    return None
+
+
+def try_fast_path(argv: list[str], prog_name: str) -> str | None:
+    """Return the output for a fast-path invocation, or None if Typer is needed.
+
+    Args:
+        argv: Command-line arguments without the program name
+        prog_name: Program name as invoked (sp or signalpilot)
+    """
+    complete_var = "_{}_COMPLETE".format(prog_name.replace("-", "_").upper())
+    instruction = os.environ.get(complete_var)
+    if instruction:
+        if instruction.startswith("complete_"):
+            completions = complete(instruction[len("complete_"):])
+            return None if completions is None else completions + "\n"
+        return None
+
+    if argv in VERSION_ARGS:
+        return render_version()
+    if argv in HELP_ARGS:
+        return render_help(prog_name)
+    return None
+
+
+def main():
+    """Console-script entry point for `sp` and `signalpilot`."""
+    prog_name = os.path.basename(sys.argv[0]) or "sp"
+    output = try_fast_path(sys.argv[1:], prog_name)
+    if output is not None:
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        return
+
+    from sp.main import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
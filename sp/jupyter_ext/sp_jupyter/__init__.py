@@ -0,0 +1,18 @@
+"""Server-side extensions loaded into the venv's Jupyter server by SignalPilot CLI.
+
+This package runs inside the workspace venv, not the CLI's environment: it
+is put on PYTHONPATH by sp.core.jupyter.build_jupyter_env and may only
+depend on the standard library and jupyter_server. Modules use relative
+imports so they also load as sp.jupyter_ext.sp_jupyter from the CLI.
+"""
+
+import os
+
+# The CLI adds this directory to PYTHONPATH so the server can import us.
+# Drop it again so kernels started by the server don't inherit it.
+_EXT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_paths = [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p and os.path.abspath(p) != _EXT_DIR]
+if _paths:
+    os.environ["PYTHONPATH"] = os.pathsep.join(_paths)
+else:
+    os.environ.pop("PYTHONPATH", None)
@@ -0,0 +1,347 @@
+"""Caching contents manager for Jupyter servers launched by `sp lab`.
+
+The stock file manager answers every file-browser refresh with a listdir,
+then a full get() per entry: several stat calls, a hidden-path walk up to
+the root, and an event. In a data directory with tens of thousands of
+files, or on an NFS home directory, that takes seconds.
+
+CachingContentsManager builds each listing in one os.scandir pass. It
+drops hide_globs and dotfile entries before they are stat'ed and keeps the
+result in an LRU cache. Cached listings are invalidated by:
+
+- inotify (Linux, through ctypes), watching every cached directory
+- the directory's own mtime, checked on each request, which also catches
+  changes inotify can't see (e.g. made by another NFS client)
+- `cache_ttl`, for entries that no inotify watch covers
+- saves, renames and deletes made through the server itself
+
+It also restores notebook outputs that `sp nb compact` moved into sidecar
+files when a notebook is opened, and moves them out again on save (see
+sidecar.py), so the file on disk stays small.
+
+Enabled from the CLI with:
+    --ServerApp.contents_manager_class=sp_jupyter.contents.CachingContentsManager
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import mimetypes
+import os
+import stat
+import struct
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from anyio.to_thread import run_sync
+from jupyter_core.paths import is_file_hidden
+from jupyter_server.services.contents.largefilemanager import AsyncLargeFileManager
+from traitlets import Bool, Float, Integer
+
+from .sidecar import compact_notebook, find_store, restore_notebook, without_references
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class DirectoryWatcher:
+    """Non-blocking inotify watches on directories, drained on demand.
+
+    No event-loop integration is needed: pending events are read each time
+    the cache is consulted.
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}  # wd -> directory
+        self._wds = {}  # directory -> wd
+
+    def watch(self, path: str) -> bool:
+        """Watch a directory; False if it can't be (e.g. out of watches)."""
+        if path in self._wds:
+            return True
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return True
+
+    def unwatch(self, path: str):
+        wd = self._wds.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._rm_watch(self.fd, wd)
+
+    def is_watched(self, path: str) -> bool:
+        return path in self._wds
+
+    def changed(self) -> set | None:
+        """Directories with pending events, or None if the queue overflowed."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                return None
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                path = self._paths.get(wd)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & IN_IGNORED:
+                    # Watch removed by the kernel (directory deleted or unmounted)
+                    self._paths.pop(wd, None)
+                    self._wds.pop(path, None)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class CachingContentsManager(AsyncLargeFileManager):
+    """Large-file contents manager with cached, pruned directory listings."""
+
+    cache_size = Integer(512, config=True, help="Directory listings to keep cached.")
+
+    cache_ttl = Float(10.0, config=True, help="Seconds a listing without an inotify watch stays valid.")
+
+    use_inotify = Bool(True, config=True, help="Invalidate cached listings through inotify where available.")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._listings = OrderedDict()  # os path -> (dir mtime_ns, cached at, child models)
+        self._watcher = None
+        if self.use_inotify:
+            try:
+                self._watcher = DirectoryWatcher()
+            except (OSError, AttributeError):
+                self.log.info("inotify unavailable; directory listings expire after %ss", self.cache_ttl)
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _drop(self, os_dir: str):
+        self._listings.pop(os_dir, None)
+        if self._watcher is not None:
+            self._watcher.unwatch(os_dir)
+
+    def _drain_events(self):
+        if self._watcher is None:
+            return
+        changed = self._watcher.changed()
+        if changed is None:
+            self.invalidate()
+            return
+        for os_dir in changed:
+            self._drop(os_dir)
+
+    def invalidate(self, os_dir: str = None, tree: bool = False):
+        """Drop cached listings.
+
+        Args:
+            os_dir: Directory to drop (all listings if None)
+            tree: Also drop every directory below it
+        """
+        if os_dir is None:
+            for cached in list(self._listings):
+                self._drop(cached)
+            return
+        os_dir = os_dir.rstrip(os.sep) or os.sep
+        self._drop(os_dir)
+        if tree:
+            prefix = os_dir.rstrip(os.sep) + os.sep
+            for cached in [cached for cached in self._listings if cached.startswith(prefix)]:
+                self._drop(cached)
+
+    def _invalidate_parent(self, path: str):
+        self.invalidate(os.path.dirname(self._get_os_path(path.strip("/"))))
+
+    def _cached_listing(self, os_dir: str, mtime_ns: int) -> list | None:
+        self._drain_events()
+        cached = self._listings.get(os_dir)
+        if cached is None:
+            return None
+        cached_mtime, cached_at, children = cached
+        watched = self._watcher is not None and self._watcher.is_watched(os_dir)
+        if cached_mtime != mtime_ns or (not watched and time.monotonic() - cached_at > self.cache_ttl):
+            self._drop(os_dir)
+            return None
+        self._listings.move_to_end(os_dir)
+        return children
+
+    def _store_listing(self, os_dir: str, mtime_ns: int, children: list):
+        self._listings[os_dir] = (mtime_ns, time.monotonic(), children)
+        self._listings.move_to_end(os_dir)
+        while len(self._listings) > self.cache_size:
+            self._drop(next(iter(self._listings)))
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def _child_model(self, path: str, entry: os.DirEntry) -> dict | None:
+        """Directory-listing model of one entry, built from a single stat."""
+        try:
+            info = entry.stat(follow_symlinks=False)
+            if stat.S_ISLNK(info.st_mode):
+                info = entry.stat()  # list symlinks as what they point to
+        except OSError as e:
+            # skip broken symlinks and entries we may not see
+            if e.errno not in (errno.ENOENT, errno.EACCES, errno.ELOOP):
+                self.log.warning("Error stat-ing %s: %r", entry.path, e)
+            return None
+
+        if stat.S_ISDIR(info.st_mode):
+            kind, size, mimetype = "directory", None, None
+        elif stat.S_ISREG(info.st_mode):
+            kind = "notebook" if entry.name.endswith(".ipynb") else "file"
+            size = info.st_size
+            mimetype = mimetypes.guess_type(entry.name)[0] if kind == "file" else None
+        else:
+            return None
+
+        try:
+            if not self.allow_hidden and is_file_hidden(entry.path, stat_res=info):
+                return None
+        except OSError:
+            return None
+
+        return {
+            "name": entry.name,
+            "path": f"{path}/{entry.name}" if path else entry.name,
+            "type": kind,
+            "last_modified": _timestamp(info.st_mtime),
+            "created": _timestamp(getattr(info, "st_birthtime", info.st_ctime)),
+            "content": None,
+            "format": None,
+            "mimetype": mimetype,
+            "size": size,
+            "writable": os.access(entry.path, os.W_OK),
+            "hash": None,
+            "hash_algorithm": None,
+        }
+
+    def _scan(self, path: str, os_dir: str) -> list:
+        children = []
+        with os.scandir(os_dir) as entries:
+            for entry in entries:
+                # Prune before stat'ing: hidden globs and dotfiles never cost a syscall
+                if not self.should_list(entry.name) or (not self.allow_hidden and entry.name.startswith(".")):
+                    continue
+                model = self._child_model(path, entry)
+                if model is not None:
+                    children.append(model)
+        return children
+
+    async def _dir_model(self, path, content=True):
+        # The base model runs the existence and hidden-path checks (404s)
+        model = await super()._dir_model(path, content=False)
+        if not content:
+            return model
+
+        os_dir = self._get_os_path(path)
+        mtime_ns = (await run_sync(os.stat, os_dir)).st_mtime_ns
+        children = self._cached_listing(os_dir, mtime_ns)
+        if children is None:
+            # Watch before scanning so changes made during the scan invalidate it
+            if self._watcher is not None:
+                self._watcher.watch(os_dir)
+            children = await run_sync(self._scan, path, os_dir)
+            self._store_listing(os_dir, mtime_ns, children)
+
+        model["content"] = [dict(child) for child in children]
+        model["format"] = "json"
+        return model
+
+    # ------------------------------------------------------------------
+    # Sidecar outputs
+    # ------------------------------------------------------------------
+
+    async def _read_notebook(self, os_path, as_version=4, capture_validation_error=None, raw=False):
+        answer = await super()._read_notebook(os_path, as_version, capture_validation_error, raw)
+        nb = answer[0] if raw else answer
+        # Before trust is checked: signatures cover the full output data
+        _, missing = restore_notebook(nb, find_store(os_path), keep_refs=True)
+        if missing:
+            self.log.warning("%d sidecar output(s) of %s are missing", missing, os_path)
+        return answer
+
+    def check_and_sign(self, nb, path="", **kwargs):
+        # Signed without references, which the CLI adds after signing and
+        # _save_notebook adds after this
+        super().check_and_sign(without_references(nb), path, **kwargs)
+
+    def mark_trusted_cells(self, nb, path=""):
+        trusted = self.notary.check_signature(without_references(nb))
+        if not trusted:
+            self.log.warning("Notebook %s is not trusted", path)
+        self.notary.mark_cells(nb, trusted)
+
+    async def _save_notebook(self, os_path, nb, capture_validation_error=None):
+        compact_notebook(nb, find_store(os_path))
+        return await super()._save_notebook(os_path, nb, capture_validation_error)
+
+    # ------------------------------------------------------------------
+    # Writes through the server invalidate immediately
+    # ------------------------------------------------------------------
+
+    async def save(self, model, path=""):
+        try:
+            return await super().save(model, path)
+        finally:
+            self._invalidate_parent(path)
+
+    async def delete_file(self, path):
+        try:
+            return await super().delete_file(path)
+        finally:
+            self.invalidate(self._get_os_path(path.strip("/")), tree=True)
+            self._invalidate_parent(path)
+
+    async def rename_file(self, old_path, new_path):
+        try:
+            return await super().rename_file(old_path, new_path)
+        finally:
+            self.invalidate(self._get_os_path(old_path.strip("/")), tree=True)
+            self._invalidate_parent(old_path)
+            self._invalidate_parent(new_path)
+
+
+def _timestamp(value: float) -> datetime:
+    try:
+        return datetime.fromtimestamp(value, timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        # Files can rarely have an invalid timestamp; match jupyter_server's fallback
+        return datetime(1970, 1, 1, tzinfo=timezone.utc)
@@ -0,0 +1,208 @@
+"""Warm kernel pool for Jupyter servers launched by `sp lab`.
+
+PooledKernelManager keeps `pool_size` kernels of the native kernelspec
+started (optionally with heavy modules already imported) and hands one out
+when a notebook asks for a new kernel, so the first cell runs immediately.
+The pool refills in the background, stops growing at `max_memory_mb`, and
+shuts down kernels that sat unused for `idle_timeout` seconds.
+
+Enabled from the CLI with:
+    --ServerApp.kernel_manager_class=sp_jupyter.kernel_pool.PooledKernelManager
+"""
+
+import asyncio
+import os
+import time
+import uuid
+
+from jupyter_server.services.kernels.kernelmanager import AsyncMappingKernelManager
+from tornado.ioloop import IOLoop, PeriodicCallback
+from traitlets import Integer, List, Unicode
+
+
+def process_rss_mb(pid: int) -> float:
+    """Resident memory of a process in MB (Linux /proc), or 0 if unknown."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class PooledKernelManager(AsyncMappingKernelManager):
+    """Mapping kernel manager that serves new kernels from a pre-started pool."""
+
+    pool_size = Integer(0, config=True, help="Number of ready kernels to keep (0 disables the pool).")
+
+    pool_kernel_name = Unicode("python3", config=True, help="Kernelspec used for pooled kernels.")
+
+    preload_modules = List(Unicode(), config=True, help="Modules imported into pooled kernels before hand-out.")
+
+    max_memory_mb = Integer(0, config=True, help="Stop filling once pooled kernels use this much RSS (0: no cap).")
+
+    idle_timeout = Integer(1800, config=True, help="Shut down pooled kernels unused for this many seconds (0: never).")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._pool = []  # ready kernel ids, oldest first
+        self._pooled_at = {}  # kernel id -> monotonic time it became ready
+        self._pool_starting = set()  # kernel ids being started for the pool
+        self._fill_task = None
+        self._reaper = None
+        if self.pool_size > 0:
+            IOLoop.current().add_callback(self._start_pool)
+
+    # ------------------------------------------------------------------
+    # Pool maintenance
+    # ------------------------------------------------------------------
+
+    def _start_pool(self):
+        self._schedule_fill()
+        if self.idle_timeout > 0 and self._reaper is None:
+            self._reaper = PeriodicCallback(self._reap_idle, min(self.idle_timeout, 60) * 1000)
+            self._reaper.start()
+
+    def _schedule_fill(self):
+        if self.pool_size <= 0 or (self._fill_task and not self._fill_task.done()):
+            return
+        self._fill_task = asyncio.ensure_future(self._fill_pool())
+
+    def _pool_memory_mb(self) -> float:
+        total = 0.0
+        for kernel_id in self._pool:
+            provisioner = getattr(self._kernels.get(kernel_id), "provisioner", None)
+            pid = getattr(provisioner, "pid", None)
+            if pid:
+                total += process_rss_mb(pid)
+        return total
+
+    def _under_memory_cap(self) -> bool:
+        if self.max_memory_mb <= 0 or not self._pool:
+            return True
+        used = self._pool_memory_mb()
+        per_kernel = used / len(self._pool)
+        return used + per_kernel <= self.max_memory_mb
+
+    async def _fill_pool(self):
+        while len(self._pool) + len(self._pool_starting) < self.pool_size and self._under_memory_cap():
+            kernel_id = str(uuid.uuid4())
+            self._pool_starting.add(kernel_id)
+            try:
+                await super().start_kernel(kernel_id=kernel_id, kernel_name=self.pool_kernel_name)
+                if self.preload_modules:
+                    await self._preload(kernel_id)
+            except Exception as e:
+                self.log.warning("SignalPilot kernel pool: failed to start kernel: %s", e)
+                self._pool_starting.discard(kernel_id)
+                if kernel_id in self:
+                    await super().shutdown_kernel(kernel_id, now=True)
+                return
+            self._pool_starting.discard(kernel_id)
+            if kernel_id in self:
+                self._pool.append(kernel_id)
+                self._pooled_at[kernel_id] = time.monotonic()
+                self.log.info("SignalPilot kernel pool: %d/%d ready", len(self._pool), self.pool_size)
+
+    async def _reap_idle(self):
+        now = time.monotonic()
+        for kernel_id in list(self._pool):
+            if now - self._pooled_at.get(kernel_id, now) > self.idle_timeout:
+                self._take(kernel_id)
+                self.log.info("SignalPilot kernel pool: reclaiming idle kernel %s", kernel_id)
+                await super().shutdown_kernel(kernel_id)
+
+    def _take(self, kernel_id: str):
+        self._pool.remove(kernel_id)
+        self._pooled_at.pop(kernel_id, None)
+
+    # ------------------------------------------------------------------
+    # Running code in pooled kernels
+    # ------------------------------------------------------------------
+
+    async def _run_silently(self, kernel_id: str, code: str):
+        client = self.get_kernel(kernel_id).client()
+        client.start_channels()
+        try:
+            await client.wait_for_ready(timeout=self.kernel_info_timeout)
+            await client.execute_interactive(
+                code,
+                silent=True,
+                store_history=False,
+                timeout=self.kernel_info_timeout,
+                output_hook=lambda msg: None,
+            )
+        finally:
+            client.stop_channels()
+
+    async def _preload(self, kernel_id: str):
+        code = (
+            "import importlib as _sp_importlib\n"
+            f"for _sp_module in {list(self.preload_modules)!r}:\n"
+            "    try:\n"
+            "        _sp_importlib.import_module(_sp_module)\n"
+            "    except Exception:\n"
+            "        pass\n"
+            "del _sp_importlib, _sp_module\n"
+        )
+        await self._run_silently(kernel_id, code)
+
+    async def _adopt(self, kernel_id: str, path, env):
+        """Point a pooled kernel at the session's directory and environment."""
+        cwd = self.cwd_for_path(path) if path is not None else self.root_dir
+        session_env = {key: value for key, value in (env or {}).items() if key.startswith("JPY_")}
+
+        # Restarts relaunch with these arguments, so record the real cwd/env
+        kernel = self.get_kernel(kernel_id)
+        launch_args = getattr(kernel, "_launch_args", None)
+        if isinstance(launch_args, dict):
+            launch_args["cwd"] = cwd
+        if session_env:
+            kernel.update_env(env=session_env)
+
+        await self._run_silently(
+            kernel_id,
+            "import os as _sp_os\n"
+            f"_sp_os.chdir({cwd!r})\n"
+            f"_sp_os.environ.update({session_env!r})\n"
+            "del _sp_os\n",
+        )
+
+    # ------------------------------------------------------------------
+    # MappingKernelManager API
+    # ------------------------------------------------------------------
+
+    async def start_kernel(self, *, kernel_id=None, path=None, **kwargs):
+        kernel_name = kwargs.get("kernel_name") or self.default_kernel_name
+        if kernel_id is None and kernel_name == self.pool_kernel_name and self._pool:
+            pooled_id = self._pool[0]
+            self._take(pooled_id)
+            try:
+                await self._adopt(pooled_id, path, kwargs.get("env"))
+            except Exception as e:
+                self.log.warning("SignalPilot kernel pool: could not adopt %s: %s", pooled_id, e)
+                await super().shutdown_kernel(pooled_id, now=True)
+            else:
+                self.log.info("SignalPilot kernel pool: handed out %s", pooled_id)
+                self._schedule_fill()
+                return pooled_id
+
+        kernel_id = await super().start_kernel(kernel_id=kernel_id, path=path, **kwargs)
+        self._schedule_fill()
+        return kernel_id
+
+    async def restart_kernel(self, kernel_id, now=False):
+        await super().restart_kernel(kernel_id, now=now)
+        if self.preload_modules and self.get_kernel(kernel_id).kernel_name == self.pool_kernel_name:
+            # Re-import in the background so the restart itself returns at once
+            asyncio.ensure_future(self._preload_quietly(kernel_id))
+
+    async def _preload_quietly(self, kernel_id: str):
+        try:
+            await self._preload(kernel_id)
+        except Exception as e:
+            self.log.debug("SignalPilot kernel pool: preload after restart failed: %s", e)
+
+    def list_kernels(self):
+        hidden = set(self._pool) | self._pool_starting
+        return [model for model in super().list_kernels() if model["id"] not in hidden]
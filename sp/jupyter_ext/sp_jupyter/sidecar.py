@@ -0,0 +1,147 @@
+"""Content-addressed sidecar storage for heavy notebook outputs.
+
+`sp nb compact` moves large output data (base64 images, big HTML tables)
+out of a notebook into `.signalpilot/outputs/<sha256>` files and leaves a
+reference in the output's metadata:
+
+    "metadata": {"signalpilot_sidecar": {"image/png": "<sha256>"}}
+
+The threshold is recorded in the notebook's metadata under the same key,
+so new outputs are compacted too when the server saves the notebook.
+The mime type is dropped from the output's data, so tools that don't know
+about sidecars still show the remaining representation (usually
+text/plain). CachingContentsManager restores the data when a notebook is
+opened and moves it out again when the notebook is saved. Notebooks are
+signed and trust-checked without the sidecar metadata (see
+without_references), so compacting never changes whether they are trusted.
+
+Shared by the CLI and the Jupyter server, so standard library only.
+"""
+
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+
+SIDECAR_DIR = Path(".signalpilot") / "outputs"
+METADATA_KEY = "signalpilot_sidecar"
+
+# Outputs that carry a mime bundle
+BUNDLE_OUTPUTS = ("display_data", "execute_result")
+
+
+def find_store(notebook_path: Path) -> Path:
+    """Sidecar directory for a notebook.
+
+    The nearest `.signalpilot/outputs` at or above the notebook's folder,
+    so one workspace shares one store; the notebook's own folder otherwise.
+    """
+    folder = Path(notebook_path).resolve().parent
+    for candidate in (folder, *folder.parents):
+        if (candidate / SIDECAR_DIR).is_dir():
+            return candidate / SIDECAR_DIR
+    return folder / SIDECAR_DIR
+
+
+def _write_sidecar(store: Path, payload: bytes) -> str:
+    digest = hashlib.sha256(payload).hexdigest()
+    path = store / digest
+    if not path.exists():
+        store.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    return digest
+
+
+def _outputs(nb: dict):
+    for cell in nb.get("cells", []):
+        for output in cell.get("outputs", []) if cell.get("cell_type") == "code" else []:
+            if output.get("output_type") in BUNDLE_OUTPUTS:
+                yield output
+
+
+def compact_notebook(nb: dict, store: Path, threshold: int = None) -> tuple[int, int]:
+    """Move heavy output data into sidecar files, in place.
+
+    Args:
+        nb: Notebook as a dict (nbformat 4)
+        store: Sidecar directory (see find_store)
+        threshold: Move data whose JSON encoding is at least this many bytes
+            (recorded in the notebook); None uses the recorded threshold, or
+            moves only data that already has sidecar references
+
+    Returns:
+        (number of data entries moved, bytes moved)
+    """
+    settings = nb.setdefault("metadata", {}).get(METADATA_KEY, {})
+    if threshold is None:
+        threshold = settings.get("threshold")
+    else:
+        nb["metadata"][METADATA_KEY] = {**settings, "threshold": threshold}
+
+    moved = size = 0
+    for output in _outputs(nb):
+        data = output.get("data", {})
+        refs = output.get("metadata", {}).get(METADATA_KEY, {})
+        for mime in list(data):
+            if threshold is None and mime not in refs:
+                continue
+            payload = json.dumps(data[mime]).encode()
+            if mime not in refs and len(payload) < threshold:
+                continue
+            refs[mime] = _write_sidecar(store, payload)
+            del data[mime]
+            moved += 1
+            size += len(payload)
+        if refs:
+            output.setdefault("metadata", {})[METADATA_KEY] = refs
+    return moved, size
+
+
+def restore_notebook(nb: dict, store: Path, keep_refs: bool = False) -> tuple[int, int]:
+    """Put sidecar data back into a notebook's outputs, in place.
+
+    Args:
+        nb: Notebook as a dict (nbformat 4)
+        store: Sidecar directory (see find_store)
+        keep_refs: Keep the references, so the next save compacts the same
+            outputs again (the server does this)
+
+    Returns:
+        (number of data entries restored, number of sidecars missing)
+    """
+    restored = missing = 0
+    for output in _outputs(nb):
+        refs = output.get("metadata", {}).get(METADATA_KEY)
+        if not refs:
+            continue
+        for mime, digest in list(refs.items()):
+            try:
+                output.setdefault("data", {})[mime] = json.loads((store / digest).read_bytes())
+            except (OSError, ValueError):
+                missing += 1
+                continue
+            restored += 1
+            if not keep_refs:
+                del refs[mime]
+        if not refs:
+            del output["metadata"][METADATA_KEY]
+    if not keep_refs and not missing:
+        nb.get("metadata", {}).pop(METADATA_KEY, None)
+    return restored, missing
+
+
+def without_references(nb: dict) -> dict:
+    """Copy of a notebook without sidecar metadata, as it was before compacting.
+
+    The form notebooks are signed and trust-checked in: output data is
+    the same whether or not it was compacted, but the references differ.
+    """
+    nb = copy.deepcopy(nb)
+    nb.get("metadata", {}).pop(METADATA_KEY, None)
+    for output in _outputs(nb):
+        metadata = output.get("metadata", {})
+        metadata.pop(METADATA_KEY, None)
+    return nb
@@ -1,12 +1,42 @@
 """SignalPilot CLI - Main entry point"""
 
+from importlib import import_module
+from pathlib import Path
+
 import typer
 
-from sp import __version__
-from sp.commands.init import init_command, run_init
-from sp.commands.lab import lab_command, home_command
-from sp.commands.upgrade import upgrade_command
-from sp.ui.console import console, LOGO
+# Command implementations are registered by name and imported only when the
+# command runs, so `sp version` or `sp --help` never pays for Rich trees,
+# urllib, threading or the upgrade checker.
+COMMAND_MODULES = {
+    "init": "sp.commands.init",
+    "lab": "sp.commands.lab",
+    "home": "sp.commands.lab",
+    "upgrade": "sp.commands.upgrade",
+    "rollback": "sp.commands.rollback",
+    "serve": "sp.commands.server",
+    "ps": "sp.commands.server",
+    "stop": "sp.commands.server",
+    "stats": "sp.commands.stats",
+    "warm": "sp.commands.warm",
+    "nb": "sp.commands.nb",
+    "wheelhouse": "sp.commands.wheelhouse",
+}
+
+
+def load_command(name: str, attr: str):
+    """Import the module registered for a command and return one of its attributes.
+
+    Args:
+        name: Command name (key of COMMAND_MODULES)
+        attr: Function name inside the command module
+
+    Returns:
+        The requested attribute (usually the command implementation)
+    """
+    module = import_module(COMMAND_MODULES[name])
+    return getattr(module, attr)
+
 
 app = typer.Typer(
     name="sp",
@@ -15,10 +45,19 @@ app = typer.Typer(
 )
 
 
+def _version_callback(value: bool):
+    if value:
+        version()
+        raise typer.Exit()
+
+
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
     dev: bool = typer.Option(False, "--dev", help="Use dev configuration (signalpilot-ai-internal)"),
+    show_version: bool = typer.Option(
+        False, "--version", help="Show SignalPilot CLI version and exit.", is_eager=True, callback=_version_callback
+    ),
 ):
     """SignalPilot CLI - Bootstrap your data analysis workspace.
 
@@ -29,7 +68,7 @@ def main(
         return
 
     # Run init by default
-    run_init(dev=dev)
+    load_command("init", "run_init")(dev=dev)
 
 
 @app.command()
@@ -37,7 +76,7 @@ def init(
     dev: bool = typer.Option(False, "--dev", help="Use dev configuration (signalpilot-ai-internal)"),
 ):
     """Initialize SignalPilot workspace at ~/SignalPilotHome"""
-    init_command(dev=dev)
+    load_command("init", "init_command")(dev=dev)
 
 
 @app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
@@ -45,31 +84,137 @@ def lab(
     ctx: typer.Context,
     home: bool = typer.Option(False, "--home", help="Use SignalPilotHome workspace + venv"),
     project: bool = typer.Option(False, "--project", help="Use current folder + local .venv (fail if missing)"),
+    exec_mode: bool = typer.Option(
+        None, "--exec/--no-exec", help="Replace sp with the Jupyter process (default: lab.exec in config.toml)"
+    ),
+    daemon: bool = typer.Option(False, "--daemon", help="Use (or start) the resident server for this venv"),
+    timings: bool = typer.Option(False, "--timings", help="Record a startup timeline (see 'sp stats')"),
+    profile: str = typer.Option(
+        None, "--profile", help="Extension profile: full or minimal (default: lab.profile in config.toml)"
+    ),
+    explain: bool = typer.Option(False, "--explain", help="Show each extension's startup cost and exit"),
 ):
     """Start Jupyter Lab (default: current folder + home .venv)"""
-    lab_command(ctx, home=home, project=project)
+    load_command("lab", "lab_command")(
+        ctx, home=home, project=project, exec_mode=exec_mode, daemon=daemon, timings=timings,
+        profile=profile, explain=explain
+    )
 
 
 @app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
-def home(ctx: typer.Context):
+def home(
+    ctx: typer.Context,
+    exec_mode: bool = typer.Option(
+        None, "--exec/--no-exec", help="Replace sp with the Jupyter process (default: lab.exec in config.toml)"
+    ),
+):
     """Start Jupyter Lab in SignalPilotHome (shortcut for 'lab --home')"""
-    home_command(ctx)
+    load_command("home", "home_command")(ctx, exec_mode=exec_mode)
 
 
 @app.command()
 def upgrade(
     project: bool = typer.Option(False, "--project", help="Upgrade project .venv instead of home"),
+    plan_only: bool = typer.Option(False, "--plan", help="Show and save the upgrade plan without applying it"),
+    all_packages: bool = typer.Option(False, "--all-packages", help="Also upgrade the core packages and their dependencies"),
+    all_venvs: bool = typer.Option(False, "--all", help="Upgrade the home venv and every known project venv"),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Venvs to upgrade at once with --all"),
+    apply_staged: bool = typer.Option(False, "--apply", help="Swap in the upgrade staged in the background"),
 ):
     """Upgrade SignalPilot CLI and library"""
-    upgrade_command(project=project)
+    load_command("upgrade", "upgrade_command")(
+        project=project, plan_only=plan_only, all_packages=all_packages, all_venvs=all_venvs, jobs=jobs,
+        apply_staged=apply_staged,
+    )
+
+
+@app.command()
+def rollback(
+    project: bool = typer.Option(False, "--project", help="Roll back the current folder's .venv instead of home"),
+    steps: int = typer.Option(1, "--steps", "-n", min=1, help="Go back this many snapshots"),
+    list_only: bool = typer.Option(False, "--list", help="List snapshots instead of restoring one"),
+):
+    """Restore a venv from the snapshot taken before an upgrade"""
+    load_command("rollback", "rollback_command")(project=project, steps=steps, list_only=list_only)
+
+
+@app.command()
+def serve(
+    project: bool = typer.Option(False, "--project", help="Serve the current folder's .venv instead of home"),
+):
+    """Start the resident Jupyter server for a venv (reused by 'sp lab')"""
+    load_command("serve", "serve_command")(project=project)
+
+
+@app.command()
+def ps():
+    """List resident Jupyter servers"""
+    load_command("ps", "ps_command")()
+
+
+@app.command()
+def stop(
+    project: bool = typer.Option(False, "--project", help="Stop the current folder's .venv server instead of home"),
+    all_servers: bool = typer.Option(False, "--all", help="Stop every resident server"),
+):
+    """Stop a resident Jupyter server"""
+    load_command("stop", "stop_command")(project=project, all_servers=all_servers)
+
+
+@app.command()
+def warm(
+    project: bool = typer.Option(False, "--project", help="Warm the current folder's .venv instead of home"),
+):
+    """Rebuild Jupyter startup caches for a venv"""
+    load_command("warm", "warm_command")(project=project)
+
+
+@app.command()
+def stats(
+    last: int = typer.Option(50, "--last", help="Number of recent runs to summarize"),
+):
+    """Summarize startup timings recorded by 'sp lab --timings'"""
+    load_command("stats", "stats_command")(last=last)
 
 
 @app.command()
 def version():
     """Show SignalPilot CLI version"""
+    from sp import __version__
+    from sp.ui.console import console, LOGO
+
     console.print(LOGO, style="cyan")
     console.print(f"\n          SignalPilot Installer CLI v{__version__}\n", style="bold white")
 
 
+nb_app = typer.Typer(help="Manage notebook outputs", no_args_is_help=True)
+app.add_typer(nb_app, name="nb")
+
+
+@nb_app.command("compact")
+def nb_compact(
+    paths: list[Path] = typer.Argument(..., help="Notebooks or folders to compact"),
+    threshold: int = typer.Option(32, "--threshold", help="Move outputs of at least this many KB"),
+    restore: bool = typer.Option(False, "--restore", help="Put sidecar outputs back inline"),
+):
+    """Move heavy notebook outputs into sidecar files"""
+    load_command("nb", "compact_command")(paths, threshold=threshold, restore=restore)
+
+
+wheelhouse_app = typer.Typer(help="Manage a local wheelhouse of workspace packages", no_args_is_help=True)
+app.add_typer(wheelhouse_app, name="wheelhouse")
+
+
+@wheelhouse_app.command("build")
+def wheelhouse_build(
+    directory: Path = typer.Option(
+        None, "--dir", help="Wheelhouse directory (default: index.wheelhouse in config.toml, or ~/SignalPilotHome/wheelhouse)"
+    ),
+    dev: bool = typer.Option(False, "--dev", help="Include signalpilot-ai-internal instead of signalpilot-ai"),
+):
+    """Download wheels for the workspace packages into a wheelhouse"""
+    load_command("wheelhouse", "build_command")(directory=directory, dev=dev)
+
+
 if __name__ == "__main__":
     app()
@@ -1,81 +1,65 @@
 """Mock utilities for testing upgrade system without network calls"""
 
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from contextlib import contextmanager
 
 
-# Mock PyPI JSON responses
+# Versions published on the mock index, per package
 MOCK_PYPI_RESPONSES = {
-    "signalpilot": {
-        "0.5.3": {
-            "info": {"version": "0.5.3"},
-        },
-        "0.5.4": {
-            "info": {"version": "0.5.4"},
-        },
-        "0.6.0": {
-            "info": {"version": "0.6.0"},
-        },
-    },
-    "signalpilot-ai": {
-        "0.11.2": {
-            "info": {"version": "0.11.2"},
-        },
-        "0.11.3": {
-            "info": {"version": "0.11.3"},
-        },
-        "0.12.0": {
-            "info": {"version": "0.12.0"},
-        },
-        "1.0.0": {
-            "info": {"version": "1.0.0"},
-        },
-    },
-    "signalpilot-ai-internal": {
-        "0.11.7": {
-            "info": {"version": "0.11.7"},
-        },
-        "0.11.8": {
-            "info": {"version": "0.11.8"},
-        },
-        "0.12.0": {
-            "info": {"version": "0.12.0"},
-        },
-        "1.0.0": {
-            "info": {"version": "1.0.0"},
-        },
-    },
+    "signalpilot": ["0.5.3", "0.5.4", "0.6.0"],
+    "signalpilot-ai": ["0.11.2", "0.11.3", "0.12.0", "1.0.0"],
+    "signalpilot-ai-internal": ["0.11.7", "0.11.8", "0.12.0", "1.0.0"],
 }
 
 
-def mock_urlopen(url, timeout=None):
-    """Mock urllib.request.urlopen for PyPI API calls"""
-    # Extract package name from URL
-    # URL format: https://pypi.org/pypi/{package_name}/json
-    if "/pypi/" not in url:
-        raise ValueError(f"Invalid PyPI URL: {url}")
+def simple_index(package_name: str, versions: list[str]) -> dict:
+    """Build a PEP 691 JSON project page listing a wheel per version."""
+    normalized = package_name.replace("-", "_")
+    return {
+        "meta": {"api-version": "1.1"},
+        "name": package_name,
+        "versions": list(versions),
+        "files": [
+            {"filename": f"{normalized}-{version}-py3-none-any.whl", "yanked": False, "size": 2_500_000}
+            for version in versions
+        ],
+    }
+
+
+def make_fetch(responses: dict):
+    """Build a sp.core.http.fetch replacement serving the JSON Simple API from a versions dict.
+
+    Responses carry an ETag; a request with a matching If-None-Match gets a 304.
+    """
+
+    def mock_fetch(url, headers=None, timeout=None):
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
 
-    package_name = url.split("/pypi/")[1].replace("/json", "")
+        # URL format: https://pypi.org/simple/{package_name}/
+        if "/simple/" not in url:
+            raise ValueError(f"Invalid PyPI URL: {url}")
+        package_name = url.split("/simple/")[1].strip("/")
 
-    # Get mock response for package
-    if package_name not in MOCK_PYPI_RESPONSES:
-        # Simulate 404 for unknown packages (like signalpilot-ai-internal on public PyPI)
-        from urllib.error import HTTPError
-        raise HTTPError(url, 404, "Not Found", {}, None)
+        if package_name not in responses:
+            # Simulate 404 for unknown packages (like signalpilot-ai-internal on public PyPI)
+            return {"status": 404, "headers": {}, "body": b""}
 
-    # Get latest version for package
-    versions = MOCK_PYPI_RESPONSES[package_name]
-    latest_version = max(versions.keys())
-    response_data = versions[latest_version]
+        versions = responses[package_name]
+        etag = f'"{package_name}-{len(versions)}-{versions[-1]}"'
+        if headers.get("if-none-match") == etag:
+            return {"status": 304, "headers": {"etag": etag}, "body": b""}
 
-    # Create mock response object
-    mock_response = Mock()
-    mock_response.read.return_value = json.dumps(response_data).encode('utf-8')
-    mock_response.__enter__ = Mock(return_value=mock_response)
-    mock_response.__exit__ = Mock(return_value=False)
+        return {
+            "status": 200,
+            "headers": {"content-type": "application/vnd.pypi.simple.v1+json", "etag": etag},
+            "body": json.dumps(simple_index(package_name, versions)).encode("utf-8"),
+        }
 
-    return mock_response
+    return mock_fetch
+
+
+mock_fetch = make_fetch(MOCK_PYPI_RESPONSES)
 
 
 @contextmanager
@@ -83,7 +67,8 @@ def mock_pypi_responses(package_versions: dict = None):
     """Context manager to mock PyPI responses.
 
     Args:
-        package_versions: Optional dict to override versions
+        package_versions: Optional dict making a version the latest release
+            of a package inside the context
             Example: {"signalpilot": "0.5.4", "signalpilot-ai-internal": "0.11.8"}
 
     Usage:
@@ -91,17 +76,18 @@ def mock_pypi_responses(package_versions: dict = None):
             version = get_pypi_version("signalpilot")
             # Returns "0.5.4" without network call
     """
-    # Update mock responses if custom versions provided
-    if package_versions:
-        for package, version in package_versions.items():
-            if package not in MOCK_PYPI_RESPONSES:
-                MOCK_PYPI_RESPONSES[package] = {}
-            MOCK_PYPI_RESPONSES[package][version] = {
-                "info": {"version": version}
-            }
-
-    # Patch urllib.request.urlopen
-    with patch('urllib.request.urlopen', side_effect=mock_urlopen):
+    from sp.upgrade_check import release_key
+
+    responses = {package: list(versions) for package, versions in MOCK_PYPI_RESPONSES.items()}
+    for package, version in (package_versions or {}).items():
+        # Publish releases up to the requested one, which becomes the latest
+        earlier = [v for v in responses.get(package, []) if release_key(v) < release_key(version)]
+        responses[package] = earlier + [version]
+
+    # Patch the HTTP layer; no validators so every call hits the mock index
+    with patch('sp.core.http.fetch', side_effect=make_fetch(responses)), \
+            patch('sp.upgrade_check.load_cache', return_value={}), \
+            patch('sp.upgrade_check.save_cache'):
         yield
 
 
@@ -114,25 +100,22 @@ def mock_network_failure():
             version = get_pypi_version("signalpilot")
             # Returns None (network timeout)
     """
-    from urllib.error import URLError
-
-    def failing_urlopen(*args, **kwargs):
-        raise URLError("Network unreachable")
+    def failing_fetch(*args, **kwargs):
+        raise OSError("Network unreachable")
 
-    with patch('urllib.request.urlopen', side_effect=failing_urlopen):
+    with patch('sp.core.http.fetch', side_effect=failing_fetch), \
+            patch('sp.upgrade_check.load_cache', return_value={}), \
+            patch('sp.upgrade_check.save_cache'):
         yield
 
 
 def set_mock_version(package_name: str, version: str):
-    """Set a specific version for a package in mock responses.
+    """Publish a version of a package on the mock index.
 
     Args:
         package_name: Package name (e.g., "signalpilot")
         version: Version string (e.g., "0.5.4")
     """
-    if package_name not in MOCK_PYPI_RESPONSES:
-        MOCK_PYPI_RESPONSES[package_name] = {}
-
-    MOCK_PYPI_RESPONSES[package_name][version] = {
-        "info": {"version": version}
-    }
+    versions = MOCK_PYPI_RESPONSES.setdefault(package_name, [])
+    if version not in versions:
+        versions.append(version)
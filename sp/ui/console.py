@@ -1,13 +1,135 @@
-"""Rich console instance for SignalPilot CLI"""
+"""Console for SignalPilot CLI.
+
+`console` is a lazy proxy: Rich is imported only when the first styled
+output happens on a terminal. When stdout is not a TTY (pipes, container
+logs) or SP_OUTPUT=plain is set, a plain-text writer strips markup instead.
+SP_OUTPUT=rich forces Rich output.
+"""
+
+import os
+import re
+import sys
+
+from sp.ui.logo import LOGO  # noqa: F401 - re-exported for callers
+
+# Same tag pattern Rich's markup parser uses, e.g. [bold red] or [/bold red]
+_MARKUP_TAG = re.compile(r"(\\*)\[([a-z#/@][^[]*?)]")
+
+
+def use_plain_output() -> bool:
+    """Decide whether output should bypass Rich.
+
+    Returns:
+        True for SP_OUTPUT=plain, or when stdout is not a terminal
+        (unless SP_OUTPUT=rich or FORCE_COLOR is set)
+    """
+    mode = os.environ.get("SP_OUTPUT", "auto").lower()
+    if mode == "plain":
+        return True
+    if mode == "rich" or os.environ.get("FORCE_COLOR"):
+        return False
+    try:
+        return not sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return True
+
+
+def strip_markup(text: str) -> str:
+    """Remove Rich markup tags, keeping escaped brackets as literal text."""
+    def replace(match: re.Match) -> str:
+        backslashes, tag = match.groups()
+        if len(backslashes) % 2:
+            # Escaped tag: drop the escaping backslash, keep the brackets
+            return backslashes[:-1] + f"[{tag}]"
+        return backslashes
+    return _MARKUP_TAG.sub(replace, text)
+
+
+class PlainConsole:
+    """Minimal stand-in for rich.console.Console that writes plain text."""
+
+    def print(self, *objects, sep: str = " ", end: str = "\n", markup: bool = True, **kwargs):
+        """Print objects without styling. Rich-only keyword arguments are ignored."""
+        text = sep.join(str(obj) for obj in objects)
+        if markup:
+            text = strip_markup(text)
+        sys.stdout.write(text + end)
+        sys.stdout.flush()
+
+
+class LazyConsole:
+    """Proxy that routes output to PlainConsole or a Rich Console created on first use."""
+
+    def __init__(self):
+        self._rich_console = None
+        self._plain_console = PlainConsole()
+
+    @property
+    def rich(self):
+        """The underlying rich.console.Console (imports Rich on first access)."""
+        if self._rich_console is None:
+            from rich.console import Console
+
+            self._rich_console = Console()
+        return self._rich_console
+
+    @property
+    def is_plain(self) -> bool:
+        return use_plain_output()
+
+    def print(self, *objects, **kwargs):
+        # Rich renderables (tables, panels, ...) always go through Rich
+        if self.is_plain and all(isinstance(obj, str) for obj in objects):
+            self._plain_console.print(*objects, **kwargs)
+        else:
+            self.rich.print(*objects, **kwargs)
+
+    def __getattr__(self, name):
+        # Anything beyond print (status, input, size, ...) needs real Rich
+        return getattr(self.rich, name)
 
-from rich.console import Console
 
 # Single console instance used throughout the application
-console = Console()
-
-# Brand logo
-LOGO = """   ┌───┐
-   │ ↗ │  ╔═╗┬┌─┐┌┐┌┌─┐┬  ╔═╗┬┬  ┌─┐┌┬┐
-   │▓▓▓│  ╚═╗││ ┬│││├─┤│  ╠═╝││  │ │ │
-   │▓░░│  ╚═╝┴└─┘┘└┘┴ ┴┴─┘╩  ┴┴─┘└─┘ ┴
-   └───┘  Your Trusted CoPilot for Data Analysis"""
+console = LazyConsole()
+
+
+def print_panel(body: str, title: str = "", border_style: str = ""):
+    """Print a boxed panel (Rich) or a titled block (plain).
+
+    Args:
+        body: Panel content, may contain Rich markup
+        title: Panel title
+        border_style: Rich style for the border
+    """
+    if console.is_plain:
+        console.print(f"--- {title} ---" if title else "---")
+        console.print(body)
+        console.print("---")
+        return
+
+    from rich.panel import Panel
+
+    console.print(Panel(body, title=title or None, border_style=border_style or "none"))
+
+
+def print_tree(label: str, children: list[str], guide_style: str = "dim"):
+    """Print a one-level tree (Rich) or a text tree (plain).
+
+    Args:
+        label: Root label, may contain Rich markup
+        children: Child labels, may contain Rich markup
+        guide_style: Rich style for the tree guides
+    """
+    if console.is_plain:
+        console.print(label)
+        for index, child in enumerate(children):
+            branch = "└── " if index == len(children) - 1 else "├── "
+            console.print(branch + child)
+        return
+
+    from rich.tree import Tree
+
+    tree = Tree(label, guide_style=guide_style)
+    for child in children:
+        tree.add(child)
+    console.print(tree)
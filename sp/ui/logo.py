@@ -0,0 +1,8 @@
+"""SignalPilot brand logo (plain text, no dependencies)"""
+
+# Brand logo
+LOGO = """   ┌───┐
+   │ ↗ │  ╔═╗┬┌─┐┌┐┌┌─┐┬  ╔═╗┬┬  ┌─┐┌┬┐
+   │▓▓▓│  ╚═╗││ ┬│││├─┤│  ╠═╝││  │ │ │
+   │▓░░│  ╚═╝┴└─┘┘└┘┴ ┴┴─┘╩  ┴┴─┘└─┘ ┴
+   └───┘  Your Trusted CoPilot for Data Analysis"""
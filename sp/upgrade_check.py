@@ -1,19 +1,16 @@
 """Version checking, caching, and upgrade notifications for SignalPilot CLI"""
 
 import json
+import os
 import re
+import sys
 import threading
 import time
-import urllib.request
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from rich.live import Live
-from rich.panel import Panel
-from rich.prompt import Confirm
-
 from sp.core.config import SP_CACHE_FILE, SIGNALPILOT_CLI, SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL, get_cache_dir
-from sp.ui.console import console
+from sp.ui.console import console, print_panel
 
 
 # ============================================================================
@@ -71,12 +68,209 @@ def compare_versions(current: str, latest: str) -> str:
 # PyPI Integration
 # ============================================================================
 
-def get_pypi_version(package_name: str, timeout: float = 3.0) -> str | None:
-    """Fetch latest version from PyPI JSON API.
+# PEP 691 JSON Simple API: one small document per project, served with
+# ETag/Last-Modified so an unchanged index costs a 304. The index is
+# configurable (see sp.core.index)
+SIMPLE_JSON_TYPE = "application/vnd.pypi.simple.v1+json"
+
+# Final releases and post-releases only (no a/b/rc/dev)
+_RELEASE_RE = re.compile(r'^v?(\d+(?:\.\d+)*)(?:[.-]?post(\d+))?$', re.IGNORECASE)
+
+
+def release_key(version_str: str) -> tuple | None:
+    """Sort key for a final release version, or None for pre-releases and dev builds.
+
+    Examples:
+        "0.11.2" -> ((0, 11, 2), 0)
+        "1.0.post1" -> ((1, 0, 0), 1)
+        "0.12.0rc1" -> None
+    """
+    match = _RELEASE_RE.match(version_str.strip())
+    if not match:
+        return None
+    release = tuple(int(part) for part in match.group(1).split('.'))
+    return release + (0,) * (3 - len(release)), int(match.group(2) or 0)
+
+
+def _file_version(filename: str) -> str | None:
+    """Version part of a wheel or sdist filename."""
+    if filename.endswith('.whl'):
+        parts = filename.split('-')
+        return parts[1] if len(parts) >= 5 else None
+    for ext in ('.tar.gz', '.zip', '.tar.bz2'):
+        if filename.endswith(ext):
+            return filename[:-len(ext)].rpartition('-')[2] or None
+    return None
+
+
+_ANCHOR_RE = re.compile(r'<a\s([^>]*)>([^<]+)</a>', re.IGNORECASE)
+
+
+def parse_simple_html(text: str) -> dict:
+    """Convert a PEP 503 HTML project page into the PEP 691 JSON shape.
+
+    Indexes and mirrors that don't implement the JSON API ignore the
+    Accept header and answer with HTML.
+    """
+    files = []
+    for attributes, filename in _ANCHOR_RE.findall(text):
+        files.append({'filename': filename.strip(), 'yanked': 'data-yanked' in attributes})
+    return {'files': files}
+
+
+def latest_release(index: dict) -> str | None:
+    """Pick the newest final, non-yanked release from a PEP 691 project page.
+
+    Args:
+        index: Parsed JSON project page ('versions' and 'files')
+
+    Returns:
+        Version string, or None if the project has no final release
+    """
+    files_by_version = {}
+    for file in index.get('files', []):
+        version = _file_version(file.get('filename', ''))
+        if version:
+            files_by_version.setdefault(version, []).append(bool(file.get('yanked')))
+
+    versions = index.get('versions') or list(files_by_version)
+    candidates = []
+    for version in versions:
+        key = release_key(version)
+        yanked = files_by_version.get(version)
+        if key is not None and not (yanked and all(yanked)):
+            candidates.append((key, version))
+    return max(candidates)[1] if candidates else None
+
+
+def _index_headers(entry: dict, index_url: str) -> dict:
+    """Request headers for a project page, with the validators cached for that index."""
+    from sp.core.index import PYPI_SIMPLE_URL
+
+    headers = {'Accept': SIMPLE_JSON_TYPE, 'Accept-Encoding': 'gzip'}
+    if entry.get('latest_version') and entry.get('index', PYPI_SIMPLE_URL) == index_url:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def parse_index_response(response: dict | None) -> dict | None:
+    """PEP 691 shaped project page from a 200 response (JSON or HTML), else None."""
+    if response is None or response['status'] != 200:
+        return None
+    try:
+        if response['headers'].get('content-type', '').startswith(('application/vnd.pypi.simple', 'application/json')):
+            return json.loads(response['body'])
+        return parse_simple_html(response['body'].decode('utf-8', 'replace'))
+    except ValueError:
+        return None
+
+
+def _read_index_response(response: dict | None, package_name: str, index_url: str, cache: dict) -> str | None:
+    """Latest version from a project page response; stores its validators in cache."""
+    if response is None:
+        return None
+    entry = cache.get(package_name, {})
+    if response['status'] == 304:
+        # Index unchanged since the last check
+        return entry.get('latest_version')
+
+    # 404: package not found (expected for signalpilot-ai-internal)
+    index = parse_index_response(response)
+    if index is None:
+        return None
+
+    latest = latest_release(index)
+    if latest:
+        headers = response['headers']
+        entry = cache.setdefault(package_name, {})
+        entry['latest_version'] = latest
+        entry['index'] = index_url
+        for key, header in (('etag', 'etag'), ('last_modified', 'last-modified')):
+            if headers.get(header):
+                entry[key] = headers[header]
+            else:
+                entry.pop(key, None)
+    return latest
+
+
+def _newest(*versions: str | None) -> str | None:
+    candidates = [(release_key(v), v) for v in versions if v and release_key(v) is not None]
+    return max(candidates)[1] if candidates else None
+
+
+def get_pypi_versions(package_names: list[str], timeout: float = 5.0, cache: dict = None) -> dict:
+    """Fetch the latest versions of several packages from the package index.
+
+    Looks in the index configured in config.toml (PyPI by default; see
+    sp.core.index): local wheelhouses and file:// mirrors are read from
+    disk, and remote lookups run in parallel over pooled keep-alive
+    connections (see sp.core.http) under one overall deadline. Each
+    remote lookup sends the ETag/Last-Modified validators stored in the
+    upgrade cache, so an unchanged index answers 304 with no body;
+    responses are gzip'ed.
+
+    Args:
+        package_names: Package names
+        timeout: Deadline in seconds for all lookups together
+        cache: Upgrade cache dict to read validators from and store them in
+            (left unsaved); None loads and saves upgrade-cache.json
+
+    Returns:
+        Dict of package name to latest version, or None if not found/error
+        (404 is expected for signalpilot-ai-internal on PyPI)
+    """
+    from sp.core import http
+    from sp.core.config import get_index_config
+    from sp.core.index import package_sources, project_url, read_file_index, wheelhouse_index
+
+    own_cache = cache is None
+    if own_cache:
+        cache = load_cache()
+
+    settings = get_index_config()
+    versions = {}
+    remote = []
+    for package_name in dict.fromkeys(package_names):
+        sources = package_sources(package_name, settings)
+        local = []
+        if sources['wheelhouse']:
+            local.append(latest_release(wheelhouse_index(sources['wheelhouse'], package_name)))
+        index_url = sources['url']
+        if index_url and index_url.startswith('file:'):
+            local.append(latest_release(read_file_index(index_url, package_name) or {}))
+        elif index_url:
+            remote.append((package_name, index_url))
+        versions[package_name] = _newest(*local)
+
+    responses = http.fetch_many(
+        [
+            (project_url(index_url, package_name), _index_headers(cache.get(package_name, {}), index_url))
+            for package_name, index_url in remote
+        ],
+        timeout=timeout,
+    )
+    fetched = False
+    for (package_name, index_url), response in zip(remote, responses):
+        latest = _read_index_response(response, package_name, index_url, cache)
+        fetched = fetched or bool(latest)
+        versions[package_name] = _newest(versions[package_name], latest)
+
+    if own_cache and fetched:
+        save_cache(cache)
+    return versions
+
+
+def get_pypi_version(package_name: str, timeout: float = 3.0, cache: dict = None) -> str | None:
+    """Fetch the latest version of one package (see get_pypi_versions).
 
     Args:
         package_name: Package name on PyPI
         timeout: Network timeout in seconds
+        cache: Upgrade cache dict to read validators from and store them in
+            (left unsaved); None loads and saves upgrade-cache.json
 
     Returns:
         Latest version string, or None if not found/error
@@ -84,67 +278,98 @@ def get_pypi_version(package_name: str, timeout: float = 3.0) -> str | None:
     Note:
         Returns None for 404 (expected for signalpilot-ai-internal)
     """
-    url = f"https://pypi.org/pypi/{package_name}/json"
-
-    try:
-        with urllib.request.urlopen(url, timeout=timeout) as response:
-            data = json.loads(response.read())
-            return data['info']['version']
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            # Package not found (expected for signalpilot-ai-internal)
-            return None
-        return None
-    except (urllib.error.URLError, json.JSONDecodeError, KeyError, TimeoutError):
-        return None
+    return get_pypi_versions([package_name], timeout=timeout, cache=cache)[package_name]
 
 
 # ============================================================================
 # Cache Management
 # ============================================================================
 
+# The cache holds one entry per package for what the index says (latest
+# version, validators, last check) and, under VENVS_KEY, one entry per venv
+# for what is installed there, so sessions in different venvs don't
+# overwrite each other's installed versions:
+#
+#     {"signalpilot-ai": {"latest_version": "0.12.0", "etag": ..., "last_check_time": ...},
+#      "venvs": {"<venv key>": {"path": ..., "package": "signalpilot-ai", "current_version": "0.11.2"}}}
+VENVS_KEY = 'venvs'
+
+
 def load_cache() -> dict:
     """Load upgrade cache from SignalPilotHome/.signalpilot/upgrade-cache.json.
 
+    Lock-free: the file is only ever replaced whole (see save_cache).
+
     Returns:
-        Cache dict, or empty dict if missing/expired/corrupted
+        Cache dict, or empty dict if missing/corrupted
     """
-    if not SP_CACHE_FILE.exists():
-        return {}
-
     try:
         with open(SP_CACHE_FILE, 'r') as f:
             cache = json.load(f)
-        return cache
-    except (json.JSONDecodeError, IOError):
-        # Corrupted cache, delete it
-        try:
-            SP_CACHE_FILE.unlink()
-        except Exception:
-            pass
+    except (json.JSONDecodeError, OSError):
+        # Missing, or corrupted by an older version; the next save replaces it
         return {}
+    return cache if isinstance(cache, dict) else {}
 
 
 def save_cache(cache_data: dict):
     """Save cache to SignalPilotHome/.signalpilot/upgrade-cache.json.
 
+    Under the cache lock, merges into what is on disk (package entries
+    replace the stored ones, venv entries are merged per venv) and
+    writes with an atomic rename, so concurrent sp processes neither lose
+    each other's updates nor leave a torn file.
+
     Args:
         cache_data: Dict to save as JSON
 
     Note:
         Failures are silent (no exceptions raised)
     """
+    from sp.core.fileutil import atomic_write_json, file_lock
+
     try:
         # Ensure directory exists
         get_cache_dir()
 
-        with open(SP_CACHE_FILE, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        with file_lock(SP_CACHE_FILE):
+            merged = load_cache()
+            for key, value in cache_data.items():
+                if key == VENVS_KEY and isinstance(merged.get(key), dict):
+                    merged[key].update(value)
+                else:
+                    merged[key] = value
+            atomic_write_json(SP_CACHE_FILE, merged)
     except Exception:
         # Silent failure - don't block on cache write errors
         pass
 
 
+def cache_key(venv_dir: Path) -> str:
+    """Key of a venv's entry in the upgrade cache."""
+    from sp.core.environment import venv_key
+
+    return venv_key(venv_dir)
+
+
+def record_installed_version(cache: dict, venv_dir: Path, package_name: str, version: str, when: str = None):
+    """Record the library version installed in a venv, in place.
+
+    Args:
+        cache: Upgrade cache dict
+        venv_dir: Path to virtual environment
+        package_name: Installed signalpilot package
+        version: Its installed version
+        when: ISO timestamp of the check (default now)
+    """
+    cache.setdefault(VENVS_KEY, {})[cache_key(venv_dir)] = {
+        'path': str(venv_dir),
+        'package': package_name,
+        'current_version': version,
+        'last_check_time': when or datetime.now(timezone.utc).isoformat(),
+    }
+
+
 def is_cache_valid(cache_data: dict, package_key: str) -> bool:
     """Check if cache entry is valid (< 12 hours old).
 
@@ -165,7 +390,7 @@ def is_cache_valid(cache_data: dict, package_key: str) -> bool:
     try:
         last_check_time = datetime.fromisoformat(last_check.replace('Z', '+00:00'))
         age = datetime.now(timezone.utc) - last_check_time
-        return age < timedelta(hours=12)
+        return age < REFRESH_TTL
     except (ValueError, AttributeError):
         return False
 
@@ -175,9 +400,10 @@ def is_cache_valid(cache_data: dict, package_key: str) -> bool:
 # ============================================================================
 
 def get_installed_version(venv_dir: Path, package_name: str) -> str | None:
-    """Get installed version of package using importlib.metadata.
+    """Get installed version of package from its dist-info in the venv.
 
-    Much faster than pip show since it doesn't spawn a subprocess.
+    Much faster than pip show since it doesn't spawn a subprocess; read
+    from the venv inventory (see sp.core.environment.venv_inventory).
 
     Args:
         venv_dir: Path to virtual environment
@@ -186,29 +412,9 @@ def get_installed_version(venv_dir: Path, package_name: str) -> str | None:
     Returns:
         Version string, or None if not installed
     """
-    import sys
-    from importlib.metadata import version, PackageNotFoundError
+    from sp.core.environment import installed_version
 
-    # Find site-packages directory
-    lib_dir = venv_dir / "lib"
-    site_packages_dirs = list(lib_dir.glob("python*/site-packages"))
-
-    if not site_packages_dirs:
-        return None
-
-    site_packages = str(site_packages_dirs[0])
-
-    # Temporarily add venv's site-packages to path
-    original_path = sys.path.copy()
-    sys.path.insert(0, site_packages)
-
-    try:
-        return version(package_name)
-    except PackageNotFoundError:
-        return None
-    finally:
-        # Restore original path
-        sys.path = original_path
+    return installed_version(venv_dir, package_name)
 
 
 def detect_signalpilot_package(venv_dir: Path) -> tuple[str, str] | None:
@@ -252,18 +458,161 @@ def get_cli_version() -> str | None:
 # Background Check
 # ============================================================================
 
-def check_versions_background(venv_dir: Path, result_container: list):
+# Refresh scheduling: a successful lookup is trusted for REFRESH_TTL; a
+# failed one (timeout, DNS, 404) is retried after an exponential backoff.
+# Both are spread by +/-JITTER so a fleet restarting together doesn't hit
+# the index at the same moment.
+REFRESH_TTL = timedelta(hours=12)
+BACKOFF_BASE = timedelta(minutes=5)
+BACKOFF_MAX = timedelta(hours=24)
+JITTER = 0.2
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def next_refresh_time(entry: dict) -> datetime | None:
+    """When a package's cache entry is due for a network refresh (None: now)."""
+    scheduled = _parse_time(entry.get('next_check_time'))
+    if scheduled:
+        return scheduled
+    last_check = _parse_time(entry.get('last_check_time'))
+    return last_check + REFRESH_TTL if last_check else None
+
+
+def record_refresh(entry: dict, ok: bool, now: datetime):
+    """Schedule a package's next refresh after a lookup, in place.
+
+    Success resets the failure count and waits REFRESH_TTL, shortened by
+    up to JITTER so the entry is refreshed before is_cache_valid expires
+    it; failure waits BACKOFF_BASE * 2^(failures - 1), capped at
+    BACKOFF_MAX, spread by +/-JITTER.
+    """
+    import random
+
+    if ok:
+        entry['last_check_time'] = now.isoformat()
+        entry.pop('failures', None)
+        delay = REFRESH_TTL * random.uniform(1 - JITTER, 1)
+    else:
+        entry['failures'] = entry.get('failures', 0) + 1
+        entry['last_failure_time'] = now.isoformat()
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (entry['failures'] - 1))
+        delay *= random.uniform(1 - JITTER, 1 + JITTER)
+    entry['next_check_time'] = (now + delay).isoformat()
+
+
+def _format_delay(delay: timedelta) -> str:
+    minutes = max(0, int(delay.total_seconds() // 60))
+    return f"{minutes // 60}h{minutes % 60:02d}m" if minutes >= 60 else f"{minutes}m"
+
+
+def plan_refresh(venv_dir: Path, cache: dict = None, now: datetime = None) -> dict:
+    """Decide what the background version check for a venv needs to do.
+
+    No network access and no subprocess: reads the upgrade cache and the
+    venv inventory.
+
+    Args:
+        venv_dir: Path to virtual environment
+        cache: Upgrade cache dict (default: load it)
+        now: Current time (default: now, UTC)
+
+    Returns:
+        {'packages': packages due for a lookup, 'record': whether the
+        venv's installed version must be re-recorded, 'reason': str}
+    """
+    cache = load_cache() if cache is None else cache
+    now = now or datetime.now(timezone.utc)
+    lib_info = detect_signalpilot_package(venv_dir)
+
+    due, waits, failures = [], [], 0
+    for package_name in [SIGNALPILOT_CLI] + ([lib_info[0]] if lib_info else []):
+        entry = cache.get(package_name, {})
+        when = next_refresh_time(entry)
+        if when is None or when <= now:
+            due.append(package_name)
+        else:
+            waits.append(when)
+            failures = max(failures, entry.get('failures', 0))
+
+    recorded = cache.get(VENVS_KEY, {}).get(cache_key(venv_dir), {})
+    record = bool(lib_info) and (recorded.get('package'), recorded.get('current_version')) != lib_info
+
+    if due:
+        reason = f"refreshing {', '.join(due)}"
+    elif failures:
+        reason = f"backing off after {failures} failure(s), next try in {_format_delay(min(waits) - now)}"
+    else:
+        reason = f"cache fresh, next refresh in {_format_delay(min(waits) - now)}"
+    if record and not due:
+        reason += "; recording installed version"
+    return {'packages': due, 'record': record, 'reason': reason}
+
+
+def latest_versions(package_names: list[str], cache: dict = None, now: datetime = None, timeout: float = 5.0) -> dict:
+    """Latest versions, reusing cache entries that are not yet due for a refresh.
+
+    Only packages whose entries are due (see next_refresh_time) or have no
+    known latest version are looked up, in one batch; their refresh is
+    scheduled as in check_versions_background.
+
+    Args:
+        package_names: Package names
+        cache: Upgrade cache dict to read and update (left unsaved); None
+            loads upgrade-cache.json and saves it after a lookup
+        now: Current time (default: now, UTC)
+        timeout: Deadline in seconds for the lookups
+
+    Returns:
+        Dict of package name to latest version, or None if unknown
+    """
+    own_cache = cache is None
+    if own_cache:
+        cache = load_cache()
+    now = now or datetime.now(timezone.utc)
+
+    versions, due = {}, []
+    for package_name in dict.fromkeys(package_names):
+        entry = cache.get(package_name, {})
+        when = next_refresh_time(entry)
+        if entry.get('latest_version') and when is not None and when > now:
+            versions[package_name] = entry['latest_version']
+        else:
+            due.append(package_name)
+
+    if due:
+        fetched = get_pypi_versions(due, timeout=timeout, cache=cache)
+        for package_name in due:
+            entry = cache.setdefault(package_name, {})
+            if fetched[package_name]:
+                entry['latest_version'] = fetched[package_name]
+            record_refresh(entry, bool(fetched[package_name]), now)
+            versions[package_name] = fetched[package_name]
+        if own_cache:
+            save_cache(cache)
+    return versions
+
+
+def check_versions_background(venv_dir: Path, result_container: list, packages: list[str] = None):
     """Background thread function to check both CLI and library versions.
 
     Checks PyPI for:
     1. signalpilot CLI
     2. signalpilot-ai or signalpilot-ai-internal (from venv)
 
-    Updates cache after checking PyPI.
+    Updates cache after checking PyPI, scheduling each package's next
+    refresh (see record_refresh).
 
     Args:
         venv_dir: Path to virtual environment
         result_container: List to append result dict to
+        packages: Look up only these packages (see plan_refresh) and use
+            cached versions for the rest; None looks up both
 
     Result format:
         {
@@ -275,51 +624,51 @@ def check_versions_background(venv_dir: Path, result_container: list):
 
     # Load cache
     cache = load_cache()
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
 
-    # Check CLI version
+    # Look up the due CLI and library versions in one batch
     cli_current = get_cli_version()
+    lib_info = detect_signalpilot_package(venv_dir)
+    wanted = ([SIGNALPILOT_CLI] if cli_current else []) + ([lib_info[0]] if lib_info else [])
+    due = [package for package in wanted if packages is None or package in packages]
+    latest = get_pypi_versions(due, cache=cache) if due else {}
+    for package_name in due:
+        entry = cache.setdefault(package_name, {})
+        if latest[package_name]:
+            entry['latest_version'] = latest[package_name]
+        record_refresh(entry, bool(latest[package_name]), now)
+
+    # Check CLI version (fresh, or cached from an earlier refresh)
     if cli_current:
-        cli_latest = get_pypi_version(SIGNALPILOT_CLI)
+        cli_latest = latest.get(SIGNALPILOT_CLI)
+        if not cli_latest and is_cache_valid(cache, SIGNALPILOT_CLI):
+            cli_latest = cache[SIGNALPILOT_CLI].get('latest_version')
         if cli_latest:
-            upgrade_type = compare_versions(cli_current, cli_latest)
             result['cli'] = {
                 'current': cli_current,
                 'latest': cli_latest,
-                'upgrade_type': upgrade_type
-            }
-
-            # Update cache
-            cache[SIGNALPILOT_CLI] = {
-                'latest_version': cli_latest,
-                'last_check_time': now
+                'upgrade_type': compare_versions(cli_current, cli_latest)
             }
 
     # Check library version
-    lib_info = detect_signalpilot_package(venv_dir)
     if lib_info:
         lib_package, lib_current = lib_info
-        lib_latest = get_pypi_version(lib_package)
+        lib_latest = latest.get(lib_package)
 
-        # If PyPI check fails (expected for -internal), use cache
+        # If PyPI check fails (expected for -internal) or was not due, use cache
         if not lib_latest and is_cache_valid(cache, lib_package):
             lib_latest = cache[lib_package].get('latest_version')
 
         if lib_latest:
-            upgrade_type = compare_versions(lib_current, lib_latest)
             result['library'] = {
                 'current': lib_current,
                 'latest': lib_latest,
-                'upgrade_type': upgrade_type,
+                'upgrade_type': compare_versions(lib_current, lib_latest),
                 'package': lib_package
             }
 
-            # Update cache
-            cache[lib_package] = {
-                'current_version': lib_current,
-                'latest_version': lib_latest,
-                'last_check_time': now
-            }
+        # Installed version is per venv
+        record_installed_version(cache, venv_dir, lib_package, lib_current, now.isoformat())
 
     # Save updated cache
     save_cache(cache)
@@ -328,25 +677,82 @@ def check_versions_background(venv_dir: Path, result_container: list):
     result_container.append(result)
 
 
-def start_version_check(venv_dir: Path) -> tuple[threading.Thread, list]:
-    """Start background version check (daemon thread).
+def start_version_check(venv_dir: Path, plan: dict = None) -> tuple[threading.Thread | None, list]:
+    """Start background version check (daemon thread), if one is due.
 
     Args:
         venv_dir: Path to virtual environment
+        plan: Result of plan_refresh() (default: plan now)
 
     Returns:
-        Tuple of (thread, result_container)
+        Tuple of (thread, result_container); thread is None when the cache
+        is fresh and nothing needs to run
     """
+    plan = plan or plan_refresh(venv_dir)
     result_container = []
+    if not plan['packages'] and not plan['record']:
+        return None, result_container
     thread = threading.Thread(
         target=check_versions_background,
-        args=(venv_dir, result_container),
+        args=(venv_dir, result_container, plan['packages']),
         daemon=True
     )
     thread.start()
     return thread, result_container
 
 
+def spawn_version_check(venv_dir: Path, plan: dict = None):
+    """Start the version check in a detached, low-priority process, if one is due.
+
+    Used when sp execs into Jupyter: a daemon thread would die with the
+    exec, so the refresh runs as `python -m sp.upgrade_check <venv>` in its
+    own session (see spawn_detached).
+
+    Args:
+        venv_dir: Path to virtual environment
+        plan: Result of plan_refresh() (default: plan now)
+    """
+    plan = plan or plan_refresh(venv_dir)
+    if not plan['packages'] and not plan['record']:
+        return
+
+    spawn_detached([sys.executable, "-m", "sp.upgrade_check", str(venv_dir), *plan['packages']])
+
+
+def spawn_detached(cmd: list[str]):
+    """Run a command in its own session at low priority, with stdio on /dev/null.
+
+    On POSIX it is double-forked so it is reparented to init and never
+    left as a zombie of the process that sp execs into.
+    """
+    if os.name != "posix":
+        import subprocess
+
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+        )
+        return
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setsid()
+            if os.fork() == 0:
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                os.nice(10)
+                os.execv(cmd[0], cmd)
+        finally:
+            os._exit(0)
+
+    os.waitpid(pid, 0)
+
+
 # ============================================================================
 # Notification UI
 # ============================================================================
@@ -362,72 +768,48 @@ def show_non_blocking_notification(current: str, latest: str, package_name: str,
         package_name: Package name
         duration: Ignored (kept for API compatibility)
     """
-    panel = Panel(
+    print_panel(
         f"[yellow]Update Available:[/yellow] {latest} (installed: {current})\n"
         f"[dim]Package: {package_name}[/dim]\n"
         f"[dim]Run 'sp upgrade' to update[/dim]",
         title="📦 SignalPilot Update",
         border_style="yellow"
     )
-
-    # Just print the panel without blocking
-    console.print(panel)
     console.print("[dim]Starting Jupyter Lab...[/dim]\n")
 
 
-def show_blocking_prompt(current: str, latest: str, package_name: str, timeout: int = 5) -> bool:
-    """Show blocking prompt with timeout for MAJOR/BREAKING upgrades.
+def show_staged_notification(current: str, latest: str, package_name: str, staging: dict = None):
+    """Show a non-blocking notification for MAJOR/BREAKING upgrades that are staged.
 
     Args:
         current: Current version
         latest: Latest version
         package_name: Package name
-        timeout: Seconds to wait for user input
-
-    Returns:
-        True if user wants to upgrade, False otherwise
+        staging: Staging marker (see sp.core.staging.read_staging), if any
     """
-    import signal
-
-    console.print(Panel(
+    kind = 'BREAKING' if parse_version(latest)[0] > parse_version(current)[0] else 'MAJOR'
+    if staging and staging.get('target') == latest and staging['status'] == 'failed':
+        status = f"[dim]Preparing it failed ({staging.get('error')}); run 'sp upgrade' to update[/dim]"
+    elif staging and staging.get('target') == latest and staging['status'] == 'ready':
+        status = "[dim]Ready: applied when you next start sp lab, or now with 'sp upgrade --apply'[/dim]"
+    else:
+        status = "[dim]Preparing it in the background; it is applied when you next start sp lab[/dim]"
+    print_panel(
         f"[bold yellow]Important Update:[/bold yellow] {latest} (installed: {current})\n"
         f"[dim]Package: {package_name}[/dim]\n"
-        f"[yellow]This is a {'BREAKING' if parse_version(latest)[0] > parse_version(current)[0] else 'MAJOR'} update[/yellow]",
+        f"[yellow]This is a {kind} update[/yellow]\n"
+        f"{status}",
         title="📦 SignalPilot Update",
         border_style="yellow"
-    ))
-
-    # Set timeout alarm (Unix only)
-    def timeout_handler(signum, frame):
-        raise TimeoutError()
-
-    old_handler = None
-    try:
-        if hasattr(signal, 'SIGALRM'):
-            old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(timeout)
-
-        result = Confirm.ask("[yellow]Upgrade now?[/yellow]", default=False)
-
-        if hasattr(signal, 'SIGALRM'):
-            signal.alarm(0)  # Cancel alarm
-        return result
-
-    except (TimeoutError, KeyboardInterrupt):
-        if hasattr(signal, 'SIGALRM'):
-            signal.alarm(0)
-        console.print("[dim]Skipping upgrade (timed out)[/dim]")
-        return False
-    finally:
-        if old_handler is not None and hasattr(signal, 'SIGALRM'):
-            signal.signal(signal.SIGALRM, old_handler)
+    )
 
 
 def check_cache_for_upgrades(venv_dir: Path) -> dict | None:
     """Check cache for available upgrades (no network call, no subprocess).
 
-    Reads current and latest versions from cache - does NOT call pip show.
-    Cache is populated/updated by background check after Jupyter starts.
+    Reads this venv's installed version and the package's latest version
+    from cache - does NOT call pip show. Cache is populated/updated by
+    background check after Jupyter starts.
 
     Args:
         venv_dir: Path to virtual environment
@@ -438,32 +820,41 @@ def check_cache_for_upgrades(venv_dir: Path) -> dict | None:
     """
     cache = load_cache()
 
-    # Try to find cached package info (no subprocess calls)
-    # Check both possible packages in priority order (public first, more common)
-    for lib_package in [SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL]:
-        if lib_package not in cache:
-            continue
-
-        if not is_cache_valid(cache, lib_package):
-            continue
-
-        # Get current and latest from cache
-        lib_current = cache[lib_package].get('current_version')
-        lib_latest = cache[lib_package].get('latest_version')
-
-        if not lib_current or not lib_latest:
-            continue
+    # Installed package and version for this venv, recorded by the background check
+    installed = cache.get(VENVS_KEY, {}).get(cache_key(venv_dir))
+    if not installed:
+        return None
+    lib_package = installed.get('package')
+    if lib_package not in (SIGNALPILOT_AI, SIGNALPILOT_AI_INTERNAL) or not is_cache_valid(cache, lib_package):
+        return None
 
-        # Compare versions
-        upgrade_type = compare_versions(lib_current, lib_latest)
-        if upgrade_type == "none":
-            continue
+    lib_current = installed.get('current_version')
+    lib_latest = cache[lib_package].get('latest_version')
+    if not lib_current or not lib_latest:
+        return None
 
-        return {
-            'type': upgrade_type,
-            'current': lib_current,
-            'latest': lib_latest,
-            'package': lib_package
-        }
+    # Compare versions
+    upgrade_type = compare_versions(lib_current, lib_latest)
+    if upgrade_type == "none":
+        return None
 
-    return None
+    return {
+        'type': upgrade_type,
+        'current': lib_current,
+        'latest': lib_latest,
+        'package': lib_package
+    }
+
+if __name__ == "__main__":
+    # Entry point for spawn_version_check(): refresh the due packages, then
+    # stage a major upgrade while still detached and reniced (see sp.core.staging)
+    venv_dir = Path(sys.argv[1])
+    results = []
+    check_versions_background(venv_dir, results, sys.argv[2:])
+    library = results[0].get('library') if results else None
+    if library and library['upgrade_type'] in ("major", "breaking"):
+        from sp.core.config import is_staged_upgrade_enabled
+        from sp.core.staging import build_staging, needs_staging
+
+        if is_staged_upgrade_enabled() and needs_staging(venv_dir, library['latest']):
+            build_staging(venv_dir)
@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from sp.upgrade_check import (
     check_cache_for_upgrades,
     show_non_blocking_notification,
-    show_blocking_prompt,
+    show_staged_notification,
 )
 from sp.core.config import SP_HOME, SP_VENV
 
@@ -55,15 +55,10 @@ def demo_notifications():
         print("\n✓ Notification dismissed")
 
     elif upgrade_type in ["major", "breaking"]:
-        print(f"\n🔔 Showing {upgrade_type.upper()} upgrade notification (5s, blocking)...")
-        print("    (You have 5 seconds to respond, or it auto-declines)")
-        should_upgrade = show_blocking_prompt(current, latest, package, timeout=5)
-
-        if should_upgrade:
-            print("\n✓ User chose to upgrade")
-            print("  (In real flow, upgrade_library() would run here)")
-        else:
-            print("\n✓ User declined or timed out")
+        print(f"\n🔔 Showing {upgrade_type.upper()} upgrade notification (non-blocking)...")
+        show_staged_notification(current, latest, package)
+        print("  (In real flow, sp lab stages the upgrade in the background, and")
+        print("   'sp upgrade' applies its plan: upgrade_plan.build_plan() then apply_plan())")
 
     print("\n" + "="*60)
     print("✅ Demo complete!")
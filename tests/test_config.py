@@ -0,0 +1,104 @@
+"""Tests for the layered, memoized config."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from sp.core import config
+
+
+@pytest.fixture
+def config_file(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "home" / "config.toml"
+    path.parent.mkdir()
+    monkeypatch.setattr(config, "SP_CONFIG_FILE", path)
+    monkeypatch.setattr(config, "_config", config.LayeredConfig())
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    monkeypatch.chdir(workspace)
+    for name in list(os.environ):
+        if name.startswith(config.ENV_PREFIX) and "__" in name:
+            monkeypatch.delenv(name)
+    return path
+
+
+def test_defaults_without_file_and_no_writes(config_file):
+    assert config.load_config() == config.DEFAULT_CONFIG
+    assert not config_file.exists()
+
+
+def test_file_parsed_once_until_it_changes(config_file, monkeypatch):
+    config_file.write_text("[lab]\nexec = true\n")
+    calls = []
+    real_loads = config._toml_loads
+    monkeypatch.setattr(config, "_toml_loads", lambda text: calls.append(text) or real_loads(text))
+
+    assert config.is_exec_mode_enabled() is True
+    assert config.is_exec_mode_enabled() is True
+    assert len(calls) == 1
+
+    config_file.write_text("[lab]\nexec = false  # changed\n")
+    assert config.is_exec_mode_enabled() is False
+    assert len(calls) == 2
+
+
+def test_layers_project_then_env(config_file, monkeypatch):
+    config_file.write_text('[lab]\nprofile = "full"\nexec = true\n[upgrade]\ncheck_enabled = false\n')
+    (Path.cwd().parent / config.PROJECT_CONFIG_FILE).write_text('[lab]\nprofile = "minimal"\n')
+    monkeypatch.setenv("SP_UPGRADE__CHECK_ENABLED", "true")
+    monkeypatch.setenv("SP_KERNELS__PRELOAD", '["pandas", "numpy"]')
+
+    loaded = config.load_config()
+
+    assert loaded["lab"] == {"profile": "minimal", "exec": True}
+    assert loaded["upgrade"]["check_enabled"] is True
+    assert config.get_kernel_pool_config()["preload"] == ["pandas", "numpy"]
+
+
+def test_project_file_cannot_set_the_index(config_file, monkeypatch, capsys):
+    config_file.write_text('[index]\nurl = "https://mirror.example/simple"\n')
+    (Path.cwd() / config.PROJECT_CONFIG_FILE).write_text(
+        '[index]\nurl = "https://attacker.example/simple"\nwheelhouse = "wheels"\n[lab]\nexec = true\n'
+    )
+
+    assert config.get_index_config() == {"url": "https://mirror.example/simple", "wheelhouse": None}
+    assert config.is_exec_mode_enabled() is True
+    assert "Ignoring [index]" in capsys.readouterr().out
+
+    # Warned once per file; environment overrides still apply
+    monkeypatch.setenv("SP_INDEX__URL", "https://env.example/simple")
+    assert config.get_index_config()["url"] == "https://env.example/simple"
+    assert "Ignoring" not in capsys.readouterr().out
+
+
+def test_project_file_cannot_preload_kernels_or_skip_updates(config_file, capsys):
+    config_file.write_text('[kernels]\npool_size = 2\npreload = ["pandas"]\n')
+    (Path.cwd() / config.PROJECT_CONFIG_FILE).write_text(
+        '[kernels]\npreload = ["payload"]\n[upgrade]\ncheck_enabled = false\n[lab]\nprofile = "minimal"\n'
+    )
+
+    assert config.get_kernel_pool_config()["preload"] == ["pandas"]
+    assert config.is_upgrade_check_enabled() is True
+    assert config.get_lab_profile()[0] == "minimal"
+    assert "Ignoring [kernels], [upgrade]" in capsys.readouterr().out
+
+
+def test_invalid_file_falls_back_to_defaults(config_file):
+    config_file.write_text("[lab\n")
+
+    assert config.load_config() == config.DEFAULT_CONFIG
+
+
+def test_env_value_kept_as_string_when_not_toml(config_file, monkeypatch):
+    monkeypatch.setenv("SP_LAB__PROFILE", "minimal")
+
+    assert config.get_lab_profile() == ("minimal", [])
+
+
+def test_write_default_config(config_file, monkeypatch):
+    monkeypatch.setattr(config, "SP_CONFIG_DIR", config_file.parent)
+
+    assert config.write_default_config() is True
+    assert config.write_default_config() is False
+    assert config.is_upgrade_check_enabled() is True
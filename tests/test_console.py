@@ -0,0 +1,57 @@
+"""Tests for the lazy console proxy and plain-text writer."""
+
+import subprocess
+import sys
+
+from sp.ui import console as ui_console
+from sp.ui.console import console, print_panel, print_tree, strip_markup
+
+
+def test_strip_markup():
+    assert strip_markup("[bold red]✗ Failed[/bold red]") == "✗ Failed"
+    assert strip_markup("[green]  → uvx signalpilot@latest lab[/green]") == "  → uvx signalpilot@latest lab"
+    assert strip_markup(r"literal \[dim] tag") == "literal [dim] tag"
+    assert strip_markup("Workspace: /tmp/data [1]") == "Workspace: /tmp/data [1]"
+
+
+def test_plain_output_when_piped(monkeypatch, capsys):
+    monkeypatch.delenv("SP_OUTPUT", raising=False)
+    monkeypatch.delenv("FORCE_COLOR", raising=False)
+
+    console.print("[bold green]✓ Up to date[/bold green]", style="green")
+
+    assert capsys.readouterr().out == "✓ Up to date\n"
+
+
+def test_env_forces_plain(monkeypatch, capsys):
+    monkeypatch.setenv("SP_OUTPUT", "plain")
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True, raising=False)
+
+    assert ui_console.use_plain_output()
+
+
+def test_panel_and_tree_plain(monkeypatch, capsys):
+    monkeypatch.setenv("SP_OUTPUT", "plain")
+
+    print_panel("[yellow]Update Available:[/yellow] 0.11.8", title="📦 SignalPilot Update", border_style="yellow")
+    print_tree("[bold cyan]~/SignalPilotHome/[/bold cyan]", ["[cyan]user-skills/[/cyan]", "[cyan]data/[/cyan]"])
+
+    out = capsys.readouterr().out
+    assert "--- 📦 SignalPilot Update ---\nUpdate Available: 0.11.8\n" in out
+    assert "~/SignalPilotHome/\n├── user-skills/\n└── data/\n" in out
+
+
+def test_panel_rich(monkeypatch, capsys):
+    monkeypatch.setenv("SP_OUTPUT", "rich")
+
+    print_panel("Update Available: 0.11.8", title="SignalPilot Update")
+
+    out = capsys.readouterr().out
+    assert "SignalPilot Update" in out
+    assert "╭" in out
+
+
+def test_import_does_not_load_rich():
+    code = "import sys, sp.ui.console; print('rich' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
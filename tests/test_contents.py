@@ -0,0 +1,138 @@
+"""Tests for the caching contents manager (needs jupyter_server, as in the venv)."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("jupyter_server")
+
+from sp.jupyter_ext.sp_jupyter.contents import CachingContentsManager  # noqa: E402
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> CachingContentsManager:
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    for name in ["a.csv", "nb.ipynb", ".hidden"]:
+        (data / name).write_text("{}")
+    (data / "__pycache__").mkdir()
+    return CachingContentsManager(root_dir=str(tmp_path), hide_globs=["__pycache__"])
+
+
+def listing(manager, path="data") -> dict:
+    model = asyncio.run(manager.get(path))
+    return {child["name"]: child for child in model["content"]}
+
+
+def test_listing_prunes_hidden_entries(manager):
+    children = listing(manager)
+
+    assert sorted(children) == ["a.csv", "nb.ipynb", "sub"]
+    assert children["nb.ipynb"]["type"] == "notebook"
+    assert children["sub"]["type"] == "directory"
+    assert children["a.csv"]["mimetype"] == "text/csv"
+    assert children["a.csv"]["path"] == "data/a.csv"
+
+
+def test_listing_is_cached(manager, monkeypatch):
+    listing(manager)
+    monkeypatch.setattr(manager, "_scan", lambda *args: pytest.fail("listing was rescanned"))
+
+    assert "a.csv" in listing(manager)
+
+
+def test_external_change_invalidates(manager, tmp_path):
+    listing(manager)
+    (tmp_path / "data" / "new.csv").write_text("")
+
+    assert "new.csv" in listing(manager)
+
+
+def test_size_change_invalidates_without_inotify(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "a.csv").write_text("")
+    manager = CachingContentsManager(root_dir=str(tmp_path), use_inotify=False, cache_ttl=0)
+    listing(manager)
+    (tmp_path / "data" / "a.csv").write_text("abc")
+
+    assert listing(manager)["a.csv"]["size"] == 3
+
+
+def test_rename_through_server_invalidates(manager, tmp_path):
+    listing(manager)
+    asyncio.run(manager.rename_file("data/a.csv", "data/b.csv"))
+
+    assert sorted(listing(manager)) == ["b.csv", "nb.ipynb", "sub"]
+    assert not os.path.exists(tmp_path / "data" / "a.csv")
+
+
+def test_sidecar_outputs_restored_on_open_and_compacted_on_save(tmp_path):
+    from sp.jupyter_ext.sp_jupyter.sidecar import METADATA_KEY, SIDECAR_DIR, compact_notebook
+
+    nb = {
+        "cells": [{"cell_type": "code", "execution_count": 1, "metadata": {}, "source": "", "outputs": [
+            {"output_type": "display_data", "metadata": {}, "data": {"image/png": "A" * 100000, "text/plain": "fig"}},
+        ]}],
+        "metadata": {}, "nbformat": 4, "nbformat_minor": 5,
+    }
+    compact_notebook(nb, tmp_path / SIDECAR_DIR, threshold=1024)
+    (tmp_path / "a.ipynb").write_text(json.dumps(nb))
+    manager = CachingContentsManager(root_dir=str(tmp_path))
+
+    model = asyncio.run(manager.get("a.ipynb"))
+    assert model["content"]["cells"][0]["outputs"][0]["data"]["image/png"] == "A" * 100000
+
+    asyncio.run(manager.save({"type": "notebook", "content": model["content"]}, "a.ipynb"))
+    saved = json.loads((tmp_path / "a.ipynb").read_text())
+    assert "image/png" not in saved["cells"][0]["outputs"][0]["data"]
+    assert METADATA_KEY in saved["cells"][0]["outputs"][0]["metadata"]
+
+
+def trusted_manager(tmp_path: Path) -> CachingContentsManager:
+    from nbformat.sign import MemorySignatureStore, NotebookNotary
+
+    manager = CachingContentsManager(root_dir=str(tmp_path))
+    manager.notary = NotebookNotary(secret=b"test", store_factory=MemorySignatureStore)
+    return manager
+
+
+def html_notebook() -> dict:
+    import nbformat
+
+    return nbformat.from_dict({
+        "cells": [{"id": "c1", "cell_type": "code", "execution_count": 1, "metadata": {}, "source": "", "outputs": [
+            {"output_type": "display_data", "metadata": {}, "data": {"text/html": "<b>" * 20000, "text/plain": "t"}},
+        ]}],
+        "metadata": {}, "nbformat": 4, "nbformat_minor": 5,
+    })
+
+
+def test_notebook_compacted_by_the_cli_stays_trusted(tmp_path):
+    from sp.commands.nb import compact_file
+
+    manager = trusted_manager(tmp_path)
+    nb = html_notebook()
+    manager.notary.sign(nb)
+    (tmp_path / "a.ipynb").write_text(json.dumps(nb))
+    assert compact_file(tmp_path / "a.ipynb", threshold_kb=1)[0] == 1
+
+    model = asyncio.run(manager.get("a.ipynb"))
+    assert model["content"]["cells"][0]["metadata"]["trusted"] is True
+
+
+def test_notebook_saved_by_the_server_stays_trusted(tmp_path):
+    from sp.jupyter_ext.sp_jupyter.sidecar import METADATA_KEY
+
+    manager = trusted_manager(tmp_path)
+    nb = html_notebook()
+    nb["cells"][0]["metadata"]["trusted"] = True
+    nb["metadata"][METADATA_KEY] = {"threshold": 1024}
+
+    asyncio.run(manager.save({"type": "notebook", "content": nb}, "a.ipynb"))
+    assert "text/html" not in json.loads((tmp_path / "a.ipynb").read_text())["cells"][0]["outputs"][0]["data"]
+
+    model = asyncio.run(manager.get("a.ipynb"))
+    assert model["content"]["cells"][0]["metadata"]["trusted"] is True
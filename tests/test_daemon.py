@@ -0,0 +1,116 @@
+"""Tests for the resident Jupyter server registry."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from sp.core import daemon
+
+
+@pytest.fixture(autouse=True)
+def servers_dir(tmp_path, monkeypatch):
+    path = tmp_path / "servers"
+    monkeypatch.setattr(daemon, "SP_SERVERS_DIR", path)
+    return path
+
+
+def write_entry(venv_dir: Path, **overrides) -> dict:
+    entry = {
+        "pid": os.getpid(),
+        "port": 8888,
+        "url": "http://localhost:8888/",
+        "root_dir": str(Path.home()),
+        "venv_dir": str(venv_dir),
+        "started_at": "2026-01-01T00:00:00+00:00",
+        **overrides,
+    }
+    daemon.registry_path(venv_dir).parent.mkdir(parents=True, exist_ok=True)
+    daemon.registry_path(venv_dir).write_text(json.dumps(entry))
+    return entry
+
+
+def test_tree_url_for_nested_workspace(tmp_path):
+    entry = {"url": "http://localhost:8888/", "root_dir": str(tmp_path)}
+    workspace = tmp_path / "projects" / "q3 churn"
+    workspace.mkdir(parents=True)
+
+    assert daemon.tree_url(entry, workspace) == "http://localhost:8888/lab/tree/projects/q3%20churn"
+    assert daemon.tree_url(entry, tmp_path) == "http://localhost:8888/lab/tree"
+
+
+def test_tree_url_carries_the_token(tmp_path):
+    entry = {"url": "http://localhost:8888/", "root_dir": str(tmp_path), "token": "s3cr/t"}
+
+    assert daemon.tree_url(entry, tmp_path) == "http://localhost:8888/lab/tree?token=s3cr/t"
+
+
+def test_tree_url_outside_root(tmp_path):
+    entry = {"url": "http://localhost:8888/", "root_dir": str(tmp_path / "a")}
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    assert daemon.tree_url(entry, tmp_path / "b") is None
+
+
+def test_find_live_server(tmp_path, monkeypatch):
+    venv_dir = tmp_path / ".venv"
+    entry = write_entry(venv_dir)
+    monkeypatch.setattr(daemon, "server_responds", lambda port, timeout=0.5: True)
+
+    assert daemon.find_live_server(venv_dir) == entry
+
+
+def test_stale_entry_is_removed(tmp_path, monkeypatch):
+    venv_dir = tmp_path / ".venv"
+    write_entry(venv_dir)
+    monkeypatch.setattr(daemon, "server_responds", lambda port, timeout=0.5: False)
+
+    assert daemon.find_live_server(venv_dir) is None
+    assert not daemon.registry_path(venv_dir).exists()
+
+
+def test_load_servers_marks_dead(tmp_path):
+    write_entry(tmp_path / "a" / ".venv")
+    write_entry(tmp_path / "b" / ".venv", pid=2 ** 22 + 12345)
+
+    alive = sorted(entry["alive"] for entry in daemon.load_servers())
+    assert alive == [False, True]
+
+
+def test_default_root_is_home_for_home_workspaces(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    (tmp_path / "home" / "work").mkdir(parents=True)
+    (tmp_path / "data" / "q3").mkdir(parents=True)
+
+    assert daemon.default_root_dir(tmp_path / "home" / "work") == (tmp_path / "home").resolve()
+    # Never a shared directory above a workspace outside home
+    assert daemon.default_root_dir(tmp_path / "data" / "q3") == (tmp_path / "data" / "q3").resolve()
+
+
+def test_started_server_requires_a_private_token(tmp_path, monkeypatch, servers_dir):
+    launched = {}
+
+    class Process:
+        pid = os.getpid()
+
+    def popen(cmd, env, **kwargs):
+        launched.update(cmd=cmd, env=env)
+        return Process()
+
+    monkeypatch.setattr(daemon.subprocess, "Popen", popen)
+    monkeypatch.setattr(daemon, "wait_for_server", lambda *args, **kwargs: {"seconds": 1.0})
+    monkeypatch.setattr(daemon, "get_lab_profile", lambda: ("full", []))
+    monkeypatch.setattr(daemon, "get_kernel_pool_config", lambda: {"pool_size": 0})
+    monkeypatch.setattr("sp.core.profiles.build_profile", lambda venv_dir, profile, allow: ([], {}))
+    venv_dir = tmp_path / ".venv"
+
+    entry = daemon.start_server(venv_dir, tmp_path)
+
+    assert len(entry["token"]) >= 32
+    assert launched["env"]["JUPYTER_TOKEN"] == entry["token"]
+    assert not any("token" in arg.lower() for arg in launched["cmd"])
+    assert json.loads(daemon.registry_path(venv_dir).read_text())["token"] == entry["token"]
+    for path in (daemon.registry_path(venv_dir), Path(entry["log"])):
+        assert path.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,95 @@
+"""Tests for the venv inventory (installed versions from dist-info and pyvenv.cfg)."""
+
+import json
+import os
+import sys
+
+import pytest
+
+from sp.core import environment
+from sp.upgrade_check import detect_signalpilot_package
+
+
+@pytest.fixture(autouse=True)
+def inventory_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.config.SP_INVENTORY_DIR", tmp_path / "inventory")
+    monkeypatch.setattr(environment, "_inventories", {})
+    return tmp_path / "inventory"
+
+
+def install(site_packages, dist_name, version, metadata_version=None):
+    dist_info = site_packages / f"{dist_name}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    name = dist_name.replace("_", "-")
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {metadata_version or version}\n\nVersion: not-a-header\n"
+    )
+    return dist_info
+
+
+def test_reads_version_from_metadata(tmp_path):
+    site_packages = tmp_path / ".venv" / "lib" / "python3.12" / "site-packages"
+    install(site_packages, "signalpilot_ai", "0.11.2", metadata_version="0.11.2.post1")
+    install(site_packages, "signalpilot_ai_internal", "0.12.0")
+
+    assert environment.installed_version(tmp_path / ".venv", "signalpilot-ai") == "0.11.2.post1"
+    assert environment.installed_version(tmp_path / ".venv", "SignalPilot_AI_Internal") == "0.12.0"
+    assert environment.installed_version(tmp_path / ".venv", "pandas") is None
+    assert detect_signalpilot_package(tmp_path / ".venv") == ("signalpilot-ai", "0.11.2.post1")
+
+
+def test_upgrade_invalidates_cached_version(tmp_path):
+    site_packages = tmp_path / ".venv" / "lib" / "python3.12" / "site-packages"
+    old = install(site_packages, "signalpilot_ai", "0.11.2")
+    assert environment.installed_version(tmp_path / ".venv", "signalpilot-ai") == "0.11.2"
+
+    (old / "METADATA").unlink()
+    old.rmdir()
+    install(site_packages, "signalpilot_ai", "0.12.0")
+    stat = site_packages.stat()
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert environment.installed_version(tmp_path / ".venv", "signalpilot-ai") == "0.12.0"
+
+
+def test_no_global_side_effects(tmp_path):
+    site_packages = tmp_path / ".venv" / "lib" / "python3.12" / "site-packages"
+    install(site_packages, "signalpilot_ai", "0.11.2")
+    path_before = list(sys.path)
+
+    assert environment.installed_version(tmp_path / ".venv", "signalpilot-ai") == "0.11.2"
+    assert sys.path == path_before
+    assert environment.installed_version(tmp_path / "missing", "signalpilot-ai") is None
+
+
+def test_inventory_is_persisted_with_python_version(tmp_path, inventory_dir):
+    venv = tmp_path / ".venv"
+    install(venv / "lib" / "python3.12" / "site-packages", "signalpilot_ai", "0.11.2")
+    (venv / "pyvenv.cfg").write_text("home = /usr/bin\nimplementation = CPython\nversion_info = 3.12.7\n")
+
+    inventory = environment.venv_inventory(venv)
+
+    assert inventory["python"] == "3.12.7"
+    assert inventory["distributions"] == {"signalpilot-ai": "0.11.2"}
+    stored = json.loads((inventory_dir / f"{environment.venv_key(venv)}.json").read_text())
+    assert stored == inventory
+
+    # A fresh process reads the stored inventory instead of rescanning
+    environment._inventories.clear()
+    stored["distributions"]["marker"] = "1"
+    (inventory_dir / f"{environment.venv_key(venv)}.json").write_text(json.dumps(stored))
+    assert environment.installed_version(venv, "marker") == "1"
+
+
+def test_venv_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.config.SP_VENVS_DIR", tmp_path / "venvs")
+    kept, deleted = tmp_path / "a" / ".venv", tmp_path / "b" / ".venv"
+    for venv in (kept, deleted):
+        (venv / "bin").mkdir(parents=True)
+        (venv / "bin" / "jupyter").touch()
+        environment.register_venv(venv)
+    environment.register_venv(kept)
+    (deleted / "bin" / "jupyter").unlink()
+
+    assert environment.known_venvs() == [kept]
+    assert len(list((tmp_path / "venvs").iterdir())) == 1
@@ -0,0 +1,69 @@
+"""Tests for the zero-dependency console-script fast path."""
+
+import pytest
+import typer
+
+from sp import __version__
+from sp.fastpath import COMMANDS, OPTIONS, try_fast_path
+from sp.main import app
+
+
+def test_commands_match_typer_app():
+    """Static command table must mirror the commands registered in sp.main."""
+    click_group = typer.main.get_command(app)
+    registered = [(name, cmd.help.splitlines()[0]) for name, cmd in click_group.commands.items()]
+
+    assert registered == COMMANDS
+
+
+def test_options_match_typer_app():
+    """Static option table must list every top-level option Typer exposes."""
+    click_group = typer.main.get_command(app)
+    ctx = click_group.make_context("sp", [], resilient_parsing=True)
+    typer_flags = {flag for param in click_group.get_params(ctx) for flag in param.opts}
+    static_flags = {flag for flags, _ in OPTIONS for flag in flags}
+
+    assert static_flags == typer_flags
+
+
+@pytest.mark.parametrize("argv", [["version"], ["--version"]])
+def test_version(argv):
+    output = try_fast_path(argv, "sp")
+    assert f"SignalPilot Installer CLI v{__version__}" in output
+
+
+def test_help_lists_commands():
+    output = try_fast_path(["--help"], "signalpilot")
+    assert output.startswith("Usage: signalpilot [OPTIONS] COMMAND")
+    for name, _ in COMMANDS:
+        assert f"  {name} " in output
+
+
+@pytest.mark.parametrize("argv", [[], ["lab"], ["lab", "--help"], ["version", "--dev"]])
+def test_other_invocations_defer_to_typer(argv):
+    assert try_fast_path(argv, "sp") is None
+
+
+def test_bash_completion_first_word(monkeypatch):
+    monkeypatch.setenv("_SP_COMPLETE", "complete_bash")
+    monkeypatch.setenv("COMP_WORDS", "sp u")
+    monkeypatch.setenv("COMP_CWORD", "1")
+
+    assert try_fast_path([], "sp") == "upgrade\n"
+
+
+def test_zsh_completion_options(monkeypatch):
+    monkeypatch.setenv("_SIGNALPILOT_COMPLETE", "complete_zsh")
+    monkeypatch.setenv("_TYPER_COMPLETE_ARGS", "signalpilot --ver")
+
+    output = try_fast_path([], "signalpilot")
+    assert output.startswith("_arguments")
+    assert '"--version"' in output
+
+
+def test_subcommand_completion_defers_to_typer(monkeypatch):
+    monkeypatch.setenv("_SP_COMPLETE", "complete_bash")
+    monkeypatch.setenv("COMP_WORDS", "sp lab --")
+    monkeypatch.setenv("COMP_CWORD", "2")
+
+    assert try_fast_path([], "sp") is None
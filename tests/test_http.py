@@ -0,0 +1,99 @@
+"""Tests for pooled keep-alive requests."""
+
+import base64
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sp.core import http
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    proxy_authorization = None
+
+    def do_GET(self):
+        Handler.connections.add(self.client_address)
+        Handler.proxy_authorization = self.headers.get("Proxy-Authorization")
+        if self.path == "/slow":
+            time.sleep(1.0)
+        body = b"hello " + self.path.encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            if self.path == "/truncated":
+                body = body[:-6]
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    Handler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    http.close_all()
+
+
+def test_connection_is_reused(server):
+    first = http.fetch(server + "/a")
+    second = http.fetch(server + "/b")
+
+    assert first["status"] == 200 and first["body"] == b"hello /a"
+    assert second["body"] == b"hello /b"
+    assert len(Handler.connections) == 1
+
+
+def test_gzip_is_decompressed(server):
+    response = http.fetch(server + "/z", {"Accept-Encoding": "gzip"})
+
+    assert response["headers"]["content-encoding"] == "gzip"
+    assert response["body"] == b"hello /z"
+
+
+def test_corrupt_gzip_is_a_connection_error(server):
+    with pytest.raises(OSError, match="invalid gzip body"):
+        http.fetch(server + "/truncated", {"Accept-Encoding": "gzip"})
+
+    assert http.fetch_many([(server + "/truncated", {"Accept-Encoding": "gzip"})]) == [None]
+
+
+def test_plain_http_proxy_gets_credentials(server, monkeypatch):
+    monkeypatch.delenv("no_proxy", raising=False)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.setenv("http_proxy", server.replace("http://", "http://alice:s%40cret@"))
+
+    response = http.fetch("http://pypi.example/simple/")
+
+    assert response["body"] == b"hello http://pypi.example/simple/"
+    assert Handler.proxy_authorization == "Basic " + base64.b64encode(b"alice:s@cret").decode()
+
+
+def test_batch_shares_one_deadline(server):
+    start = time.monotonic()
+    results = http.fetch_many([(server + "/a", {}), (server + "/slow", {}), (server + "/b", {})], timeout=0.5)
+
+    assert time.monotonic() - start < 0.9
+    assert results[0]["body"] == b"hello /a"
+    assert results[1] is None
+    assert results[2]["body"] == b"hello /b"
+
+
+def test_unreachable_host_gives_none():
+    assert http.fetch_many([("http://127.0.0.1:1/", {})], timeout=1.0) == [None]
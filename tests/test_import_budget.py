@@ -0,0 +1,98 @@
+"""Import-time budgets for each CLI entry point.
+
+Every `sp` invocation pays for the modules it imports before any work
+happens, so each command gets a budget for module count and cumulative
+import time (measured with `python -X importtime`).
+
+Set SP_IMPORT_BUDGET_SCALE to loosen the time budgets on slow machines.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from sp.main import COMMAND_MODULES
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# (code run under -X importtime, max modules, max cumulative ms)
+ENTRY_POINTS = {
+    "fastpath": ("import sys; sys.argv = ['sp', 'version']; from sp.fastpath import main; main()", 45, 40),
+    "sp.main": ("import sp.main", 170, 250),
+    "version": ("from sp.main import version; version()", 170, 250),
+    "init": ("from sp.main import load_command; load_command('init', 'init_command')", 230, 350),
+    "lab": ("from sp.main import load_command; load_command('lab', 'lab_command')", 230, 350),
+    "home": ("from sp.main import load_command; load_command('home', 'home_command')", 230, 350),
+    "upgrade": ("from sp.main import load_command; load_command('upgrade', 'upgrade_command')", 230, 350),
+    "rollback": ("from sp.main import load_command; load_command('rollback', 'rollback_command')", 230, 350),
+    "serve": ("from sp.main import load_command; load_command('serve', 'serve_command')", 230, 350),
+    "ps": ("from sp.main import load_command; load_command('ps', 'ps_command')", 230, 350),
+    "stop": ("from sp.main import load_command; load_command('stop', 'stop_command')", 230, 350),
+    "warm": ("from sp.main import load_command; load_command('warm', 'warm_command')", 230, 350),
+    "stats": ("from sp.main import load_command; load_command('stats', 'stats_command')", 230, 350),
+    "nb": ("from sp.main import load_command; load_command('nb', 'compact_command')", 230, 350),
+    "wheelhouse": ("from sp.main import load_command; load_command('wheelhouse', 'build_command')", 230, 350),
+}
+
+
+def measure_imports(code: str) -> tuple[int, float, set[str]]:
+    """Run code under -X importtime and return (module count, cumulative ms, module names)."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        modules.add(name.strip())
+        # Top-level imports have a single space of indentation
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative_us)
+
+    return len(modules), total_us / 1000, modules
+
+
+def test_every_command_has_a_budget():
+    """New commands must declare an import budget."""
+    assert set(COMMAND_MODULES) <= set(ENTRY_POINTS)
+
+
+@pytest.mark.parametrize("entry_point", sorted(ENTRY_POINTS))
+def test_import_budget(entry_point):
+    """Entry point stays within its module count and import-time budget."""
+    code, max_modules, max_ms = ENTRY_POINTS[entry_point]
+    scale = float(os.environ.get("SP_IMPORT_BUDGET_SCALE", "1"))
+
+    count, total_ms, _ = measure_imports(code)
+
+    assert count <= max_modules, f"{entry_point}: {count} modules imported (budget {max_modules})"
+    assert total_ms <= max_ms * scale, f"{entry_point}: {total_ms:.0f}ms import time (budget {max_ms}ms)"
+
+
+def test_fastpath_is_stdlib_only():
+    """`sp version` through the console script must not load any framework."""
+    _, _, modules = measure_imports(ENTRY_POINTS["fastpath"][0])
+
+    for framework in ("typer", "click", "rich"):
+        assert not any(m == framework or m.startswith(framework + ".") for m in modules)
+
+
+def test_main_does_not_import_command_modules():
+    """Importing the Typer app must not pull in command implementations."""
+    _, _, modules = measure_imports("import sp.main")
+
+    assert not set(COMMAND_MODULES.values()) & modules
+    for heavy in ("sp.upgrade_check", "rich.tree", "rich.live", "rich.prompt", "urllib.request"):
+        assert heavy not in modules
@@ -0,0 +1,77 @@
+"""Tests for the configurable package index and wheelhouse."""
+
+from unittest.mock import patch
+
+import pytest
+
+from sp import upgrade_check
+from sp.core import index
+from sp.test_mocks import make_fetch
+
+
+def settings(url=None, wheelhouse=None):
+    return {"url": url, "wheelhouse": wheelhouse}
+
+
+@pytest.fixture
+def use_index(monkeypatch):
+    def configure(url=None, wheelhouse=None):
+        monkeypatch.setattr("sp.core.config.get_index_config", lambda: settings(url, wheelhouse))
+
+    return configure
+
+
+def test_uv_index_args():
+    assert index.uv_index_args(settings()) == []
+    assert index.uv_index_args(settings(url="https://mirror/simple/")) == ["--index-url", "https://mirror/simple/"]
+    assert index.uv_index_args(settings(wheelhouse="/wh")) == ["--find-links", "/wh", "--no-index"]
+
+
+def test_cli_is_always_checked_on_pypi():
+    configured = settings(url="https://mirror/simple/")
+
+    assert index.package_sources("signalpilot", configured)["url"] == index.PYPI_SIMPLE_URL
+    assert index.package_sources("signalpilot-ai", configured)["url"] == "https://mirror/simple/"
+    assert index.package_sources("signalpilot-ai", settings())["url"] == index.PYPI_SIMPLE_URL
+
+
+def test_versions_from_wheelhouse(tmp_path, use_index):
+    for name in ("signalpilot_ai_internal-0.12.1-py3-none-any.whl", "signalpilot_ai_internal-0.12.10-py3-none-any.whl",
+                 "signalpilot_ai_internal-0.13.0rc1-py3-none-any.whl", "pandas-2.2.0.tar.gz"):
+        (tmp_path / name).touch()
+    use_index(wheelhouse=tmp_path)
+
+    with patch("sp.core.http.fetch", side_effect=AssertionError("no network")):
+        versions = upgrade_check.get_pypi_versions(["signalpilot-ai-internal", "pandas", "numpy"], cache={})
+
+    assert versions == {"signalpilot-ai-internal": "0.12.10", "pandas": "2.2.0", "numpy": None}
+
+
+def test_versions_from_file_mirror(tmp_path, use_index):
+    project = tmp_path / "simple" / "signalpilot-ai"
+    project.mkdir(parents=True)
+    (project / "index.html").write_text(
+        '<a href="signalpilot_ai-0.12.0-py3-none-any.whl">signalpilot_ai-0.12.0-py3-none-any.whl</a>'
+    )
+    use_index(url=(tmp_path / "simple").as_uri())
+
+    assert upgrade_check.get_pypi_versions(["signalpilot-ai"], cache={}) == {"signalpilot-ai": "0.12.0"}
+
+
+def test_validators_belong_to_their_index(use_index):
+    cache = {"signalpilot-ai": {"latest_version": "0.11.0", "etag": '"old"'}}
+    requests = []
+    fetch = make_fetch({"signalpilot-ai": ["0.12.0"]})
+
+    def recording_fetch(url, headers=None, timeout=None):
+        requests.append((url, headers))
+        return fetch(url, headers, timeout)
+
+    use_index(url="https://mirror.example/simple/")
+    with patch("sp.core.http.fetch", side_effect=recording_fetch):
+        assert upgrade_check.get_pypi_versions(["signalpilot-ai"], cache=cache) == {"signalpilot-ai": "0.12.0"}
+
+    url, headers = requests[0]
+    assert url == "https://mirror.example/simple/signalpilot-ai/"
+    assert "If-None-Match" not in headers
+    assert cache["signalpilot-ai"]["index"] == "https://mirror.example/simple/"
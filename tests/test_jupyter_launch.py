@@ -0,0 +1,109 @@
+"""Tests for building and launching the Jupyter Lab process."""
+
+from pathlib import Path
+
+import pytest
+
+from sp.core import jupyter
+
+
+@pytest.fixture
+def venv_dir(tmp_path: Path) -> Path:
+    (tmp_path / ".venv" / "bin").mkdir(parents=True)
+    return tmp_path / ".venv"
+
+
+def test_build_command_uses_venv_jupyter(venv_dir):
+    cmd = jupyter.build_jupyter_command(venv_dir, ["--port=9999"])
+
+    assert cmd[0] == str(venv_dir / "bin" / "jupyter")
+    assert cmd[1] == "lab"
+    assert cmd[-1] == "--port=9999"
+
+
+def test_build_env_points_at_venv(venv_dir, monkeypatch):
+    monkeypatch.setenv("PYTHONHOME", "/somewhere")
+
+    env = jupyter.build_jupyter_env(venv_dir)
+
+    assert env["VIRTUAL_ENV"] == str(venv_dir)
+    assert env["PATH"].startswith(str(venv_dir / "bin"))
+    assert "PYTHONHOME" not in env
+
+
+class ExitedProcess:
+    pid = 12345
+
+    def poll(self):
+        return 0
+
+    def wait(self):
+        return 0
+
+
+def test_run_blocks_in_child_by_default(venv_dir, tmp_path, monkeypatch):
+    calls = []
+
+    def fake_popen(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        return ExitedProcess()
+
+    monkeypatch.setattr(jupyter.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(jupyter.os, "execve", lambda *args: pytest.fail("execve should not be called"))
+
+    jupyter.run_jupyter_lab(venv_dir, tmp_path, kernel_pool={})
+
+    cmd, kwargs = calls[0]
+    assert cmd[0] == str(venv_dir / "bin" / "jupyter")
+    assert kwargs["cwd"] == tmp_path
+
+
+@pytest.mark.skipif(jupyter.os.name != "posix", reason="exec mode is POSIX only")
+def test_exec_mode_replaces_process(venv_dir, tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(jupyter.os, "chdir", lambda path: calls.append(("chdir", path)))
+    monkeypatch.setattr(jupyter.os, "execve", lambda path, args, env: calls.append(("execve", path, args, env)))
+    monkeypatch.setattr(jupyter.subprocess, "Popen", lambda *args, **kwargs: calls.append(("popen",)) or ExitedProcess())
+
+    jupyter.run_jupyter_lab(venv_dir, tmp_path, extra_args=["--no-browser"], exec_mode=True, kernel_pool={})
+
+    assert calls[0] == ("chdir", tmp_path)
+    _, path, args, env = calls[1]
+    assert path == str(venv_dir / "bin" / "jupyter")
+    assert args[-1] == "--no-browser"
+    assert env["VIRTUAL_ENV"] == str(venv_dir)
+
+
+def test_build_env_exposes_server_extensions(venv_dir, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", "/existing")
+
+    env = jupyter.build_jupyter_env(venv_dir)
+
+    assert env["PYTHONPATH"].split(jupyter.os.pathsep) == [str(jupyter.JUPYTER_EXT_DIR), "/existing"]
+    assert (jupyter.JUPYTER_EXT_DIR / "sp_jupyter" / "kernel_pool.py").exists()
+
+
+def test_kernel_pool_disabled_by_default(venv_dir):
+    cmd = jupyter.build_jupyter_command(venv_dir, kernel_pool={"pool_size": 0, "preload": ["pandas"]})
+
+    assert not any("PooledKernelManager" in arg for arg in cmd)
+
+
+def test_kernel_pool_args(venv_dir):
+    pool = {"pool_size": 2, "preload": ["pandas", "numpy"], "max_memory_mb": 2048, "idle_timeout_minutes": 10}
+
+    cmd = jupyter.build_jupyter_command(venv_dir, ["--no-browser"], kernel_pool=pool)
+
+    assert "--ServerApp.kernel_manager_class=sp_jupyter.kernel_pool.PooledKernelManager" in cmd
+    assert "--PooledKernelManager.pool_size=2" in cmd
+    assert "--PooledKernelManager.preload_modules=['pandas', 'numpy']" in cmd
+    assert "--PooledKernelManager.max_memory_mb=2048" in cmd
+    assert "--PooledKernelManager.idle_timeout=600" in cmd
+    assert cmd[-1] == "--no-browser"
+
+
+def test_default_contents_manager_is_caching(venv_dir):
+    cmd = jupyter.build_jupyter_command(venv_dir)
+
+    assert "--ServerApp.contents_manager_class=sp_jupyter.contents.CachingContentsManager" in cmd
+    assert (jupyter.JUPYTER_EXT_DIR / "sp_jupyter" / "contents.py").exists()
@@ -0,0 +1,100 @@
+"""Tests for notebook output sidecars (sp nb compact)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sp.commands import nb as nb_command
+from sp.jupyter_ext.sp_jupyter import sidecar
+
+PNG = "iVBORw0KGgo" * 5000
+
+
+def make_notebook(path: Path) -> dict:
+    nb = {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": "# Title"},
+            {
+                "cell_type": "code",
+                "execution_count": 1,
+                "metadata": {},
+                "source": "plot()",
+                "outputs": [
+                    {
+                        "output_type": "display_data",
+                        "metadata": {},
+                        "data": {"image/png": PNG, "text/plain": "<Figure size 640x480 with 1 Axes>"},
+                    },
+                    {"output_type": "stream", "name": "stdout", "text": "done\n"},
+                ],
+            },
+        ],
+        "metadata": {},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    path.write_text(json.dumps(nb))
+    return nb
+
+
+@pytest.fixture
+def notebook(tmp_path: Path) -> Path:
+    path = tmp_path / "analysis.ipynb"
+    make_notebook(path)
+    return path
+
+
+def test_compact_moves_large_outputs(notebook, tmp_path):
+    moved, size = nb_command.compact_file(notebook, threshold_kb=32)
+
+    assert moved == 1
+    output = json.loads(notebook.read_text())["cells"][1]["outputs"][0]
+    assert output["data"] == {"text/plain": "<Figure size 640x480 with 1 Axes>"}
+    digest = output["metadata"][sidecar.METADATA_KEY]["image/png"]
+    assert json.loads((tmp_path / sidecar.SIDECAR_DIR / digest).read_text()) == PNG
+    assert size == len(json.dumps(PNG))
+
+
+def test_small_outputs_stay_inline(notebook):
+    assert nb_command.compact_file(notebook, threshold_kb=1024) == (0, 0)
+
+
+def test_restore_round_trip(notebook, tmp_path):
+    original = make_notebook(notebook)
+    nb_command.compact_file(notebook)
+
+    assert nb_command.restore_file(notebook) == (1, 0)
+    assert json.loads(notebook.read_text()) == original
+
+
+def test_server_save_recompacts_restored_outputs(notebook, tmp_path):
+    nb_command.compact_file(notebook)
+    store = sidecar.find_store(notebook)
+    nb = json.loads(notebook.read_text())
+
+    sidecar.restore_notebook(nb, store, keep_refs=True)
+    assert nb["cells"][1]["outputs"][0]["data"]["image/png"] == PNG
+
+    # A new large output appended in the session is compacted too (recorded threshold)
+    nb["cells"][1]["outputs"].append({"output_type": "execute_result", "execution_count": 1, "metadata": {},
+                                      "data": {"text/html": "<td>" * 20000}})
+    moved, _ = sidecar.compact_notebook(nb, store)
+    assert moved == 2
+    assert all("image/png" not in o.get("data", {}) and "text/html" not in o.get("data", {})
+               for o in nb["cells"][1]["outputs"])
+
+
+def test_store_shared_by_workspace(tmp_path):
+    (tmp_path / sidecar.SIDECAR_DIR).mkdir(parents=True)
+    (tmp_path / "reports" / "q3").mkdir(parents=True)
+
+    assert sidecar.find_store(tmp_path / "reports" / "q3" / "x.ipynb") == tmp_path / sidecar.SIDECAR_DIR
+
+
+def test_find_notebooks_skips_checkpoints(tmp_path):
+    (tmp_path / ".ipynb_checkpoints").mkdir()
+    (tmp_path / ".ipynb_checkpoints" / "a-checkpoint.ipynb").write_text("{}")
+    (tmp_path / "a.ipynb").write_text("{}")
+
+    assert nb_command.find_notebooks([tmp_path]) == [tmp_path / "a.ipynb"]
@@ -0,0 +1,49 @@
+"""Tests for the post-install venv optimization pass."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from sp.core import optimize
+
+
+@pytest.fixture
+def venv_dir(tmp_path: Path) -> Path:
+    venv = tmp_path / ".venv"
+    site_packages = venv / "lib" / "python3.12" / "site-packages"
+    (site_packages / "pandas-2.2.0.dist-info").mkdir(parents=True)
+    (site_packages / "demo.py").write_text("VALUE = 1\n")
+    (venv / "bin").mkdir()
+    (venv / "bin" / "python").symlink_to(sys.executable)
+    return venv
+
+
+def test_fingerprint_tracks_install_set(venv_dir):
+    site_packages = venv_dir / "lib" / "python3.12" / "site-packages"
+    before = optimize.install_fingerprint(venv_dir)
+
+    (site_packages / "pandas-2.2.0.dist-info").rename(site_packages / "pandas-2.2.1.dist-info")
+
+    assert optimize.install_fingerprint(venv_dir) != before
+
+
+def test_optimize_runs_once_per_install_set(venv_dir, monkeypatch):
+    monkeypatch.setattr(optimize, "time_to_first_plot", lambda venv: 1.0)
+    monkeypatch.setattr(optimize, "build_library_caches", lambda venv: ["matplotlib font cache"])
+
+    record = optimize.optimize_venv(venv_dir)
+
+    assert record["compiled"] is True
+    assert list((venv_dir / "lib" / "python3.12" / "site-packages" / "__pycache__").glob("demo.*.pyc"))
+    assert record["fingerprint"] == optimize.install_fingerprint(venv_dir)
+    assert optimize.needs_optimize(venv_dir) is False
+    assert optimize.optimize_venv(venv_dir) is None
+
+    (venv_dir / "lib" / "python3.12" / "site-packages" / "numpy-2.0.0.dist-info").mkdir()
+    assert optimize.needs_optimize(venv_dir) is True
+
+
+def test_missing_site_packages(tmp_path):
+    assert optimize.install_fingerprint(tmp_path) is None
+    assert optimize.needs_optimize(tmp_path) is False
@@ -0,0 +1,69 @@
+"""Tests for sp lab extension profiles."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sp.core import profiles
+
+
+@pytest.fixture
+def venv_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(profiles, "SP_CONFIG_DIR", tmp_path / "config")
+    venv = tmp_path / ".venv"
+
+    config_d = venv / "etc" / "jupyter" / "jupyter_server_config.d"
+    config_d.mkdir(parents=True)
+    for name, enabled in [("jupyterlab", True), ("jupyter_lsp", True), ("signalpilot_ai", True), ("old_ext", False)]:
+        (config_d / f"{name}.json").write_text(
+            json.dumps({"ServerApp": {"jpserver_extensions": {name: enabled}}})
+        )
+
+    labextensions = venv / "share" / "jupyter" / "labextensions"
+    for name in ["signalpilot-ai", "@jupyter-widgets/jupyterlab-manager", "@jupyter-lsp/jupyterlab-lsp", "jupyterlab_pygments"]:
+        (labextensions / name).mkdir(parents=True)
+        (labextensions / name / "package.json").write_text(json.dumps({"name": name}))
+    return venv
+
+
+def test_full_profile_disables_nothing(venv_dir):
+    assert profiles.resolve_profile(venv_dir, "full") == {"server_disabled": [], "lab_disabled": []}
+    assert profiles.build_profile(venv_dir, "full") == ([], {})
+
+
+def test_minimal_profile_keeps_allowlist(venv_dir):
+    resolved = profiles.resolve_profile(venv_dir, "minimal")
+
+    assert resolved["server_disabled"] == ["jupyter_lsp"]
+    assert sorted(resolved["lab_disabled"]) == sorted([
+        "@jupyter-lsp/jupyterlab-lsp",
+        "jupyterlab_pygments",
+        *profiles.MINIMAL_DISABLED_CORE_PLUGINS,
+    ])
+
+
+def test_allow_extensions_extends_allowlist(venv_dir):
+    resolved = profiles.resolve_profile(venv_dir, "minimal", allow=["jupyter_lsp", "@jupyter-lsp/*"])
+
+    assert resolved["server_disabled"] == []
+    assert "@jupyter-lsp/jupyterlab-lsp" not in resolved["lab_disabled"]
+
+
+def test_build_minimal_profile(venv_dir):
+    args, env = profiles.build_profile(venv_dir, "minimal")
+
+    assert args == ["--ServerApp.jpserver_extensions={'jupyter_lsp': False}"]
+    config_dir = Path(env["JUPYTER_CONFIG_PATH"].split(":")[0])
+    page_config = json.loads((config_dir / "labconfig" / "page_config.json").read_text())
+    assert page_config["disabledExtensions"]["jupyterlab_pygments"] is True
+    # The venv's own page_config is left alone
+    assert not (venv_dir / "etc" / "jupyter" / "labconfig").exists()
+
+
+def test_lab_extension_size(tmp_path):
+    static = tmp_path / "ext" / "static"
+    static.mkdir(parents=True)
+    (static / "remoteEntry.js").write_bytes(b"x" * 1024 * 1024)
+
+    assert profiles.lab_extension_size_mb(tmp_path / "ext") == pytest.approx(1.0)
@@ -0,0 +1,86 @@
+"""Tests for Jupyter server readiness detection."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from sp.core import readiness
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path in ("/api", "/base/api") else 404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    server = HTTPServer(("127.0.0.1", 0), ApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+class RunningProcess:
+    pid = 4242
+
+    def poll(self):
+        return None
+
+
+class ExitedProcess(RunningProcess):
+    def poll(self):
+        return 1
+
+
+def test_probe_on_known_port(api_server):
+    ready = readiness.wait_for_server(RunningProcess(), port=api_server, timeout=5)
+
+    assert ready["source"] == "probe"
+    assert ready["port"] == api_server
+    assert ready["url"] == f"http://localhost:{api_server}/"
+    assert ready["seconds"] >= 0
+
+
+def test_url_from_log(api_server, tmp_path):
+    log = tmp_path / "server.log"
+    log.write_text(
+        "[I ServerApp] http://localhost:1/lab  (stale run)\n"
+        f"[I ServerApp] Jupyter Server is running at:\n    http://127.0.0.1:{api_server}/base/lab?token=abc\n"
+    )
+    offset = len(log.read_text().splitlines(keepends=True)[0])
+
+    ready = readiness.wait_for_server(RunningProcess(), log_path=log, log_offset=offset, timeout=5)
+
+    assert ready["source"] == "log"
+    assert ready["url"] == f"http://localhost:{api_server}/base/"
+
+
+def test_url_from_runtime_file(api_server, tmp_path):
+    info = {"port": api_server, "hostname": "localhost", "base_url": "/", "pid": RunningProcess.pid}
+    (tmp_path / f"jpserver-{RunningProcess.pid}.json").write_text(json.dumps(info))
+
+    ready = readiness.wait_for_server(RunningProcess(), runtime_dir=tmp_path, timeout=5)
+
+    assert ready["source"] == "runtime"
+    assert ready["port"] == api_server
+
+
+def test_exited_process_is_not_ready(tmp_path):
+    assert readiness.wait_for_server(ExitedProcess(), port=readiness.find_free_port(), timeout=5) is None
+
+
+def test_gives_up_after_timeout():
+    assert readiness.wait_for_server(RunningProcess(), port=readiness.find_free_port(), timeout=0.2) is None
+
+
+def test_runtime_dir_follows_jupyter_env(tmp_path):
+    assert readiness.jupyter_runtime_dir({"JUPYTER_RUNTIME_DIR": str(tmp_path)}) == tmp_path
+    assert readiness.jupyter_runtime_dir({"JUPYTER_DATA_DIR": str(tmp_path)}) == tmp_path / "runtime"
@@ -0,0 +1,80 @@
+"""Tests for scheduling background version refreshes."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from sp import upgrade_check
+from sp.test_mocks import make_fetch
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(upgrade_check, "SP_CACHE_FILE", tmp_path / "upgrade-cache.json")
+    monkeypatch.setattr(upgrade_check, "get_cache_dir", lambda: tmp_path)
+    monkeypatch.setattr(upgrade_check, "get_cli_version", lambda: "0.7.0")
+    monkeypatch.setattr(upgrade_check, "detect_signalpilot_package", lambda venv_dir: ("signalpilot-ai", "0.11.0"))
+
+
+def fresh_cache(venv_dir):
+    cache = {
+        "signalpilot": {"latest_version": "0.7.1", "last_check_time": (NOW - timedelta(hours=1)).isoformat()},
+        "signalpilot-ai": {"latest_version": "0.12.0", "next_check_time": (NOW + timedelta(hours=3)).isoformat()},
+    }
+    upgrade_check.record_installed_version(cache, venv_dir, "signalpilot-ai", "0.11.0")
+    return cache
+
+
+def test_fresh_cache_skips_the_network(tmp_path):
+    plan = upgrade_check.plan_refresh(tmp_path, fresh_cache(tmp_path), now=NOW)
+
+    assert plan["packages"] == [] and not plan["record"]
+    assert plan["reason"] == "cache fresh, next refresh in 3h00m"
+
+
+def test_due_entries_and_changed_installs(tmp_path):
+    cache = fresh_cache(tmp_path)
+    cache["signalpilot"]["last_check_time"] = (NOW - timedelta(hours=13)).isoformat()
+    cache[upgrade_check.VENVS_KEY][upgrade_check.cache_key(tmp_path)]["current_version"] = "0.10.0"
+
+    plan = upgrade_check.plan_refresh(tmp_path, cache, now=NOW)
+
+    assert plan["packages"] == ["signalpilot"] and plan["record"]
+    assert plan["reason"] == "refreshing signalpilot"
+
+
+def test_start_version_check_runs_nothing_when_fresh(tmp_path):
+    plan = upgrade_check.plan_refresh(tmp_path, fresh_cache(tmp_path), now=NOW)
+
+    assert upgrade_check.start_version_check(tmp_path, plan) == (None, [])
+
+
+def test_failures_back_off_exponentially_with_jitter():
+    entry = {}
+    delays = []
+    for _ in range(12):
+        upgrade_check.record_refresh(entry, False, NOW)
+        delays.append(upgrade_check.next_refresh_time(entry) - NOW)
+
+    base, jitter = upgrade_check.BACKOFF_BASE, upgrade_check.JITTER
+    for failures, delay in enumerate(delays, start=1):
+        expected = min(upgrade_check.BACKOFF_MAX, base * 2 ** (failures - 1))
+        assert expected * (1 - jitter) <= delay <= expected * (1 + jitter)
+
+    upgrade_check.record_refresh(entry, True, NOW)
+    assert "failures" not in entry
+    assert upgrade_check.next_refresh_time(entry) - NOW <= upgrade_check.REFRESH_TTL
+
+
+def test_missing_package_is_negatively_cached(tmp_path):
+    with patch("sp.core.http.fetch", side_effect=make_fetch({"signalpilot": ["0.7.1"]})):
+        upgrade_check.check_versions_background(tmp_path, [], ["signalpilot", "signalpilot-ai"])
+
+    cache = upgrade_check.load_cache()
+    assert cache["signalpilot-ai"]["failures"] == 1
+    plan = upgrade_check.plan_refresh(tmp_path, cache)
+    assert plan["packages"] == []
+    assert plan["reason"].startswith("backing off after 1 failure(s)")
@@ -0,0 +1,110 @@
+"""Tests for venv snapshots and rollback."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sp.core import environment, snapshot
+
+
+@pytest.fixture
+def venv(tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.config.SP_INVENTORY_DIR", tmp_path / "inventory")
+    monkeypatch.setattr("sp.core.config.SP_SNAPSHOTS_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr("sp.core.config.get_snapshot_config", lambda: {"keep": 3, "max_mb": 2048})
+    monkeypatch.setattr(environment, "_inventories", {})
+
+    venv_dir = tmp_path / "project" / ".venv"
+    install(venv_dir, "0.11.2")
+    (venv_dir / "bin").mkdir()
+    (venv_dir / "bin" / "python").symlink_to("/usr/bin/python3")
+    (venv_dir / "pyvenv.cfg").write_text("version_info = 3.12.7\n")
+    return venv_dir
+
+
+def install(venv_dir: Path, version: str):
+    """Replace the library the way installers do: remove the old files, write new ones."""
+    site_packages = venv_dir / "lib" / "python3.12" / "site-packages"
+    for old in site_packages.glob("signalpilot_ai*"):
+        for path in sorted(old.rglob("*"), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+        old.rmdir()
+    dist_info = site_packages / f"signalpilot_ai-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(f"Name: signalpilot-ai\nVersion: {version}\n")
+    (site_packages / "signalpilot_ai").mkdir()
+    (site_packages / "signalpilot_ai" / "__init__.py").write_text(f"__version__ = '{version}'\n")
+
+
+def test_snapshot_survives_upgrade_and_restores(venv):
+    taken = snapshot.take_snapshot(venv)
+    assert taken["method"] in ("reflink", "hardlink")
+    assert taken["distributions"] == {"signalpilot-ai": "0.11.2"}
+
+    install(venv, "0.12.0")
+    snapshot.restore_snapshot(venv, taken)
+
+    package = venv / "lib" / "python3.12" / "site-packages" / "signalpilot_ai" / "__init__.py"
+    assert package.read_text() == "__version__ = '0.11.2'\n"
+    assert (venv / "bin" / "python").is_symlink()
+    assert not venv.with_name(".venv.replaced").exists()
+    assert not venv.with_name(".venv.rollback").exists()
+
+
+def test_other_filesystem_falls_back_to_a_record(venv):
+    with patch("sp.core.snapshot._mirror", side_effect=OSError("cross-device link")):
+        taken = snapshot.take_snapshot(venv)
+    assert taken["method"] == "record"
+    assert not (Path(taken["path"]) / snapshot.TREE).exists()
+
+    requirements = []
+
+    def sync(cmd, check):
+        requirements.append(Path(cmd[-1]).read_text())
+        return subprocess.CompletedProcess(cmd, 0)
+
+    with patch("subprocess.run", side_effect=sync):
+        snapshot.restore_snapshot(venv, taken)
+    assert requirements == ["signalpilot-ai==0.11.2\n"]
+
+
+def test_retention_by_count_and_disk(venv, monkeypatch):
+    for version in ("0.11.3", "0.11.4", "0.11.5", "0.12.0"):
+        snapshot.take_snapshot(venv)
+        install(venv, version)
+    versions = [s["distributions"]["signalpilot-ai"] for s in snapshot.list_snapshots(venv)]
+    assert versions == ["0.11.5", "0.11.4", "0.11.3"]
+
+    # Older snapshots hold replaced files; with no disk budget only the newest stays
+    snapshot.prune_snapshots({"keep": 3, "max_mb": 0})
+    assert [s["distributions"]["signalpilot-ai"] for s in snapshot.list_snapshots(venv)] == ["0.11.5"]
+
+
+def test_rollback_command_goes_back_n_snapshots(venv, monkeypatch):
+    from sp.commands import rollback
+
+    monkeypatch.setattr(rollback, "select_venv", lambda project: venv)
+    monkeypatch.setattr("sp.core.daemon.find_live_server", lambda venv_dir: None)
+    for version in ("0.11.3", "0.12.0"):
+        snapshot.take_snapshot(venv)
+        install(venv, version)
+
+    rollback.rollback_command(steps=2)
+
+    environment._inventories.clear()
+    assert environment.installed_version(venv, "signalpilot-ai") == "0.11.2"
+    assert snapshot.list_snapshots(venv) == []
+
+
+def test_rollback_reports_missing_uv(venv, monkeypatch, capsys):
+    from sp.commands import rollback
+
+    monkeypatch.setattr(rollback, "select_venv", lambda project: venv)
+    with patch("sp.core.snapshot._mirror", side_effect=OSError("cross-device link")):
+        snapshot.take_snapshot(venv)
+
+    with patch("subprocess.run", side_effect=FileNotFoundError("uv")), pytest.raises(SystemExit):
+        rollback.rollback_command()
+    assert "uv not found in PATH" in capsys.readouterr().out
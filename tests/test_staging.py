@@ -0,0 +1,158 @@
+"""Tests for upgrades staged in a shadow venv."""
+
+import os
+import subprocess
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from sp import upgrade_check
+from sp.core import environment, snapshot, staging, upgrade_plan
+from sp.core.fileutil import exchange_dirs
+from sp.test_mocks import make_fetch
+
+from tests.test_snapshot import install
+from tests.test_upgrade_plan import DRY_RUN
+
+
+@pytest.fixture
+def venv(tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.config.SP_INVENTORY_DIR", tmp_path / "inventory")
+    monkeypatch.setattr("sp.core.config.SP_SNAPSHOTS_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr("sp.core.config.SP_PLANS_DIR", tmp_path / "plans")
+    monkeypatch.setattr("sp.core.config.get_snapshot_config", lambda: {"keep": 3, "max_mb": 2048})
+    monkeypatch.setattr("sp.core.config.get_index_config", lambda: {"url": None, "wheelhouse": None})
+    monkeypatch.setattr("sp.core.daemon.find_live_server", lambda venv_dir: None)
+    monkeypatch.setattr(environment, "_inventories", {})
+    monkeypatch.setattr(upgrade_check, "get_cli_version", lambda: "0.6.0")
+    monkeypatch.setattr(upgrade_check, "latest_versions",
+                        lambda names, **kwargs: {"signalpilot": "0.6.0", "signalpilot-ai": "0.12.0"})
+    monkeypatch.setattr(upgrade_plan, "is_running_via_uvx", lambda: False)
+
+    venv_dir = tmp_path / "project" / ".venv"
+    install(venv_dir, "0.11.2")
+    (venv_dir / "bin").mkdir()
+    (venv_dir / "bin" / "python").symlink_to("/usr/bin/python3")
+    (venv_dir / "pyvenv.cfg").write_text("version_info = 3.12.7\n")
+    return venv_dir
+
+
+def fake_uv(cmd, **kwargs):
+    """Answer dry runs with DRY_RUN; install 0.12.0 into the --python venv otherwise."""
+    if "--dry-run" in cmd:
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr=DRY_RUN)
+    target = Path(cmd[cmd.index("--python") + 1]).parent.parent
+    install(target, "0.12.0")
+    script = target / "bin" / "jupyter-lab"
+    script.write_text(f"#!{target}/bin/python\nfrom jupyterlab import main\n")
+    script.chmod(0o755)
+    return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+
+def build(venv):
+    with patch("subprocess.run", side_effect=fake_uv), patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        return staging.build_staging(venv)
+
+
+def test_build_leaves_the_live_venv_alone(venv):
+    marker = build(venv)
+
+    assert marker["status"] == "ready" and marker["target"] == "0.12.0"
+    assert staging.read_staging(venv) == marker
+    assert environment.installed_version(venv, "signalpilot-ai") == "0.11.2"
+    staged = staging.staging_dir(venv)
+    assert (staged / "bin" / "jupyter-lab").read_text().startswith(f"#!{venv}/bin/python\n")
+    assert not staging.needs_staging(venv, "0.12.0")
+    assert staging.needs_staging(venv, "0.13.0")
+
+
+def test_failed_build_is_recorded_and_not_retried(venv):
+    def failing(cmd, **kwargs):
+        if "--dry-run" in cmd:
+            return fake_uv(cmd)
+        raise subprocess.CalledProcessError(1, cmd, stderr="error: no matching distribution\n")
+
+    with patch("subprocess.run", side_effect=failing), patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        marker = staging.build_staging(venv)
+
+    assert marker["status"] == "failed" and marker["error"] == "error: no matching distribution"
+    assert not staging.staging_dir(venv).exists()
+    assert not staging.needs_staging(venv, "0.12.0")
+
+
+def test_apply_swaps_in_and_keeps_the_old_venv_as_snapshot(venv):
+    build(venv)
+    environment._inventories.clear()
+
+    assert staging.apply_staged(venv)["target"] == "0.12.0"
+
+    environment._inventories.clear()
+    assert environment.installed_version(venv, "signalpilot-ai") == "0.12.0"
+    assert staging.read_staging(venv) is None and not staging.staging_dir(venv).exists()
+    [kept] = snapshot.list_snapshots(venv)
+    assert kept["method"] == "moved" and kept["distributions"] == {"signalpilot-ai": "0.11.2"}
+
+    snapshot.restore_snapshot(venv, kept)
+    environment._inventories.clear()
+    assert environment.installed_version(venv, "signalpilot-ai") == "0.11.2"
+
+
+def test_apply_discards_a_build_older_than_the_venv(venv):
+    build(venv)
+    site_packages = environment.site_packages_dir(venv)
+    stat = site_packages.stat()
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    environment._inventories.clear()
+
+    assert staging.apply_staged(venv) is None
+    assert staging.read_staging(venv) is None and not staging.staging_dir(venv).exists()
+    assert environment.installed_version(venv, "signalpilot-ai") == "0.11.2"
+
+
+def test_apply_waits_for_a_resident_server(venv, monkeypatch):
+    build(venv)
+    monkeypatch.setattr("sp.core.daemon.find_live_server", lambda venv_dir: {"pid": 1})
+
+    assert staging.apply_staged(venv) is None
+    assert staging.read_staging(venv)["status"] == "ready"
+
+
+def test_apply_waits_for_kernels_running_from_the_venv(venv):
+    build(venv)
+    (venv / "bin" / "python").unlink()
+    (venv / "bin" / "python").symlink_to(sys.executable)
+    kernel = subprocess.Popen([str(venv / "bin" / "python"), "-c", "import time; time.sleep(30)"])
+    try:
+        from sp.core.daemon import venv_processes
+
+        # /proc shows the command line once the exec has finished
+        deadline = time.monotonic() + 5
+        while venv_processes(venv) != [kernel.pid] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert staging.apply_staged(venv) is None
+    finally:
+        kernel.kill()
+        kernel.wait()
+    assert staging.read_staging(venv)["status"] == "ready"
+    assert staging.apply_staged(venv)["target"] == "0.12.0"
+    # A second launch finds nothing left to swap
+    assert staging.apply_staged(venv) is None
+
+
+@pytest.mark.parametrize("atomic", [True, False])
+def test_exchange_dirs(tmp_path, atomic):
+    live, new = tmp_path / "live", tmp_path / "new"
+    live.mkdir()
+    (live / "old").touch()
+    new.mkdir()
+    (new / "fresh").touch()
+
+    with nullcontext() if atomic else patch("sp.core.fileutil._renameat2_exchange", return_value=False):
+        replaced = exchange_dirs(new, live)
+
+    assert (live / "fresh").exists()
+    assert (replaced / "old").exists()
@@ -0,0 +1,95 @@
+"""Tests for startup timelines and timing history."""
+
+import json
+
+import pytest
+
+from sp.core import timings
+
+
+@pytest.fixture(autouse=True)
+def history_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(timings, "SP_TIMINGS_HISTORY", tmp_path / "timings.jsonl")
+    monkeypatch.setattr(timings, "SP_TRACES_DIR", tmp_path / "traces")
+    monkeypatch.setattr("sp.core.config.SP_INVENTORY_DIR", tmp_path / "inventory")
+
+
+def make_timeline() -> timings.Timeline:
+    timeline = timings.Timeline()
+    origin = timeline.origin
+    timeline.add("config load", origin, origin + 0.002)
+    timeline.add("server listening", origin + 0.002, origin + 1.5)
+    return timeline
+
+
+def test_chrome_trace_events():
+    trace = make_timeline().chrome_trace()
+
+    first, second = trace["traceEvents"]
+    assert first["name"] == "config load" and first["ph"] == "X"
+    assert first["ts"] == 0 and first["dur"] == 2000
+    assert second["ts"] == 2000 and second["dur"] == 1_498_000
+
+
+def test_save_run_writes_trace_and_history(tmp_path):
+    venv = tmp_path / ".venv"
+    (venv / "lib" / "python3.12" / "site-packages" / "signalpilot_ai-0.9.2.dist-info").mkdir(parents=True)
+
+    trace_path = timings.save_run(make_timeline(), venv)
+    timings.save_run(make_timeline(), venv)
+
+    assert json.loads(trace_path.read_text())["traceEvents"]
+    history = timings.load_history()
+    assert len(history) == 2
+    assert history[0]["library"] == "signalpilot-ai"
+    assert history[0]["library_version"] == "0.9.2"
+    assert history[0]["phases"] == {"config load": 2.0, "server listening": 1498.0}
+    assert history[0]["total_ms"] == 1500.0
+
+
+def test_percentile():
+    values = [100, 200, 300, 400, 500]
+
+    assert timings.percentile(values, 50) == 300
+    assert timings.percentile(values, 95) == pytest.approx(480)
+    assert timings.percentile([], 50) == 0.0
+
+
+def run(library_version: str, listening_ms: float, venv: str = "/home/a/SignalPilotHome/.venv") -> dict:
+    return {
+        "cli_version": "0.7.1",
+        "library_version": library_version,
+        "venv": venv,
+        "phases": {"server listening": listening_ms},
+        "total_ms": listening_ms + 50,
+    }
+
+
+def test_regression_after_library_upgrade():
+    history = [run("0.9.1", 1000)] * 5 + [run("0.9.2", 1600)] * 3
+
+    regressions = timings.find_regressions(history)
+
+    assert [r["phase"] for r in regressions] == ["server listening", "total"]
+    assert regressions[0]["from"] == ("0.7.1", "0.9.1")
+    assert regressions[0]["to"] == ("0.7.1", "0.9.2")
+
+
+def test_small_changes_are_not_regressions():
+    history = [run("0.9.1", 1000)] * 5 + [run("0.9.2", 1080)] * 3
+
+    assert timings.find_regressions(history) == []
+
+
+def test_switching_venvs_is_not_a_regression():
+    project = "/home/a/churn/.venv"
+    history = [run("0.9.1", 1000), run("0.9.2", 1600, venv=project)] * 4
+
+    assert timings.find_regressions(history) == []
+
+
+def test_runs_without_phases_are_skipped():
+    history = [run("0.9.1", 1000)] * 5 + [{"cli_version": "0.7.1", "library_version": "0.9.2",
+                                          "venv": "/home/a/SignalPilotHome/.venv"}] + [run("0.9.2", 1600)] * 3
+
+    assert [r["phase"] for r in timings.find_regressions(history)] == ["server listening", "total"]
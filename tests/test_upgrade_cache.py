@@ -0,0 +1,73 @@
+"""Tests for the per-venv, lock-protected upgrade cache."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from sp import upgrade_check
+from sp.core.fileutil import atomic_write_json, file_lock
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "upgrade-cache.json"
+    monkeypatch.setattr(upgrade_check, "SP_CACHE_FILE", path)
+    monkeypatch.setattr(upgrade_check, "get_cache_dir", lambda: tmp_path)
+    return path
+
+
+def _record(cache_file, venv_dir, version):
+    upgrade_check.SP_CACHE_FILE = cache_file
+    upgrade_check.get_cache_dir = lambda: cache_file.parent
+    for _ in range(20):
+        cache = upgrade_check.load_cache()
+        upgrade_check.record_installed_version(cache, venv_dir, "signalpilot-ai", version)
+        upgrade_check.save_cache(cache)
+
+
+def test_venvs_keep_their_own_installed_version(cache_file, tmp_path):
+    home_venv, project_venv = tmp_path / "home" / ".venv", tmp_path / "project" / ".venv"
+    upgrade_check.save_cache({"signalpilot-ai": {"latest_version": "0.12.0", "last_check_time": "2099-01-01T00:00:00+00:00"}})
+
+    for venv_dir, version in ((home_venv, "0.12.0"), (project_venv, "0.11.0")):
+        cache = upgrade_check.load_cache()
+        upgrade_check.record_installed_version(cache, venv_dir, "signalpilot-ai", version)
+        upgrade_check.save_cache(cache)
+
+    assert upgrade_check.check_cache_for_upgrades(home_venv) is None
+    assert upgrade_check.check_cache_for_upgrades(project_venv)["current"] == "0.11.0"
+    assert upgrade_check.check_cache_for_upgrades(tmp_path / "other") is None
+
+
+def test_concurrent_writers_keep_every_venv(cache_file, tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_record, args=(cache_file, tmp_path / f"venv{i}", f"0.{i}.0"))
+        for i in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    venvs = json.loads(cache_file.read_text())[upgrade_check.VENVS_KEY]
+    assert sorted(entry["current_version"] for entry in venvs.values()) == ["0.0.0", "0.1.0", "0.2.0", "0.3.0"]
+    assert not list(tmp_path.glob(".upgrade-cache.json.*.tmp"))
+
+
+def test_corrupt_cache_is_left_for_the_next_save(cache_file):
+    cache_file.write_text('{"signalpilot": {"latest_')
+
+    assert upgrade_check.load_cache() == {}
+    upgrade_check.save_cache({"signalpilot": {"latest_version": "0.7.1"}})
+    assert upgrade_check.load_cache() == {"signalpilot": {"latest_version": "0.7.1"}}
+
+
+def test_atomic_write_under_lock(tmp_path):
+    path = tmp_path / "state" / "entry.json"
+    with file_lock(path):
+        atomic_write_json(path, {"pid": 1})
+
+    assert json.loads(path.read_text()) == {"pid": 1}
+    assert (tmp_path / "state" / "entry.json.lock").exists()
@@ -0,0 +1,185 @@
+"""Tests for planning and applying upgrades."""
+
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from sp import upgrade_check
+from sp.core import environment, upgrade_plan
+from sp.test_mocks import make_fetch
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+DRY_RUN = """Resolved 42 packages in 12ms
+Would download 2 packages
+Would uninstall 2 packages
+Would install 3 packages
+ - signalpilot-ai==0.11.2
+ + signalpilot-ai==0.12.0
+ - tornado==6.4
+ + tornado==6.4.1
+ + new-dep==1.0
+"""
+
+
+@pytest.fixture
+def venv(tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.config.SP_INVENTORY_DIR", tmp_path / "inventory")
+    monkeypatch.setattr("sp.core.config.SP_PLANS_DIR", tmp_path / "plans")
+    monkeypatch.setattr("sp.core.config.get_index_config", lambda: {"url": None, "wheelhouse": None})
+    monkeypatch.setattr(environment, "_inventories", {})
+    monkeypatch.setattr(upgrade_check, "get_cli_version", lambda: "0.6.0")
+    monkeypatch.setattr(upgrade_plan, "is_running_via_uvx", lambda: False)
+
+    venv_dir = tmp_path / ".venv"
+    dist_info = venv_dir / "lib" / "python3.12" / "site-packages" / "signalpilot_ai-0.11.2.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text("Name: signalpilot-ai\nVersion: 0.11.2\n")
+    (venv_dir / "pyvenv.cfg").write_text("version_info = 3.12.7\n")
+    return venv_dir
+
+
+def fresh_cache():
+    later = (NOW + timedelta(hours=3)).isoformat()
+    return {
+        "signalpilot": {"latest_version": "0.6.0", "next_check_time": later},
+        "signalpilot-ai": {"latest_version": "0.12.0", "next_check_time": later},
+    }
+
+
+def dry_run(output=DRY_RUN, calls=None):
+    def run(cmd, **kwargs):
+        if calls is not None:
+            calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr=output)
+
+    return run
+
+
+def test_parse_dry_run():
+    assert upgrade_plan.parse_dry_run(DRY_RUN) == [
+        {"name": "new-dep", "current": None, "target": "1.0"},
+        {"name": "signalpilot-ai", "current": "0.11.2", "target": "0.12.0"},
+        {"name": "tornado", "current": "6.4", "target": "6.4.1"},
+    ]
+
+
+def test_plan_reuses_fresh_cache_and_pins_the_library(venv):
+    calls, urls = [], []
+    fetch = make_fetch({"signalpilot-ai": ["0.11.2", "0.12.0"]})
+
+    def recording_fetch(url, headers=None, timeout=None):
+        urls.append(url)
+        return fetch(url, headers, timeout)
+
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=dry_run(calls=calls)), \
+            patch("sp.core.http.fetch", side_effect=recording_fetch):
+        plan = upgrade_plan.build_plan(venv, cache=fresh_cache(), now=NOW)
+
+    # Versions came from the cache; the index is only asked for download sizes
+    assert sorted(urls) == [f"https://pypi.org/simple/{name}/" for name in ("new-dep", "signalpilot-ai", "tornado")]
+    assert "signalpilot-ai==0.12.0" in calls[0] and "--upgrade" not in calls[0]
+    assert not plan["cli"]["upgrade"]
+
+    changes = {change["name"]: change for change in plan["library"]["changes"]}
+    assert changes["signalpilot-ai"]["size"] == 2_500_000
+    assert changes["tornado"]["size"] is None
+    assert upgrade_plan.library_command(plan)[-3:] == ["new-dep==1.0", "signalpilot-ai==0.12.0", "tornado==6.4.1"]
+
+
+def test_up_to_date_plan_runs_nothing(venv):
+    cache = fresh_cache()
+    cache["signalpilot-ai"]["latest_version"] = "0.11.2"
+
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=AssertionError("no uv")), \
+            patch("sp.core.http.fetch", side_effect=AssertionError("no network")):
+        plan = upgrade_plan.build_plan(venv, cache=cache, now=NOW)
+
+    assert not upgrade_plan.plan_has_changes(plan)
+    assert upgrade_plan.apply_plan(plan) == {"cli": None, "library": None}
+
+
+def test_saved_plan_goes_stale_when_the_venv_changes(venv):
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=dry_run()), \
+            patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        plan = upgrade_plan.build_plan(venv, cache=fresh_cache())
+    upgrade_plan.save_plan(plan)
+
+    assert upgrade_plan.load_plan(venv) == plan
+    assert upgrade_plan.load_plan(venv, all_packages=True) is None
+
+    site_packages = environment.site_packages_dir(venv)
+    stat = site_packages.stat()
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert upgrade_plan.load_plan(venv) is None
+
+
+def test_apply_runs_cli_and_library_steps(venv):
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=dry_run()), \
+            patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        cache = fresh_cache()
+        cache["signalpilot"]["latest_version"] = "0.7.0"
+        plan = upgrade_plan.build_plan(venv, cache=cache, now=NOW)
+
+    calls = []
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=dry_run(output="", calls=calls)):
+        results = upgrade_plan.apply_plan(plan)
+
+    assert results["cli"]["ok"] and results["library"]["ok"]
+    assert ["uv", "tool", "install", "--force", "signalpilot==0.7.0"] in calls
+    assert any(cmd[:3] == ["uv", "pip", "install"] and "tornado==6.4.1" in cmd for cmd in calls)
+
+
+def upgrade_all(venv, tmp_path, monkeypatch):
+    """Run 'sp upgrade --all' over the home venv and a project venv without a library."""
+    from sp.commands import upgrade
+
+    monkeypatch.setattr("sp.core.config.SP_VENVS_DIR", tmp_path / "venvs")
+    monkeypatch.setattr("sp.core.config.SP_SNAPSHOTS_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr("sp.core.environment.get_home_paths", lambda: (tmp_path, venv))
+    monkeypatch.setattr("sp.core.optimize.optimize_venv", lambda venv_dir: None)
+    project = tmp_path / "project" / ".venv"
+    (project / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+    for venv_dir in (venv, project):
+        (venv_dir / "bin").mkdir(exist_ok=True)
+        (venv_dir / "bin" / "jupyter").touch()
+    environment.register_venv(project)
+    environment.register_venv(venv)
+
+    calls, rows = [], []
+    monkeypatch.setattr(upgrade, "_print_venv_table", rows.extend)
+    cache = fresh_cache()
+    cache["signalpilot"]["next_check_time"] = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    cache["signalpilot-ai"]["next_check_time"] = cache["signalpilot"]["next_check_time"]
+    monkeypatch.setattr(upgrade_check, "load_cache", lambda: cache)
+    with patch("sp.core.upgrade_plan.subprocess.run", side_effect=dry_run(calls=calls)), \
+            patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        upgrade.upgrade_all_venvs(jobs=2)
+    return rows, calls
+
+
+def test_upgrade_all_venvs(venv, tmp_path, monkeypatch):
+    monkeypatch.setattr("sp.core.warm.warm_venv", lambda venv_dir: None)
+
+    rows, calls = upgrade_all(venv, tmp_path, monkeypatch)
+
+    assert [row["venv"] for row in rows] == [venv, tmp_path / "project" / ".venv"]
+    assert [row["status"] for row in rows] == ["upgraded", "no SignalPilot library"]
+    installs = [cmd for cmd in calls if "--dry-run" not in cmd]
+    assert len(installs) == 1
+    assert str(venv / "bin" / "python") in installs[0] and "signalpilot-ai==0.12.0" in installs[0]
+
+
+def test_upgrade_all_venvs_reports_errors_as_failed_rows(venv, tmp_path, monkeypatch):
+    def unwritable(venv_dir):
+        raise PermissionError(13, "Permission denied", str(venv_dir / "etc"))
+
+    monkeypatch.setattr("sp.core.warm.warm_venv", unwritable)
+
+    rows, _ = upgrade_all(venv, tmp_path, monkeypatch)
+
+    assert rows[0]["status"] == f"failed: [Errno 13] Permission denied: '{venv / 'etc'}'"
+    assert rows[1]["status"] == "no SignalPilot library"
@@ -16,6 +16,7 @@ from sp.upgrade_check import (
     load_cache,
     save_cache,
     is_cache_valid,
+    record_installed_version,
 )
 
 
@@ -71,7 +72,6 @@ def test_cache_system():
             "last_check_time": datetime.now(timezone.utc).isoformat()
         },
         "signalpilot-ai": {
-            "current_version": "0.11.2",
             "latest_version": "0.11.3",
             "last_check_time": datetime.now(timezone.utc).isoformat()
         }
@@ -177,11 +177,11 @@ def create_mock_cache(upgrade_type: str = "minor"):
             "last_check_time": datetime.now(timezone.utc).isoformat()
         },
         package_name: {
-            "current_version": current,
             "latest_version": latest,
             "last_check_time": datetime.now(timezone.utc).isoformat()
         }
     }
+    record_installed_version(mock_cache, venv_dir, package_name, current)
 
     save_cache(mock_cache)
     print(f"  ✓ Mock cache created: {current} -> {latest}")
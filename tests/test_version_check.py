@@ -0,0 +1,81 @@
+"""Tests for PyPI version lookups through the JSON Simple API."""
+
+import json
+from unittest.mock import patch
+
+from sp import upgrade_check
+from sp.test_mocks import make_fetch, simple_index
+
+
+def test_release_key_skips_prereleases():
+    assert upgrade_check.release_key("0.11.2") == ((0, 11, 2), 0)
+    assert upgrade_check.release_key("1.0") == ((1, 0, 0), 0)
+    assert upgrade_check.release_key("1.0.0.post2") == ((1, 0, 0), 2)
+    assert upgrade_check.release_key("0.12.0rc1") is None
+    assert upgrade_check.release_key("0.12.0.dev3") is None
+
+
+def test_latest_release_is_numeric_and_ignores_yanked():
+    index = simple_index("signalpilot-ai", ["0.9.0", "0.10.0", "0.11.0", "0.12.0rc1"])
+    index["files"].append({"filename": "signalpilot_ai-0.11.0.tar.gz", "yanked": "broken build"})
+    index["files"][2]["yanked"] = True
+
+    assert upgrade_check.latest_release(index) == "0.10.0"
+
+
+def test_html_project_page():
+    html = (
+        '<a href="../../packages/a/signalpilot-0.7.0.tar.gz#sha256=1">signalpilot-0.7.0.tar.gz</a><br/>'
+        '<a href="../../packages/b/signalpilot-0.7.1-py3-none-any.whl" data-yanked="">signalpilot-0.7.1-py3-none-any.whl</a>'
+    )
+
+    assert upgrade_check.latest_release(upgrade_check.parse_simple_html(html)) == "0.7.0"
+
+
+def test_unchanged_index_costs_a_304():
+    cache = {}
+    fetch = make_fetch({"signalpilot": ["0.7.0", "0.7.1"]})
+    requests = []
+
+    def recording_fetch(url, headers=None, timeout=None):
+        requests.append(headers)
+        return fetch(url, headers, timeout)
+
+    with patch("sp.core.http.fetch", side_effect=recording_fetch):
+        assert upgrade_check.get_pypi_version("signalpilot", cache=cache) == "0.7.1"
+        assert upgrade_check.get_pypi_version("signalpilot", cache=cache) == "0.7.1"
+
+    assert cache["signalpilot"]["etag"] == '"signalpilot-2-0.7.1"'
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == cache["signalpilot"]["etag"]
+    assert requests[1]["Accept"] == upgrade_check.SIMPLE_JSON_TYPE
+
+
+def test_batch_lookup():
+    fetch = make_fetch({"signalpilot": ["0.7.1"], "signalpilot-ai": ["0.11.0", "0.12.0"]})
+
+    with patch("sp.core.http.fetch", side_effect=fetch):
+        versions = upgrade_check.get_pypi_versions(
+            ["signalpilot", "signalpilot-ai", "signalpilot-ai-internal"], cache={}
+        )
+
+    assert versions == {"signalpilot": "0.7.1", "signalpilot-ai": "0.12.0", "signalpilot-ai-internal": None}
+
+
+def test_missing_package_returns_none():
+    with patch("sp.core.http.fetch", side_effect=make_fetch({})):
+        assert upgrade_check.get_pypi_version("signalpilot-ai-internal", cache={}) is None
+
+
+def test_background_check_keeps_validators(tmp_path, monkeypatch):
+    monkeypatch.setattr(upgrade_check, "SP_CACHE_FILE", tmp_path / "upgrade-cache.json")
+    monkeypatch.setattr(upgrade_check, "get_cache_dir", lambda: tmp_path)
+    monkeypatch.setattr(upgrade_check, "get_cli_version", lambda: "0.7.0")
+    monkeypatch.setattr(upgrade_check, "detect_signalpilot_package", lambda venv_dir: None)
+
+    with patch("sp.core.http.fetch", side_effect=make_fetch({"signalpilot": ["0.7.0", "0.7.1"]})):
+        upgrade_check.check_versions_background(tmp_path, [])
+
+    cached = json.loads((tmp_path / "upgrade-cache.json").read_text())["signalpilot"]
+    assert cached["latest_version"] == "0.7.1"
+    assert cached["etag"] and cached["last_check_time"]
@@ -0,0 +1,83 @@
+"""Tests for Jupyter cache warming."""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from sp.core import warm
+
+
+@pytest.fixture
+def venv_dir(tmp_path: Path) -> Path:
+    venv = tmp_path / ".venv"
+    (venv / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+    return venv
+
+
+def test_page_config_disables_and_locks(venv_dir):
+    path = warm.page_config_path(venv_dir)
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"disabledExtensions": {"other-extension": True}}))
+
+    assert warm.write_page_config(venv_dir) is True
+
+    config = json.loads(path.read_text())
+    assert config["disabledExtensions"] == {
+        "other-extension": True,
+        "@jupyterlab/apputils-extension:announcements": True,
+    }
+    assert config["lockedExtensions"] == {"@jupyterlab/apputils-extension:announcements": True}
+
+
+def test_page_config_unchanged_on_second_run(venv_dir):
+    warm.write_page_config(venv_dir)
+
+    assert warm.write_page_config(venv_dir) is False
+
+
+def test_lab_extension_metadata(venv_dir):
+    labextensions = venv_dir / "share" / "jupyter" / "labextensions"
+    for name, content in [("plain-ext", "{}"), ("@scope/good", "{}"), ("@scope/bad", "{not json")]:
+        (labextensions / name).mkdir(parents=True)
+        (labextensions / name / "package.json").write_text(content)
+
+    valid, broken = warm.check_lab_extensions(venv_dir)
+
+    assert valid == 2
+    assert broken == ["@scope/bad"]
+
+
+def test_kernelspec_written_when_missing(venv_dir):
+    (venv_dir / "lib" / "python3.12" / "site-packages" / "ipykernel").mkdir()
+
+    assert warm.ensure_native_kernelspec(venv_dir) is True
+
+    spec = json.loads((venv_dir / "share" / "jupyter" / "kernels" / "python3" / "kernel.json").read_text())
+    assert spec["argv"][:3] == ["python", "-m", "ipykernel_launcher"]
+
+
+def test_no_kernelspec_without_ipykernel(venv_dir):
+    assert warm.ensure_native_kernelspec(venv_dir) is False
+
+
+def test_startup_packages_compiled_once(venv_dir, monkeypatch):
+    from sp.core import optimize
+
+    site_packages = venv_dir / "lib" / "python3.12" / "site-packages"
+    (site_packages / "jupyter_server").mkdir()
+    (site_packages / "jupyter_server-2.14.0.dist-info").mkdir()
+    calls = []
+    monkeypatch.setattr(
+        optimize.subprocess, "run", lambda cmd, **kwargs: calls.append(cmd) or subprocess.CompletedProcess(cmd, 0)
+    )
+
+    assert warm.compile_startup_packages(venv_dir) == 1
+    assert calls[0][-1] == str(site_packages / "jupyter_server")
+    assert optimize.COMPILE_EXCLUDE in calls[0]
+
+    # Once optimize_venv compiled all of site-packages, warming leaves it alone
+    monkeypatch.setattr(optimize, "needs_optimize", lambda venv_dir: False)
+    assert warm.compile_startup_packages(venv_dir) is None
+    assert len(calls) == 1